@@ -8,15 +8,34 @@ from config.settings import settings
 from core.database.connection import db
 from flask_jwt_extended import JWTManager
 from api.middlewares.error_handle import register_error_handlers
+from api.middlewares.http_cache import register_http_cache
 from api.auth.auth_routes import auth_bp
 from features.tables.router import tables_bp
 from features.reports.router import reportes_bp
+from features.reports.temperature_snapshot import snapshot_temperaturas
+from features.stream.router import stream_bp
+from features.search.router import search_bp
+from features.search.service import search_service
+from features.queries.router import queries_bp
 import socket
 
-def create_app() -> Flask:
+def iniciar_tareas_segundo_plano() -> None:
+    """Hilos de fondo: solo en el proceso que atiende requests"""
+    # Copia local de temperaturas (sincronización en segundo plano)
+    if settings.TEMPERATURAS_SNAPSHOT:
+        snapshot_temperaturas.iniciar()
+    
+    # Índice de OT para el autocompletado (se construye en segundo plano)
+    search_service.start()
+
+def create_app(iniciar_tareas: bool = True) -> Flask:
     """
     Factory para crear y configurar la aplicación Flask
     
+    Args:
+        iniciar_tareas: False para no arrancar los hilos de fondo (p. ej. en el
+            proceso vigilante del recargador de Flask)
+    
     Returns:
         Flask: Aplicación configurada y lista para usar
     """
@@ -32,12 +51,24 @@ def create_app() -> Flask:
     # Inicializar base de datos
     db.initialize(echo=settings.FLASK_DEBUG)
     
+    # Una conexión por request, compartida por los repositorios
+    db.init_app(app)
+    
+    if iniciar_tareas:
+        iniciar_tareas_segundo_plano()
+    
     # Registrar manejadores de error
     register_error_handlers(app)
     
+    # ETag / 304 y compresión gzip (brotli si está instalado)
+    register_http_cache(app)
+    
     # Registrar blueprints (módulos)
     app.register_blueprint(tables_bp)
     app.register_blueprint(reportes_bp)
+    app.register_blueprint(stream_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(queries_bp)
     app.register_blueprint(auth_bp)
     
     # ==========================================
@@ -74,7 +105,7 @@ def create_app() -> Flask:
         try:
             with db.get_connection() as conn:
                 # Probar consulta a tabla de usuarios
-                result = conn.execute(text("SELECT COUNT(*) as total FROM TBL_USUARIO")).fetchone()
+                result = conn.execute(text("SELECT COUNT(*) as total FROM TBL_USUARIO")).first()
                 total_usuarios = result[0]
                 
                 # Probar consulta específica del login
@@ -82,7 +113,7 @@ def create_app() -> Flask:
                     SELECT ID_USUARIO, NOMBRE_USUARIO, USUARIO 
                     FROM TBL_USUARIO 
                     WHERE USUARIO = 'JSO' AND ESTADO = 1
-                """)).fetchone()
+                """)).first()
                 
                 return {
                     "success": True,
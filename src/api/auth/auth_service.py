@@ -20,7 +20,7 @@ class AuthService:
                 result = conn.execute(query, {
                     'usuario': usuario,
                     'clave': clave
-                }).fetchone()
+                }).first()
             
             if not result:
                 return {
@@ -72,7 +72,7 @@ class AuthService:
             """)
             
             with db.get_connection() as conn:
-                result = conn.execute(query, {'user_id': user_id}).fetchone()
+                result = conn.execute(query, {'user_id': user_id}).first()
             
             if not result:
                 return False, None
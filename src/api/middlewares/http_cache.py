@@ -0,0 +1,136 @@
+"""
+ETag, GET condicional y compresión de respuestas
+"""
+import gzip
+import hashlib
+from functools import wraps
+from typing import Any, Callable
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él se negocia solo gzip
+    brotli = None
+
+# Cuerpos más chicos no ganan nada comprimidos
+MIN_SIZE = 1024
+
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/',
+)
+
+
+def register_http_cache(app: Flask):
+    """Registrar ETag/304 y compresión para todas las respuestas"""
+
+    @app.after_request
+    def conditional_and_compress(response: Response) -> Response:
+        # Streaming y archivos (send_file) se envían tal cual
+        if response.is_streamed or response.direct_passthrough:
+            return response
+        if response.status_code != 200 or 'Content-Encoding' in response.headers:
+            return response
+
+        encoding = _negotiate_encoding(response)
+
+        if request.method in ('GET', 'HEAD'):
+            # ETag fuerte: la marca de agua si la puso la vista, si no el hash del
+            # contenido. Cada codificación es una representación distinta.
+            base_etag, _ = response.get_etag()
+            if not base_etag:
+                base_etag = hashlib.sha1(response.get_data()).hexdigest()
+            response.set_etag(f"{base_etag}-{encoding}" if encoding else base_etag)
+
+            response.make_conditional(request)
+            if response.status_code == 304:
+                response.vary.add('Accept-Encoding')
+                return response
+
+        if encoding:
+            data = response.get_data()
+            if encoding == 'br':
+                response.set_data(brotli.compress(data, quality=5))
+            else:
+                response.set_data(gzip.compress(data, compresslevel=6))
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+
+        return response
+
+
+def etag_from_watermark(get_watermark: Callable[[], Any]):
+    """
+    Decorador: responde 304 antes de ejecutar la vista si los datos no cambiaron
+
+    El ETag se deriva de la marca de agua de los datos y de la URL completa
+    (ruta + query string), así que un cliente al día no hace correr la consulta
+    ni la serialización. Solo aplica a GET/HEAD.
+
+    Args:
+        get_watermark: Función que devuelve la marca de agua actual (hashable/str)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            try:
+                watermark = get_watermark()
+            except Exception:
+                # Sin marca de agua la vista responde (o informa el error) como siempre
+                return view(*args, **kwargs)
+
+            etag = hashlib.sha1(
+                f"{watermark!r}|{request.full_path}".encode('utf-8')
+            ).hexdigest()
+
+            # El cliente guarda el ETag con el sufijo de la codificación que recibió.
+            # Solo vale el sufijo que se negociaría ahora (o el ETag sin comprimir):
+            # un 304 no puede confirmar un cuerpo en una codificación que ya no acepta.
+            encoding = _accepted_encoding()
+            candidates = (etag, f"{etag}-{encoding}") if encoding else (etag,)
+            for candidate in candidates:
+                if request.if_none_match.contains(candidate):
+                    response = Response(status=304)
+                    response.set_etag(candidate)
+                    response.vary.add('Accept-Encoding')
+                    return response
+
+            response = view(*args, **kwargs)
+
+            # Las vistas pueden devolver (respuesta, status); solo se marca un 200
+            target, status = response, None
+            if isinstance(response, tuple):
+                target = response[0]
+                status = response[1] if len(response) > 1 and isinstance(response[1], int) else None
+            if isinstance(target, Response) and (status or target.status_code) == 200:
+                target.set_etag(etag)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def _negotiate_encoding(response: Response):
+    """Codificación a usar según Accept-Encoding (None = sin comprimir)"""
+    if response.calculate_content_length() is None:
+        return None
+    if response.calculate_content_length() < MIN_SIZE:
+        return None
+    if not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+        return None
+    return _accepted_encoding()
+
+
+def _accepted_encoding():
+    """Codificación preferida por Accept-Encoding, sin mirar el cuerpo"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
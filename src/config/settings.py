@@ -3,6 +3,7 @@
 Configuración general de la aplicación
 """
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -27,6 +28,42 @@ class Settings:
     DB_PASSWORD = os.getenv('DB_PASSWORD')
     DB_DRIVER = os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
     
+    # Reportes
+    REPORTES_TOTAL_TTL = int(os.getenv('REPORTES_TOTAL_TTL', 120))  # segundos
+    REPORTES_CACHE_TTL = int(os.getenv('REPORTES_CACHE_TTL', 300))  # segundos
+    REPORTES_CACHE_MAX = int(os.getenv('REPORTES_CACHE_MAX', 128))  # entradas
+    REPORTES_CACHE_MAX_FILAS = int(os.getenv('REPORTES_CACHE_MAX_FILAS', 5000))
+    REPORTES_MARCA_INTERVALO = float(os.getenv('REPORTES_MARCA_INTERVALO', 2))  # segundos
+    REPORTES_ANALITICA_TTL = int(os.getenv('REPORTES_ANALITICA_TTL', 3600))  # segundos
+
+    # Exportaciones en segundo plano
+    EXPORT_DIR = os.getenv('EXPORT_DIR', os.path.join(tempfile.gettempdir(), 'plc-backend-exports'))
+    EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+    EXPORT_RETENCION_HORAS = float(os.getenv('EXPORT_RETENCION_HORAS', 24))
+
+    # Copia local de TBL_HISTORICO_TEMPERATURAS
+    TEMPERATURAS_SNAPSHOT = os.getenv('TEMPERATURAS_SNAPSHOT', 'False') == 'True'
+    TEMPERATURAS_SNAPSHOT_RUTA = os.getenv('TEMPERATURAS_SNAPSHOT_RUTA') or os.path.join(
+        tempfile.gettempdir(), 'plc-backend-temperaturas.sqlite3'
+    )
+    TEMPERATURAS_SNAPSHOT_INTERVALO = float(os.getenv('TEMPERATURAS_SNAPSHOT_INTERVALO', 30))  # segundos
+    # Lecturas que se confirman tarde: cada sincronización vuelve a leer esta ventana
+    TEMPERATURAS_SNAPSHOT_RELECTURA = float(os.getenv('TEMPERATURAS_SNAPSHOT_RELECTURA', 600))  # segundos
+
+    # Stream de temperaturas en vivo (SSE)
+    STREAM_INTERVALO = float(os.getenv('STREAM_INTERVALO', 2))  # segundos entre sondeos
+    STREAM_HEARTBEAT = float(os.getenv('STREAM_HEARTBEAT', 15))  # segundos
+
+    # Autocompletado de OT
+    SEARCH_REFRESH_INTERVALO = float(os.getenv('SEARCH_REFRESH_INTERVALO', 30))  # segundos
+    SEARCH_RECONSTRUCCION_INTERVALO = float(os.getenv('SEARCH_RECONSTRUCCION_INTERVALO', 3600))  # segundos
+
+    # Consultas guardadas
+    QUERIES_CACHE_MAX = int(os.getenv('QUERIES_CACHE_MAX', 256))  # entradas
+
+    # Metadatos del esquema (tablas/columnas/claves)
+    SCHEMA_CACHE_PROBE_INTERVALO = float(os.getenv('SCHEMA_CACHE_PROBE_INTERVALO', 5))  # segundos
+
     #AUTH
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'clave-jwt-secreta-cambiar-en-produccion')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=3)
@@ -7,7 +7,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
+from flask import Flask, g, has_request_context
 from config.database import get_database_url
 
 class DatabaseConnection:
@@ -58,21 +59,66 @@ class DatabaseConnection:
             )
         return self._engine
     
+    def init_app(self, app: Flask):
+        """
+        Registrar la liberación de la conexión de cada request
+        
+        Args:
+            app: Aplicación Flask
+        """
+        app.teardown_request(self._release_request_connection)
+    
     @contextmanager
-    def get_connection(self) -> Generator:
+    def get_connection(self, scoped: bool = True) -> Generator:
         """
         Context manager para obtener una conexión
         
+        Dentro de un request todos los repositorios comparten una misma conexión
+        (guardada en flask.g): se toma del pool una sola vez y se devuelve al
+        terminar el request. Fuera de un request, o con scoped=False, se abre
+        una conexión propia que se cierra al salir del bloque.
+        
+        Usar scoped=False en hilos/procesos de fondo y en generadores que
+        siguen leyendo después de que la vista retornó (exportaciones en
+        streaming): SQL Server no admite otra consulta en la conexión mientras
+        hay un cursor abierto.
+        
         Uso:
             with db.get_connection() as conn:
                 result = conn.execute(query)
         """
+        if scoped and has_request_context():
+            connection = g.get('_db_connection')
+            if connection is None or connection.closed:
+                connection = self.engine.connect()
+                g._db_connection = connection
+            try:
+                yield connection
+            except Exception:
+                # No dejar una transacción fallida a los siguientes repositorios
+                if connection.in_transaction():
+                    connection.rollback()
+                raise
+            return
+        
         connection = self.engine.connect()
         try:
             yield connection
         finally:
             connection.close()
     
+    @staticmethod
+    def _release_request_connection(exc: Optional[BaseException] = None):
+        """Teardown: devolver al pool la conexión del request (descarta lo no confirmado)"""
+        connection = g.pop('_db_connection', None)
+        if connection is None:
+            return
+        try:
+            if exc is not None and connection.in_transaction():
+                connection.rollback()
+        finally:
+            connection.close()
+    
     def test_connection(self) -> dict:
         """
         Probar la conexión a la base de datos
@@ -0,0 +1,3 @@
+from .router import queries_bp
+
+__all__ = ['queries_bp']
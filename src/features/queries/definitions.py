@@ -0,0 +1,71 @@
+"""
+Consultas guardadas de planta
+
+Para agregar un reporte nuevo basta con registrar aquí su SQL (solo lectura) y
+sus parámetros; queda disponible en /api/queries/<nombre> y en su exportación.
+"""
+from features.queries.registry import registry, SavedQuery, QueryParam
+
+_COLUMNAS_TEMPERATURA = """
+        Fecha_Hora,
+        Temp_Horno_01, Temp_Horno_02, Temp_Horno_03, Temp_Horno_04,
+        Temp_Horno_05, Temp_Horno_06, Temp_Horno_07"""
+
+registry.register(SavedQuery(
+    name='ultimas_temperaturas',
+    description='Últimas lecturas de temperatura de los 7 hornos',
+    sql=f"""
+        SELECT TOP (:limite) {_COLUMNAS_TEMPERATURA}
+        FROM TBL_HISTORICO_TEMPERATURAS
+        ORDER BY Fecha_Hora DESC
+    """,
+    params=[QueryParam('limite', 'int', default=100, min_value=1, max_value=5000)],
+    ttl=5
+))
+
+registry.register(SavedQuery(
+    name='temperaturas_rango',
+    description='Lecturas de temperatura en [desde, hasta)',
+    sql=f"""
+        SELECT {_COLUMNAS_TEMPERATURA}
+        FROM TBL_HISTORICO_TEMPERATURAS
+        WHERE Fecha_Hora >= :desde AND Fecha_Hora < :hasta
+        ORDER BY Fecha_Hora
+    """,
+    params=[
+        QueryParam('desde', 'datetime', required=True),
+        QueryParam('hasta', 'datetime', required=True)
+    ],
+    ttl=300,
+    max_rows=50000
+))
+
+registry.register(SavedQuery(
+    name='registros_ot',
+    description='Registros de proceso de una OT',
+    sql="""
+        SELECT
+            Fecha_Registro, Numero_OT, Tiempo_Asignado, Peso_Total,
+            Fecha_Fin_Manual, Fecha_Fin_Auto, Modo_Ingreso_Carga,
+            Dureza_1, Dureza_2, Dureza_3, Fecha_Modificacion, Usuario
+        FROM TBL_DATOS_PROCESO
+        WHERE Numero_OT = :numero_ot
+        ORDER BY Fecha_Registro DESC
+    """,
+    params=[QueryParam('numero_ot', 'str', required=True)],
+    ttl=60
+))
+
+registry.register(SavedQuery(
+    name='ultimos_registros',
+    description='Registros de proceso más recientes',
+    sql="""
+        SELECT TOP (:limite)
+            Fecha_Registro, Numero_OT, Peso_Total, Modo_Ingreso_Carga,
+            Dureza_1, Dureza_2, Dureza_3, Usuario
+        FROM TBL_DATOS_PROCESO
+        ORDER BY Fecha_Registro DESC
+    """,
+    params=[QueryParam('limite', 'int', default=50, min_value=1, max_value=1000)],
+    ttl=10
+))
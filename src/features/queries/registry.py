@@ -0,0 +1,193 @@
+"""
+Registro de consultas guardadas (solo lectura) con parámetros tipados
+"""
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import text
+from shared.utils.validators import SQLValidator
+from core.exceptions.custom_exceptions import NotFoundException, ValidationException
+
+
+_TRUE = ('1', 'true', 'yes', 'si', 'sí')
+_FALSE = ('0', 'false', 'no')
+
+
+def _parse_bool(value: Any) -> bool:
+    """Booleano desde JSON o texto; cualquier otro valor es un error (no False)"""
+    if isinstance(value, bool):
+        return value
+    text_value = str(value).strip().lower()
+    if text_value in _TRUE:
+        return True
+    if text_value in _FALSE:
+        return False
+    raise ValueError(f"Valor booleano no reconocido: {value}")
+
+
+class QueryParam:
+    """Parámetro de una consulta guardada"""
+
+    PARSERS: Dict[str, Callable[[Any], Any]] = {
+        'str': str,
+        'int': int,
+        'float': float,
+        'bool': _parse_bool,
+        'date': lambda value: value if isinstance(value, date) else date.fromisoformat(str(value)),
+        'datetime': lambda value: value if isinstance(value, datetime) else datetime.fromisoformat(str(value)),
+    }
+
+    def __init__(
+        self,
+        name: str,
+        type: str = 'str',
+        required: bool = False,
+        default: Any = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None
+    ):
+        if type not in self.PARSERS:
+            raise ValueError(f"Tipo de parámetro no soportado: {type}")
+        self.name = name
+        self.type = type
+        self.required = required
+        self.default = default
+        self.min_value = min_value
+        self.max_value = max_value
+
+    def parse(self, raw: Any) -> Any:
+        """
+        Convertir el valor recibido al tipo declarado
+
+        Raises:
+            ValidationException: Si falta, no se puede convertir o está fuera de rango
+        """
+        if raw is None or raw == '':
+            if self.required:
+                raise ValidationException(f"El parámetro '{self.name}' es requerido")
+            return self.default
+
+        try:
+            value = self.PARSERS[self.type](raw)
+        except (TypeError, ValueError):
+            raise ValidationException(f"El parámetro '{self.name}' debe ser de tipo {self.type}")
+
+        if self.min_value is not None and value < self.min_value:
+            raise ValidationException(f"El parámetro '{self.name}' debe ser >= {self.min_value}")
+        if self.max_value is not None and value > self.max_value:
+            raise ValidationException(f"El parámetro '{self.name}' debe ser <= {self.max_value}")
+        return value
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "required": self.required,
+            "default": self.default
+        }
+
+
+class SavedQuery:
+    """
+    Consulta con nombre: el SQL se valida y se compila a text() una sola vez
+    al registrarla, y acumula sus propias métricas de tiempo
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        params: Optional[List[QueryParam]] = None,
+        description: str = '',
+        ttl: float = 60,
+        max_rows: int = 10000
+    ):
+        self.name = name
+        self.description = description
+        self.params = params or []
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.statement = text(SQLValidator.validate_read_only_query(sql))
+
+        # Los :parámetros del SQL deben coincidir con los declarados
+        declared = {param.name for param in self.params}
+        used = set(self.statement.compile().params)
+        if declared != used:
+            raise ValueError(
+                f"Consulta '{name}': parámetros declarados {sorted(declared)} "
+                f"no coinciden con los del SQL {sorted(used)}"
+            )
+
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._errors = 0
+        self._cache_hits = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._last_ms: Optional[float] = None
+
+    def bind(self, raw_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Parámetros convertidos y validados; los no declarados se rechazan"""
+        unknown = set(raw_params) - {param.name for param in self.params}
+        if unknown:
+            raise ValidationException(f"Parámetros desconocidos: {', '.join(sorted(unknown))}")
+        return {param.name: param.parse(raw_params.get(param.name)) for param in self.params}
+
+    def record(self, elapsed_ms: float, error: bool = False) -> None:
+        with self._lock:
+            self._executions += 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+            self._last_ms = elapsed_ms
+            if error:
+                self._errors += 1
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self._cache_hits += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "errors": self._errors,
+                "cache_hits": self._cache_hits,
+                "avg_ms": round(self._total_ms / self._executions, 2) if self._executions else None,
+                "max_ms": round(self._max_ms, 2),
+                "last_ms": round(self._last_ms, 2) if self._last_ms is not None else None
+            }
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "params": [param.describe() for param in self.params],
+            "ttl": self.ttl,
+            "max_rows": self.max_rows
+        }
+
+
+class QueryRegistry:
+    """Consultas guardadas disponibles por nombre"""
+
+    def __init__(self):
+        self._queries: Dict[str, SavedQuery] = {}
+
+    def register(self, query: SavedQuery) -> SavedQuery:
+        if query.name in self._queries:
+            raise ValueError(f"La consulta '{query.name}' ya está registrada")
+        self._queries[query.name] = query
+        return query
+
+    def get(self, name: str) -> SavedQuery:
+        query = self._queries.get(name)
+        if query is None:
+            raise NotFoundException(f"consulta '{name}'")
+        return query
+
+    def all(self) -> List[SavedQuery]:
+        return list(self._queries.values())
+
+
+# Instancia global
+registry = QueryRegistry()
@@ -0,0 +1,50 @@
+#ACCESO A DATOS
+"""
+Repositorio: Ejecución de consultas guardadas
+"""
+from typing import Any, Dict, Iterator, List, Tuple
+from core.database.connection import db
+from core.exceptions.custom_exceptions import DatabaseException
+
+class QueriesRepository:
+    """Ejecuta las sentencias ya compiladas del registro"""
+
+    def execute(self, statement, params: Dict[str, Any], max_rows: int) -> Tuple[List[str], List[Any], bool]:
+        """
+        Ejecutar una consulta leyendo como máximo max_rows filas
+
+        Returns:
+            tuple: (columnas, filas, truncado)
+        """
+        try:
+            with db.get_connection() as conn:
+                result = conn.execute(statement, params)
+                columns = list(result.keys())
+                rows = result.fetchmany(max_rows + 1)
+                result.close()
+
+            return columns, rows[:max_rows], len(rows) > max_rows
+
+        except Exception as e:
+            raise DatabaseException(f"Error al ejecutar la consulta: {str(e)}")
+
+    def stream(self, statement, params: Dict[str, Any], batch_size: int = 2000) -> Iterator[Any]:
+        """
+        Ejecutar una consulta en streaming
+
+        El primer elemento producido es la lista de columnas (la consulta ya se
+        ejecutó al pedirlo); luego, lotes de filas leídos del cursor.
+        """
+        # Conexión propia: el generador se sigue leyendo después de que la vista retornó
+        with db.get_connection(scoped=False) as conn:
+            try:
+                result = conn.execute(
+                    statement.execution_options(stream_results=True, yield_per=batch_size),
+                    params
+                )
+            except Exception as e:
+                raise DatabaseException(f"Error al ejecutar la consulta: {str(e)}")
+
+            yield list(result.keys())
+            for batch in result.partitions():
+                yield batch
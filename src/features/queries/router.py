@@ -0,0 +1,144 @@
+#RUTAS DE CONSULTAS GUARDADAS
+"""
+Router: Consultas guardadas de solo lectura
+"""
+from datetime import datetime
+from flask import Blueprint, Response, request, stream_with_context
+from features.queries.service import QueriesService
+from shared.responses.response_builder import ResponseBuilder
+from shared.utils.stream_exporter import StreamExporter
+from core.exceptions.custom_exceptions import AppException, ValidationException
+
+# Crear blueprint
+queries_bp = Blueprint('queries', __name__, url_prefix='/api/queries')
+
+# Instanciar servicio
+service = QueriesService()
+
+def _request_params(exclude: tuple = ()) -> dict:
+    """Parámetros desde el body JSON (POST) o la query string"""
+    if request.method == 'POST' and request.is_json:
+        body = request.get_json()
+        if body is None:
+            body = {}
+        if not isinstance(body, dict):
+            raise ValidationException("El cuerpo JSON debe ser un objeto con los parámetros")
+        params = dict(body)
+    else:
+        params = request.args.to_dict()
+    for name in exclude:
+        params.pop(name, None)
+    return params
+
+@queries_bp.route('/', methods=['GET'])
+def list_queries():
+    """
+    Listar las consultas guardadas
+    
+    GET /api/queries/
+    """
+    try:
+        result = service.list_queries()
+        return ResponseBuilder.success(
+            data=result,
+            message="Consultas obtenidas exitosamente"
+        )
+    
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+
+@queries_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """
+    Tiempos de ejecución por consulta y uso del caché
+    
+    GET /api/queries/stats
+    """
+    try:
+        return ResponseBuilder.success(
+            data=service.get_stats(),
+            message="Estadísticas obtenidas exitosamente"
+        )
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+
+@queries_bp.route('/<name>', methods=['GET', 'POST'])
+def run_query(name: str):
+    """
+    Ejecutar una consulta guardada
+    
+    GET /api/queries/ultimas_temperaturas?limite=20
+    POST /api/queries/temperaturas_rango  {"desde": "2026-01-01T00:00", "hasta": "2026-01-02T00:00"}
+    
+    Response:
+        {
+            "status": "success",
+            "data": {
+                "query": "ultimas_temperaturas",
+                "columns": [...],
+                "total": 20,
+                "truncated": false,
+                "cached": false,
+                "data": [...]
+            }
+        }
+    """
+    try:
+        result = service.run_query(name, _request_params())
+        return ResponseBuilder.success(
+            data=result,
+            message=f"Consulta '{name}' ejecutada"
+        )
+    
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+
+@queries_bp.route('/<name>/export', methods=['GET', 'POST'])
+def export_query(name: str):
+    """
+    Exportar el resultado completo de una consulta en streaming
+    
+    GET /api/queries/temperaturas_rango/export?format=csv&gzip=true&desde=...&hasta=...
+    
+    format: csv (default) o ndjson. No aplica max_rows ni caché.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    compress = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+    
+    if export_format not in StreamExporter.FORMATS:
+        return ResponseBuilder.error(f"Formato no soportado: {export_format}. Use csv o ndjson", 400)
+    
+    try:
+        columns, batches = service.stream_query(name, _request_params(exclude=('format', 'gzip')))
+    
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+    
+    mimetype, extension = StreamExporter.FORMATS[export_format]
+    if export_format == 'csv':
+        chunks = StreamExporter.csv_chunks(columns, batches)
+    else:
+        chunks = StreamExporter.ndjson_chunks(columns, batches)
+    
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    if compress:
+        chunks = StreamExporter.gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        direct_passthrough=True
+    )
@@ -0,0 +1,120 @@
+#LOGICA DE NEGOCIO
+"""
+Servicio: Consultas guardadas con caché de resultados por consulta
+"""
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+from config.settings import settings
+from features.queries.repository import QueriesRepository
+from features.queries.registry import registry, SavedQuery
+from features.queries import definitions  # noqa: F401 - registra las consultas
+from shared.utils.data_converter import DataConverter
+from shared.utils.ttl_cache import TTLCache
+
+class QueriesService:
+    """Ejecuta consultas del registro midiendo tiempos y cacheando resultados"""
+
+    def __init__(self):
+        self.repository = QueriesRepository()
+        # Un solo caché; cada entrada vence con el TTL de su consulta
+        self.cache = TTLCache(maxsize=settings.QUERIES_CACHE_MAX, ttl=60)
+
+    def list_queries(self) -> Dict:
+        """
+        Listar las consultas disponibles
+
+        Returns:
+            Dict: Nombre, descripción y parámetros de cada consulta
+        """
+        queries = [query.describe() for query in registry.all()]
+        return {"total": len(queries), "queries": queries}
+
+    def run_query(self, name: str, raw_params: Dict[str, Any]) -> Dict:
+        """
+        Ejecutar una consulta guardada
+
+        Args:
+            name: Nombre registrado
+            raw_params: Parámetros recibidos (texto o JSON)
+
+        Returns:
+            Dict: Columnas, filas y si el resultado vino del caché
+        """
+        query = registry.get(name)
+        params = query.bind(raw_params)
+
+        key = (name, tuple(sorted(params.items())))
+        if query.ttl > 0:
+            cached = self.cache.get(key)
+            if cached is not None:
+                query.record_cache_hit()
+                return {**cached, "cached": True}
+
+        start = time.perf_counter()
+        try:
+            columns, rows, truncated = self.repository.execute(query.statement, params, query.max_rows)
+        except Exception:
+            query.record((time.perf_counter() - start) * 1000, error=True)
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        query.record(elapsed_ms)
+
+        result = {
+            "query": name,
+            "columns": columns,
+            "total": len(rows),
+            "truncated": truncated,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "data": DataConverter.rows_to_dict_list(rows, columns)
+        }
+
+        if query.ttl > 0:
+            self.cache.set(key, result, ttl=query.ttl)
+
+        return {**result, "cached": False}
+
+    def stream_query(self, name: str, raw_params: Dict[str, Any]) -> Tuple[List[str], Iterator[Any]]:
+        """
+        Ejecutar una consulta guardada para exportarla sin límite de filas
+
+        La consulta se ejecuta antes de retornar, así los errores se informan
+        como respuesta JSON y no a mitad de la descarga.
+
+        Returns:
+            tuple: (columnas, iterador de lotes)
+        """
+        query = registry.get(name)
+        params = query.bind(raw_params)
+
+        start = time.perf_counter()
+        stream = self.repository.stream(query.statement, params)
+        try:
+            columns = next(stream)
+        except Exception:
+            query.record((time.perf_counter() - start) * 1000, error=True)
+            raise
+
+        return columns, self._timed(query, stream, start)
+
+    @staticmethod
+    def _timed(query: SavedQuery, stream: Iterator[Any], start: float) -> Iterator[Any]:
+        error = False
+        try:
+            yield from stream
+        except Exception:
+            error = True
+            raise
+        finally:
+            query.record((time.perf_counter() - start) * 1000, error=error)
+
+    def get_stats(self) -> Dict:
+        """
+        Métricas de tiempo por consulta y del caché de resultados
+
+        Returns:
+            Dict: Estadísticas por nombre de consulta
+        """
+        return {
+            "queries": {query.name: query.stats() for query in registry.all()},
+            "cache": self.cache.stats()
+        }
@@ -0,0 +1,102 @@
+"""
+Estadísticas móviles y detección de anomalías de temperatura (NumPy vectorizado)
+
+Para cada lectura se calcula la media y la desviación estándar de las lecturas
+previas dentro de una ventana de tiempo, con sumas acumuladas (cumsum) en lugar
+de recorrer la ventana fila por fila. Una lectura es anómala si su z-score
+supera el umbral; las lecturas anómalas consecutivas se agrupan en intervalos.
+"""
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+def estadisticas_moviles(
+    tiempos: np.ndarray,
+    valores: np.ndarray,
+    ventana_ms: int,
+    min_lecturas: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Media, desviación y z-score móviles de una serie
+
+    La ventana de cada lectura son las lecturas válidas (no NaN) en
+    [t - ventana_ms, t), sin incluir la propia, para que un pico no se
+    amortigüe a sí mismo.
+
+    Args:
+        tiempos: (n,) ms desde epoch, ascendente
+        valores: (n,) float64 con NaN para lecturas nulas
+        ventana_ms: Ancho de la ventana en milisegundos
+        min_lecturas: Lecturas mínimas en la ventana para calcular z-score
+
+    Returns:
+        Tuple: (media, desviación, z) de forma (n,); NaN donde no aplica
+    """
+    validos = ~np.isnan(valores)
+
+    # Desplazar por la media global reduce la cancelación en sum(x²) - n·media²
+    centro = np.nanmean(valores) if validos.any() else 0.0
+    x = np.where(validos, valores - centro, 0.0)
+
+    suma = np.concatenate(([0.0], np.cumsum(x)))
+    suma_cuad = np.concatenate(([0.0], np.cumsum(x * x)))
+    conteo = np.concatenate(([0], np.cumsum(validos)))
+
+    inicio = np.searchsorted(tiempos, tiempos - ventana_ms, side='left')
+    fin = np.arange(tiempos.size)
+
+    n = (conteo[fin] - conteo[inicio]).astype(np.float64)
+    s = suma[fin] - suma[inicio]
+    s2 = suma_cuad[fin] - suma_cuad[inicio]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = s / n
+        varianza = np.maximum(s2 / n - media * media, 0.0)
+        desviacion = np.sqrt(varianza * n / (n - 1))
+        z = (x - media) / desviacion
+
+    suficientes = (n >= max(2, min_lecturas)) & validos & (desviacion > 0)
+    z = np.where(suficientes, z, np.nan)
+    media = np.where(n > 0, media + centro, np.nan)
+    desviacion = np.where(n > 1, desviacion, np.nan)
+
+    return media, desviacion, z
+
+
+def intervalos_anomalos(
+    tiempos: np.ndarray,
+    valores: np.ndarray,
+    z: np.ndarray,
+    umbral: float,
+    desde_ms: int
+) -> List[Dict[str, Any]]:
+    """
+    Agrupa las lecturas con |z| > umbral en intervalos consecutivos
+
+    Las lecturas anteriores a desde_ms solo sirven de ventana inicial y no se marcan.
+
+    Returns:
+        List[Dict]: inicio_ms, fin_ms, lecturas, z_max (con signo) y valor del pico
+    """
+    with np.errstate(invalid='ignore'):
+        marcadas = (np.abs(z) > umbral) & (tiempos >= desde_ms)
+
+    if not marcadas.any():
+        return []
+
+    # Bordes de cada tramo de True consecutivos
+    bordes = np.diff(np.concatenate(([0], marcadas.astype(np.int8), [0])))
+    inicios = np.flatnonzero(bordes == 1)
+    fines = np.flatnonzero(bordes == -1)
+
+    intervalos = []
+    for i, f in zip(inicios.tolist(), fines.tolist()):
+        pico = i + int(np.nanargmax(np.abs(z[i:f])))
+        intervalos.append({
+            "inicio_ms": int(tiempos[i]),
+            "fin_ms": int(tiempos[f - 1]),
+            "lecturas": f - i,
+            "z_max": round(float(z[pico]), 2),
+            "valor": round(float(valores[pico]), 3)
+        })
+    return intervalos
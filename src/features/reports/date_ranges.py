@@ -0,0 +1,101 @@
+"""
+Traducción de rangos de Fecha_Reinterpretada a rangos de Fecha_Registro
+
+El PLC graba Fecha_Registro con día y mes intercambiados. El reporte filtra por
+la fecha corregida, que SQL calcula por fila:
+
+    DATEADD(MONTH, DAY(r) - 1, DATEADD(DAY, MONTH(r) - 1, 'AAAA0101'))
+
+Para una fecha cruda (A, M, D) eso equivale a la fecha (A + (D-1)//12, (D-1)%12 + 1, M).
+Filtrar sobre esa expresión impide usar el índice de Fecha_Registro, así que aquí
+se invierte la transformación y se obtienen rangos semiabiertos [inicio, fin) de
+Fecha_Registro que seleccionan exactamente las mismas filas.
+"""
+import calendar
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+# Un día crudo D desplaza hasta (31 - 1) // 12 = 2 años la fecha corregida
+_MAX_DESPLAZAMIENTO_ANIOS = 2
+
+Rango = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def fecha_reinterpretada(anio: int, mes: int, dia: int) -> date:
+    """
+    Replica en Python el CROSS APPLY Fecha_Reinterpretada del reporte
+
+    Args:
+        anio, mes, dia: Componentes crudos de Fecha_Registro
+
+    Returns:
+        date: Fecha corregida
+    """
+    return date(anio + (dia - 1) // 12, (dia - 1) % 12 + 1, mes)
+
+
+def rangos_fecha_registro(
+    fecha_desde: Optional[date],
+    fecha_hasta: Optional[date]
+) -> List[Rango]:
+    """
+    Convierte un filtro sobre la fecha corregida en rangos de Fecha_Registro
+
+    Args:
+        fecha_desde: Fecha corregida mínima (inclusive) o None
+        fecha_hasta: Fecha corregida máxima (inclusive) o None
+
+    Returns:
+        List[Rango]: Rangos [inicio, fin) ordenados y sin solapes. Un extremo
+        None significa rango abierto. Lista vacía si ninguna fecha cumple.
+        Si ambos filtros son None devuelve [(None, None)].
+    """
+    if fecha_desde is None and fecha_hasta is None:
+        return [(None, None)]
+
+    # Años crudos que pueden caer en el rango; fuera de ellos el resultado es
+    # "todo" o "nada" y se expresa con rangos abiertos
+    anio_min = (fecha_desde or fecha_hasta).year - _MAX_DESPLAZAMIENTO_ANIOS
+    anio_max = (fecha_hasta or fecha_desde).year
+
+    rangos: List[Rango] = []
+
+    if fecha_desde is None:
+        rangos.append((None, _inicio_dia(date(anio_min, 1, 1))))
+
+    for anio in range(anio_min, anio_max + 1):
+        for mes in range(1, 13):
+            # Dentro de un mismo mes crudo la fecha corregida crece con el día,
+            # así que los días que cumplen forman un único tramo contiguo
+            dias = [
+                dia for dia in range(1, calendar.monthrange(anio, mes)[1] + 1)
+                if _dentro(fecha_reinterpretada(anio, mes, dia), fecha_desde, fecha_hasta)
+            ]
+            if dias:
+                rangos.append((
+                    _inicio_dia(date(anio, mes, dias[0])),
+                    _inicio_dia(date(anio, mes, dias[-1]) + timedelta(days=1))
+                ))
+
+    if fecha_hasta is None:
+        rangos.append((_inicio_dia(date(anio_max + 1, 1, 1)), None))
+
+    return _unir_contiguos(rangos)
+
+
+def _dentro(valor: date, desde: Optional[date], hasta: Optional[date]) -> bool:
+    return (desde is None or valor >= desde) and (hasta is None or valor <= hasta)
+
+
+def _inicio_dia(valor: date) -> datetime:
+    return datetime.combine(valor, time.min)
+
+
+def _unir_contiguos(rangos: List[Rango]) -> List[Rango]:
+    unidos: List[Rango] = []
+    for inicio, fin in rangos:
+        if unidos and unidos[-1][1] is not None and unidos[-1][1] == inicio:
+            unidos[-1] = (unidos[-1][0], fin)
+        else:
+            unidos.append((inicio, fin))
+    return unidos
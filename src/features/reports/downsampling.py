@@ -0,0 +1,172 @@
+"""
+Reducción de series de temperatura para gráficos (NumPy vectorizado)
+
+Las lecturas llegan por lotes desde el cursor; cada lote se acumula en cubetas
+de tiempo de ancho fijo con operaciones ufunc.at, sin guardar la serie completa.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def lote_a_arrays(lote: Sequence[Sequence[Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte un lote de filas (Fecha_Hora, v1, v2, ...) a arrays NumPy
+
+    Returns:
+        Tuple: (tiempos en ms desde epoch como int64, valores float64 con NaN para NULL)
+    """
+    tiempos = np.array([fila[0] for fila in lote], dtype='datetime64[ms]').astype(np.int64)
+
+    valores = np.array([tuple(fila[1:]) for fila in lote], dtype=object)
+    valores[valores == None] = np.nan  # noqa: E711 - comparación elemento a elemento
+    return tiempos, valores.astype(np.float64)
+
+
+def a_ms(valor: datetime) -> int:
+    return int((valor - _EPOCH).total_seconds() * 1000)
+
+
+def desde_ms(valor: float) -> str:
+    return np.datetime64(int(valor), 'ms').astype(datetime).isoformat()
+
+
+class AcumuladorCubetas:
+    """Min, max, suma y conteo por cubeta de tiempo y por serie"""
+
+    def __init__(self, inicio_ms: int, fin_ms: int, cubetas: int, series: int):
+        self.inicio_ms = inicio_ms
+        self.cubetas = max(1, cubetas)
+        self.ancho_ms = max(1.0, (fin_ms - inicio_ms) / self.cubetas)
+        self.series = series
+
+        forma = (series, self.cubetas)
+        self.minimos = np.full(forma, np.inf)
+        self.maximos = np.full(forma, -np.inf)
+        self.sumas = np.zeros(forma)
+        self.conteos = np.zeros(forma, dtype=np.int64)
+        self.lecturas = 0
+
+    def agregar(self, tiempos: np.ndarray, valores: np.ndarray) -> None:
+        """
+        Acumula un lote
+
+        Args:
+            tiempos: (n,) ms desde epoch
+            valores: (n, series) con NaN para lecturas nulas
+        """
+        if tiempos.size == 0:
+            return
+        self.lecturas += tiempos.size
+
+        cubeta = ((tiempos - self.inicio_ms) / self.ancho_ms).astype(np.int64)
+        np.clip(cubeta, 0, self.cubetas - 1, out=cubeta)
+
+        # Índice plano (serie, cubeta) para acumular todas las series de una vez
+        plano = np.arange(self.series)[None, :] * self.cubetas + cubeta[:, None]
+        validos = ~np.isnan(valores)
+        indices = plano[validos]
+        datos = valores[validos]
+
+        np.minimum.at(self.minimos.reshape(-1), indices, datos)
+        np.maximum.at(self.maximos.reshape(-1), indices, datos)
+        np.add.at(self.sumas.reshape(-1), indices, datos)
+        np.add.at(self.conteos.reshape(-1), indices, 1)
+
+    def inicios_ms(self) -> np.ndarray:
+        return self.inicio_ms + np.arange(self.cubetas) * self.ancho_ms
+
+    def promedios(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.conteos > 0, self.sumas / self.conteos, np.nan)
+
+
+def serie_min_max(acumulador: AcumuladorCubetas, nombres: List[str]) -> Dict[str, Any]:
+    """
+    Envolvente min/max por cubeta; se omiten las cubetas sin ninguna lectura
+
+    Returns:
+        Dict: {"t": [...], "series": {nombre: {"min": [...], "max": [...]}}}
+    """
+    con_datos = acumulador.conteos.sum(axis=0) > 0
+    inicios = acumulador.inicios_ms()[con_datos]
+
+    series = {}
+    for i, nombre in enumerate(nombres):
+        vacias = acumulador.conteos[i, con_datos] == 0
+        series[nombre] = {
+            "min": _a_lista(acumulador.minimos[i, con_datos], vacias),
+            "max": _a_lista(acumulador.maximos[i, con_datos], vacias)
+        }
+
+    return {"t": [desde_ms(t) for t in inicios], "series": series}
+
+
+def serie_lttb(acumulador: AcumuladorCubetas, nombres: List[str], puntos: int) -> Dict[str, Any]:
+    """
+    Largest-Triangle-Three-Buckets sobre los promedios de cubetas finas
+
+    Returns:
+        Dict: {"series": {nombre: {"t": [...], "v": [...]}}}
+    """
+    inicios = acumulador.inicios_ms() + acumulador.ancho_ms / 2
+    promedios = acumulador.promedios()
+
+    series = {}
+    for i, nombre in enumerate(nombres):
+        validos = ~np.isnan(promedios[i])
+        x, y = lttb(inicios[validos], promedios[i][validos], puntos)
+        series[nombre] = {
+            "t": [desde_ms(t) for t in x],
+            "v": [round(float(v), 3) for v in y]
+        }
+
+    return {"series": series}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, puntos: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce (x, y) a `puntos` puntos conservando la forma visual (LTTB)
+
+    Args:
+        x: Eje ordenado ascendente
+        y: Valores sin NaN
+        puntos: Cantidad de puntos de salida (>= 3)
+    """
+    n = x.size
+    if puntos >= n or puntos < 3:
+        return x, y
+
+    # Bordes de las cubetas intermedias (el primer y último punto se conservan)
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0] = 0
+    elegidos[-1] = n - 1
+
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], max(bordes[i] + 1, bordes[i + 1])
+
+        # Promedio de la cubeta siguiente (o el último punto)
+        sig_inicio, sig_fin = fin, (bordes[i + 2] if i + 2 < bordes.size else n)
+        if sig_fin <= sig_inicio:
+            sig_x, sig_y = x[-1], y[-1]
+        else:
+            sig_x, sig_y = x[sig_inicio:sig_fin].mean(), y[sig_inicio:sig_fin].mean()
+
+        ax, ay = x[anterior], y[anterior]
+        areas = np.abs(
+            (ax - sig_x) * (y[inicio:fin] - ay) - (ax - x[inicio:fin]) * (sig_y - ay)
+        )
+        anterior = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = anterior
+
+    return x[elegidos], y[elegidos]
+
+
+def _a_lista(valores: np.ndarray, vacias: np.ndarray) -> List[Any]:
+    redondeados = np.round(valores, 3).tolist()
+    return [None if vacia else v for v, vacia in zip(redondeados, vacias.tolist())]
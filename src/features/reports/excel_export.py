@@ -0,0 +1,240 @@
+"""
+Exportación del reporte de hornos a Excel en modo streaming
+
+Usa hojas write-only de openpyxl: cada fila se escribe a disco al agregarla, así
+la memoria no crece con la cantidad de registros. Los estilos se registran una
+sola vez como estilos con nombre y las celdas solo los referencian.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+
+# (texto, ancho) de cada columna, en el orden en que se escriben
+ENCABEZADOS = [
+    ("Fecha Registro", 20),
+    ("Número OT", 15),
+    ("Tiempo Asignado.", 12),
+    ("Peso Total", 12),
+    ("Fecha Fin Manual", 18),
+    ("Fecha Fin Auto", 18),
+    ("Modo Ingreso", 14),
+    ("Dureza 1", 10),
+    ("Dureza 2", 10),
+    ("Dureza 3", 10),
+    ("Fecha Modif.", 18),
+    ("Usuario", 12),
+    ("Temp H1", 10),
+    ("Temp H2", 10),
+    ("Temp H3", 10),
+    ("Temp H4", 10),
+    ("Temp H5", 10),
+    ("Temp H6", 10),
+    ("Temp H7", 10)
+]
+
+CLAVES_TEMPERATURA = [
+    'TEMPERATURA HORNO1', 'TEMPERATURA HORNO2', 'TEMPERATURA HORNO3',
+    'TEMPERATURA HORNO4', 'TEMPERATURA HORNO5', 'TEMPERATURA HORNO6',
+    'TEMPERATURA HORNO7'
+]
+
+FILA_ENCABEZADO = 4
+
+MIMETYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def escribir_excel_reporte_hornos(
+    lotes: Iterable[List[Dict[str, Any]]],
+    destino: Union[str, BinaryIO],
+    al_avanzar: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Escribe el reporte de hornos en un .xlsx
+
+    Args:
+        lotes: Iterable de lotes de filas (ver ReporteHornosRepository.iterar_reporte_hornos)
+        destino: Ruta o archivo binario donde guardar el libro
+        al_avanzar: Callback opcional con el total de filas escritas tras cada lote
+
+    Returns:
+        int: Cantidad de registros escritos
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Reporte Hornos")
+    _registrar_estilos(wb)
+
+    for col_num, (_, width) in enumerate(ENCABEZADOS, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = width
+
+    # Alto uniforme para las filas de datos (sin guardar una dimensión por fila)
+    ws.sheet_format.defaultRowHeight = 20
+    ws.sheet_format.customHeight = True
+
+    def celda(valor, estilo):
+        cell = WriteOnlyCell(ws, value=valor)
+        cell.style = estilo
+        return cell
+
+    # ==========================================
+    # TÍTULO, SUBTÍTULO Y HEADERS
+    # ==========================================
+    ultima_columna = get_column_letter(len(ENCABEZADOS))
+
+    ws.merged_cells.add(f'A1:{ultima_columna}1')
+    ws.append([celda("REPORTE DE HORNOS - MODEPSA", "titulo")])
+
+    ws.merged_cells.add(f'A2:{ultima_columna}2')
+    fecha_reporte = datetime.now().strftime('%d/%m/%Y %H:%M')
+    ws.append([celda(f"Generado el: {fecha_reporte}", "subtitulo")])
+
+    ws.row_dimensions[3].height = 5
+    ws.append([])
+
+    ws.row_dimensions[FILA_ENCABEZADO].height = 30
+    ws.append([celda(texto, "encabezado") for texto, _ in ENCABEZADOS])
+
+    # ==========================================
+    # ESCRIBIR DATOS
+    # ==========================================
+    row_num = FILA_ENCABEZADO
+    for lote in lotes:
+        for registro in lote:
+            row_num += 1
+            ws.append(_fila(registro, row_num, celda))
+
+        if al_avanzar:
+            al_avanzar(row_num - FILA_ENCABEZADO)
+
+    total = row_num - FILA_ENCABEZADO
+
+    ws.append([])
+    ws.merged_cells.add(f'A{row_num + 2}:{ultima_columna}{row_num + 2}')
+    ws.append([celda(f"Total de registros: {total}", "pie")])
+
+    wb.save(destino)
+    return total
+
+
+def _fila(registro: Dict[str, Any], row_num: int, celda) -> list:
+    par = "par" if row_num % 2 == 0 else "impar"
+
+    modo = registro.get('Modo_Ingreso_Carga')
+    fila = [
+        celda(_texto(registro.get('Fecha_Registro')), f"texto_{par}"),
+        celda(registro.get('Numero_OT') or "-", f"ot_{par}"),
+        celda(_numero(registro.get('Tiempo_Asignado')), f"decimal2_{par}"),
+        celda(_numero(registro.get('Peso_Total')), f"peso_{par}"),
+        celda(_texto(registro.get('Fecha_Fin_Manual')), f"texto_chico_{par}"),
+        celda(_texto(registro.get('Fecha_Fin_Auto')), f"texto_chico_{par}"),
+        celda(modo or "-", "modo_auto" if modo == "Automatico" else f"centro_{par}"),
+    ]
+
+    for dureza_key in ('Dureza_1', 'Dureza_2', 'Dureza_3'):
+        fila.append(celda(_numero(registro.get(dureza_key)), f"decimal1_{par}"))
+
+    fila.append(celda(_texto(registro.get('Fecha_Modificacion')), f"texto_chico_{par}"))
+    fila.append(celda(registro.get('Usuario') or "-", f"centro_{par}"))
+
+    for temp_key in CLAVES_TEMPERATURA:
+        temp = registro.get(temp_key)
+        if temp:
+            fila.append(celda(float(temp), "temperatura"))
+        else:
+            fila.append(celda("-", f"temperatura_vacia_{par}"))
+
+    return fila
+
+
+def _texto(valor: Any) -> str:
+    return str(valor) if valor else "-"
+
+
+def _numero(valor: Any) -> Any:
+    if not valor:
+        return None
+    if isinstance(valor, (int, float, Decimal)):
+        return float(valor)
+    return str(valor)
+
+
+def _registrar_estilos(wb) -> None:
+    """Crea una vez los estilos con nombre usados por el reporte"""
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+    lado = Side(style='thin', color='D3D3D3')
+    borde = Border(left=lado, right=lado, top=lado, bottom=lado)
+
+    izquierda = Alignment(horizontal="left", vertical="center")
+    centro = Alignment(horizontal="center", vertical="center")
+    derecha = Alignment(horizontal="right", vertical="center")
+
+    def relleno(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    def estilo(nombre, font, alignment, fill=None, border=None, number_format=None):
+        ns = NamedStyle(name=nombre)
+        ns.font = font
+        ns.alignment = alignment
+        if fill is not None:
+            ns.fill = fill
+        if border is not None:
+            ns.border = border
+        if number_format:
+            ns.number_format = number_format
+        wb.add_named_style(ns)
+
+    estilo("titulo", Font(bold=True, size=14, color="2C5F8D", name="Calibri"), centro)
+    estilo("subtitulo", Font(size=10, color="666666", name="Calibri"), centro)
+    estilo("pie", Font(bold=True, size=10, color="666666", name="Calibri"), derecha)
+    estilo(
+        "encabezado",
+        Font(bold=True, color="FFFFFF", size=11, name="Calibri"),
+        Alignment(horizontal="center", vertical="center", wrap_text=True),
+        fill=relleno("2C5F8D"),
+        border=borde
+    )
+    estilo(
+        "modo_auto",
+        Font(bold=True, size=10, color="155724", name="Calibri"),
+        centro,
+        fill=relleno("D4EDDA"),
+        border=borde
+    )
+    estilo(
+        "temperatura",
+        Font(bold=True, size=10, color="E67E22", name="Calibri"),
+        derecha,
+        fill=relleno("FFF3CD"),
+        border=borde,
+        number_format='#,##0.0'
+    )
+
+    # Estilos de datos: una variante por color de fila alterno
+    fuente = Font(size=10, name="Calibri")
+    fuente_chica = Font(size=9, name="Calibri")
+    for sufijo, color in (("par", "F8F9FA"), ("impar", "FFFFFF")):
+        fill = relleno(color)
+        estilo(f"texto_{sufijo}", fuente, izquierda, fill, borde)
+        estilo(f"texto_chico_{sufijo}", fuente_chica, izquierda, fill, borde)
+        estilo(f"centro_{sufijo}", fuente, centro, fill, borde)
+        estilo(f"decimal2_{sufijo}", fuente, derecha, fill, borde, '#,##0.00')
+        estilo(f"decimal1_{sufijo}", fuente, derecha, fill, borde, '#,##0.0')
+        estilo(
+            f"ot_{sufijo}",
+            Font(bold=True, size=10, color="2C5F8D", name="Calibri"),
+            centro, fill, borde
+        )
+        estilo(
+            f"peso_{sufijo}",
+            Font(bold=True, size=10, color="28A745", name="Calibri"),
+            derecha, fill, borde, '#,##0.00'
+        )
+        estilo(
+            f"temperatura_vacia_{sufijo}",
+            Font(size=9, color="999999", name="Calibri"),
+            derecha, fill, borde
+        )
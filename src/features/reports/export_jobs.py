@@ -0,0 +1,229 @@
+"""
+Exportaciones de Excel en segundo plano
+
+Las exportaciones se ejecutan en un pool de procesos acotado, fuera de los hilos
+que atienden requests. El archivo terminado queda en disco con un nombre derivado
+del hash de los filtros normalizados y de la marca de agua de los datos: si se
+pide la misma exportación y los datos no cambiaron, se entrega el archivo ya
+generado sin volver a consultar la base.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from config.settings import settings
+from core.database.connection import db
+from core.exceptions.custom_exceptions import NotFoundException, ValidationException
+from .excel_export import escribir_excel_reporte_hornos
+from .repository import ReporteHornosRepository
+from .service import ReporteHornosService
+
+_ID_VALIDO = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ExportacionesExcel:
+    """Gestiona los trabajos de exportación y el almacén de resultados en disco"""
+
+    def __init__(self, directorio: str, max_workers: int = 2, retencion_horas: float = 24):
+        self.directorio = directorio
+        self.max_workers = max_workers
+        self.retencion_horas = retencion_horas
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._trabajos: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def enviar(
+        self,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        numero_ot: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Registrar una exportación (o reutilizar una idéntica)
+
+        Returns:
+            Dict: Estado del trabajo, incluido su job_id
+        """
+        fecha_desde_obj, fecha_hasta_obj, numero_ot = ReporteHornosService.normalizar_filtros(
+            fecha_desde, fecha_hasta, numero_ot
+        )
+        filtros = {
+            "fecha_desde": fecha_desde_obj.isoformat() if fecha_desde_obj else None,
+            "fecha_hasta": fecha_hasta_obj.isoformat() if fecha_hasta_obj else None,
+            "numero_ot": numero_ot if numero_ot not in (None, '*') else None
+        }
+
+        with db.get_connection() as conn:
+            marca = ReporteHornosRepository(conn).obtener_marca_datos()
+
+        job_id = self._calcular_id(filtros, marca)
+
+        with self._lock:
+            os.makedirs(self.directorio, exist_ok=True)
+            self._limpiar_vencidos()
+
+            en_curso = self._trabajos.get(job_id)
+            if not os.path.exists(self._ruta(job_id)) and (en_curso is None or en_curso.done()):
+                self._escribir_progreso(self.directorio, job_id, 0, None)
+                self._trabajos[job_id] = self._obtener_pool().submit(
+                    _ejecutar_exportacion, job_id, filtros, self.directorio
+                )
+
+        return self.estado(job_id)
+
+    def estado(self, job_id: str) -> Dict[str, Any]:
+        """
+        Estado y progreso de un trabajo
+
+        Raises:
+            NotFoundException: Si el trabajo no existe
+        """
+        self._validar_id(job_id)
+
+        if os.path.exists(self._ruta(job_id)):
+            return {"job_id": job_id, "estado": "completado", "progreso": 100}
+
+        with self._lock:
+            futuro = self._trabajos.get(job_id)
+
+        if futuro is None:
+            raise NotFoundException(f"exportación '{job_id}'")
+
+        if futuro.done() and futuro.exception() is not None:
+            return {"job_id": job_id, "estado": "error", "error": str(futuro.exception())}
+
+        progreso = self._leer_progreso(job_id)
+        procesados = progreso.get("procesados", 0)
+        total = progreso.get("total")
+
+        return {
+            "job_id": job_id,
+            "estado": "en_proceso" if futuro.running() else "en_cola",
+            "procesados": procesados,
+            "total": total,
+            "progreso": int(procesados * 100 / total) if total else 0
+        }
+
+    def ruta_resultado(self, job_id: str) -> str:
+        """
+        Ruta del archivo terminado
+
+        Raises:
+            NotFoundException: Si el archivo no existe (o aún no terminó)
+        """
+        self._validar_id(job_id)
+        ruta = self._ruta(job_id)
+        if not os.path.exists(ruta):
+            raise NotFoundException(f"archivo de la exportación '{job_id}'")
+        return ruta
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: procesos nuevos, sin los hilos ni las conexiones del servidor
+            # (con fork se copiaría un proceso que ya tiene hilos corriendo)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_inicializar_worker
+            )
+        return self._pool
+
+    def _ruta(self, job_id: str) -> str:
+        return os.path.join(self.directorio, f"{job_id}.xlsx")
+
+    def _leer_progreso(self, job_id: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.directorio, f"{job_id}.json"), encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _limpiar_vencidos(self) -> None:
+        """Borra resultados más antiguos que la retención configurada"""
+        limite = time.time() - self.retencion_horas * 3600
+        for nombre in os.listdir(self.directorio):
+            ruta = os.path.join(self.directorio, nombre)
+            job_id = nombre.split('.')[0]
+            if job_id in self._trabajos and not self._trabajos[job_id].done():
+                continue
+            try:
+                if os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+                    self._trabajos.pop(job_id, None)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _calcular_id(filtros: Dict[str, Any], marca: Dict[str, Any]) -> str:
+        clave = json.dumps(
+            {"filtros": filtros, "marca": {k: str(v) for k, v in marca.items()}},
+            sort_keys=True
+        )
+        return hashlib.sha256(clave.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def _validar_id(job_id: str) -> None:
+        if not _ID_VALIDO.match(job_id or ''):
+            raise ValidationException("Identificador de exportación inválido")
+
+    @staticmethod
+    def _escribir_progreso(directorio: str, job_id: str, procesados: int, total: Optional[int]) -> None:
+        ruta = os.path.join(directorio, f"{job_id}.json")
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({"procesados": procesados, "total": total}, archivo)
+        os.replace(temporal, ruta)
+
+
+# ==========================================
+# EJECUCIÓN EN LOS PROCESOS DEL POOL
+# ==========================================
+# Los procesos del pool importan este módulo para llegar a estas funciones:
+# no debe importar main ni api.app (crearían la app y sus hilos en cada proceso).
+
+def _inicializar_worker() -> None:
+    """Cada proceso usa su propio pool de conexiones"""
+    if db._engine is None:
+        db.initialize()
+
+
+def _ejecutar_exportacion(job_id: str, filtros: Dict[str, Any], directorio: str) -> str:
+    fecha_desde, fecha_hasta, numero_ot = ReporteHornosService.normalizar_filtros(
+        filtros["fecha_desde"], filtros["fecha_hasta"], filtros["numero_ot"]
+    )
+
+    ruta = os.path.join(directorio, f"{job_id}.xlsx")
+    temporal = f"{ruta}.tmp"
+
+    try:
+        with db.get_connection(scoped=False) as conn:
+            repository = ReporteHornosRepository(conn)
+            total = repository.contar_reporte_hornos(fecha_desde, fecha_hasta, numero_ot)
+            ExportacionesExcel._escribir_progreso(directorio, job_id, 0, total)
+
+            escribir_excel_reporte_hornos(
+                repository.iterar_reporte_hornos(fecha_desde, fecha_hasta, numero_ot),
+                temporal,
+                al_avanzar=lambda procesados: ExportacionesExcel._escribir_progreso(
+                    directorio, job_id, procesados, total
+                )
+            )
+
+        os.replace(temporal, ruta)
+        return ruta
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+# Instancia global
+exportaciones = ExportacionesExcel(
+    directorio=settings.EXPORT_DIR,
+    max_workers=settings.EXPORT_WORKERS,
+    retencion_horas=settings.EXPORT_RETENCION_HORAS
+)
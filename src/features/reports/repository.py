@@ -1,21 +1,27 @@
 from sqlalchemy import text
-from typing import Optional, List, Dict, Any, Tuple
-from datetime import date
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Sequence
+from datetime import date, datetime
+from shared.utils.validators import SQLValidator
+from .date_ranges import rangos_fecha_registro
 
-class ReporteHornosRepository:
-    def __init__(self, connection):
-        self.connection = connection
+# Columnas del reporte, en el orden en que las devuelve cada consulta
+COLUMNAS_REPORTE = [
+    'Fecha_Registro', 'Numero_OT', 'Tiempo_Asignado', 'Peso_Total',
+    'Fecha_Fin_Manual', 'Fecha_Fin_Auto', 'Modo_Ingreso_Carga',
+    'Dureza_1', 'Dureza_2', 'Dureza_3', 'Fecha_Modificacion', 'Usuario',
+    'TEMPERATURA HORNO1', 'TEMPERATURA HORNO2', 'TEMPERATURA HORNO3',
+    'TEMPERATURA HORNO4', 'TEMPERATURA HORNO5', 'TEMPERATURA HORNO6',
+    'TEMPERATURA HORNO7'
+]
 
-    def obtener_reporte_hornos(
-        self,
-        fecha_desde: Optional[date] = None,
-        fecha_hasta: Optional[date] = None,
-        numero_ot: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        query = text("""
-            SELECT 
+COLUMNAS_PROCESO = COLUMNAS_REPORTE[:12]
+
+COLUMNAS_HORNO = [f'Temp_Horno_0{n}' for n in range(1, 8)]
+
+# Columnas propias de TBL_DATOS_PROCESO que devuelve el reporte
+_COLUMNAS_PROCESO = """
                 TB.Fecha_Registro,
-                TB.Numero_OT, 
+                TB.Numero_OT,
                 TB.Tiempo_Asignado,
                 TB.Peso_Total,
                 TB.Fecha_Fin_Manual,
@@ -25,57 +31,46 @@ class ReporteHornosRepository:
                 TB.Dureza_2,
                 TB.Dureza_3,
                 TB.Fecha_Modificacion,
-                TB.Usuario,
-                (
-                    SELECT TOP 1 TH.Temp_Horno_01
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO1],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_02
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO2],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_03
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO3],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_04
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO4],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_05
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO5],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_06
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO6],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_07
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO7]
-            FROM TBL_DATOS_PROCESO TB
+                TB.Usuario"""
+
+# Temperaturas de los 7 hornos: primera lectura del día de Fecha_Registro.
+# Un solo OUTER APPLY => una búsqueda por fila (antes eran 7 subconsultas TOP 1
+# con el mismo rango de fechas). Si no hay lecturas ese día, las 7 quedan NULL.
+_COLUMNAS_TEMPERATURA = """
+                T.[TEMPERATURA HORNO1],
+                T.[TEMPERATURA HORNO2],
+                T.[TEMPERATURA HORNO3],
+                T.[TEMPERATURA HORNO4],
+                T.[TEMPERATURA HORNO5],
+                T.[TEMPERATURA HORNO6],
+                T.[TEMPERATURA HORNO7]"""
+
+_APPLY_TEMPERATURAS = """
+            OUTER APPLY (
+                SELECT TOP 1
+                    TH.Temp_Horno_01 AS [TEMPERATURA HORNO1],
+                    TH.Temp_Horno_02 AS [TEMPERATURA HORNO2],
+                    TH.Temp_Horno_03 AS [TEMPERATURA HORNO3],
+                    TH.Temp_Horno_04 AS [TEMPERATURA HORNO4],
+                    TH.Temp_Horno_05 AS [TEMPERATURA HORNO5],
+                    TH.Temp_Horno_06 AS [TEMPERATURA HORNO6],
+                    TH.Temp_Horno_07 AS [TEMPERATURA HORNO7]
+                FROM TBL_HISTORICO_TEMPERATURAS TH
+                WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+                  AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+                ORDER BY TH.Fecha_Hora
+            ) T"""
+
+# Los filtros de fecha trabajan directamente sobre TB.Fecha_Registro (ver
+# _construir_filtros), sin calcular la fecha reinterpretada por fila
+_FROM_PROCESO = """
+            FROM TBL_DATOS_PROCESO TB"""
+
+
+# Fecha corregida (día y mes intercambiados por el PLC) y lunes de su semana.
+# Se usa solo para agrupar; los filtros siguen yendo por rangos de Fecha_Registro.
+# DATEDIFF contra el día 0 (lunes 1900-01-01) no depende de SET DATEFIRST.
+_APPLY_FECHA_REINTERPRETADA = """
             CROSS APPLY (
                 SELECT
                     DATEADD(
@@ -86,27 +81,129 @@ class ReporteHornosRepository:
                         )
                     ) AS Fecha_Reinterpretada
             ) F
-            WHERE
-                (:fecha_desde IS NULL OR F.Fecha_Reinterpretada >= :fecha_desde)
-            AND (:fecha_hasta IS NULL OR F.Fecha_Reinterpretada < DATEADD(DAY, 1, :fecha_hasta))
-            AND (
-                    :numero_ot IS NULL
-                    OR :numero_ot = '*'
-                    OR TB.Numero_OT = :numero_ot
-                )
-            ORDER BY TB.Fecha_Registro DESC
-        """)
+            CROSS APPLY (
+                SELECT
+                    DATEADD(DAY, -(DATEDIFF(DAY, 0, F.Fecha_Reinterpretada) % 7), F.Fecha_Reinterpretada)
+                        AS Inicio_Semana
+            ) S"""
+
+# Dimensiones del resumen: nombre => expresión SQL de agrupación
+DIMENSIONES_RESUMEN = {
+    'dia': 'F.Fecha_Reinterpretada',
+    'semana': 'S.Inicio_Semana',
+    'ot': 'TB.Numero_OT',
+    'modo': 'TB.Modo_Ingreso_Carga',
+}
+
+class ReporteHornosRepository:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _construir_filtros(
+        self,
+        fecha_desde: Optional[date],
+        fecha_hasta: Optional[date],
+        numero_ot: Optional[str]
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Construye las condiciones del WHERE del reporte y sus parámetros
+
+        El filtro de fechas se traduce a rangos sobre TB.Fecha_Registro (ver
+        date_ranges) para que SQL Server pueda usar su índice en lugar de
+        calcular Fecha_Reinterpretada en toda la tabla.
+        """
+        condiciones = []
+        params: Dict[str, Any] = {}
+
+        if fecha_desde is not None or fecha_hasta is not None:
+            tramos = []
+            for i, (inicio, fin) in enumerate(rangos_fecha_registro(fecha_desde, fecha_hasta)):
+                partes = []
+                if inicio is not None:
+                    partes.append(f"TB.Fecha_Registro >= :fr_desde_{i}")
+                    params[f"fr_desde_{i}"] = inicio
+                if fin is not None:
+                    partes.append(f"TB.Fecha_Registro < :fr_hasta_{i}")
+                    params[f"fr_hasta_{i}"] = fin
+                tramos.append("(" + " AND ".join(partes) + ")")
+            condiciones.append("(" + " OR ".join(tramos) + ")" if tramos else "1 = 0")
+
+        if numero_ot is not None and numero_ot != '*':
+            condiciones.append("TB.Numero_OT = :numero_ot")
+            params["numero_ot"] = numero_ot
+
+        return condiciones, params
+
+    @staticmethod
+    def _sql_where(condiciones: List[str]) -> str:
+        return "WHERE " + "\n              AND ".join(condiciones) if condiciones else ""
+
+    @staticmethod
+    def _fecha_como_texto(valor: datetime) -> str:
+        """
+        Fecha del cursor en ISO 8601 para compararla con Fecha_Registro
+
+        Se envía como texto para que SQL Server la convierta al tipo de la columna
+        (datetime o datetime2) y la igualdad sea exacta sin tocar el índice.
+        """
+        timespec = 'milliseconds' if valor.microsecond % 1000 == 0 else 'microseconds'
+        return valor.isoformat(timespec=timespec)
+
+    def obtener_reporte_hornos(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        query, params = self._consulta_reporte_completo(fecha_desde, fecha_hasta, numero_ot)
+
+        result = self.connection.execute(query, params)
+
+        return [dict(row._mapping) for row in result]
+
+    def iterar_reporte_hornos(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None,
+        batch_size: int = 2000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre el reporte completo en lotes sin cargarlo entero en memoria
+
+        Las filas se leen del cursor de a `batch_size` (yield_per), así que la
+        conexión queda ocupada hasta agotar el iterador.
+
+        Yields:
+            List[Dict]: Lote de filas con las mismas columnas que obtener_reporte_hornos
+        """
+        query, params = self._consulta_reporte_completo(fecha_desde, fecha_hasta, numero_ot)
 
         result = self.connection.execute(
-            query,
-            {
-                "fecha_desde": fecha_desde,
-                "fecha_hasta": fecha_hasta,
-                "numero_ot": numero_ot
-            }
+            query.execution_options(stream_results=True, yield_per=batch_size),
+            params
         )
 
-        return [dict(row._mapping) for row in result]
+        for lote in result.partitions():
+            yield [dict(row._mapping) for row in lote]
+
+    def _consulta_reporte_completo(
+        self,
+        fecha_desde: Optional[date],
+        fecha_hasta: Optional[date],
+        numero_ot: Optional[str]
+    ):
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+
+        query = text(f"""
+            SELECT {_COLUMNAS_PROCESO},{_COLUMNAS_TEMPERATURA}
+            {_FROM_PROCESO}
+            {_APPLY_TEMPERATURAS}
+            {self._sql_where(condiciones)}
+            ORDER BY TB.Fecha_Registro DESC
+        """)
+
+        return query, params
 
     # ✅ PAGINADO COMPATIBLE (SIN OFFSET/FETCH)
     def obtener_reporte_hornos_paginado(
@@ -115,8 +212,18 @@ class ReporteHornosRepository:
         fecha_hasta: Optional[date] = None,
         numero_ot: Optional[str] = None,
         page: int = 1,
-        size: int = 10
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        size: int = 10,
+        incluir_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Página del reporte y, opcionalmente, el total en la misma consulta
+
+        El total se cuenta solo sobre TBL_DATOS_PROCESO (sin temperaturas) y las
+        temperaturas se resuelven únicamente para las filas de la página.
+
+        Returns:
+            Tuple: (filas, total) — total es None si incluir_total=False
+        """
 
         page = max(1, int(page))
         size = max(1, min(100, int(size)))
@@ -124,118 +231,418 @@ class ReporteHornosRepository:
         start_row = (page - 1) * size + 1
         end_row = page * size
 
-        base_sql = """
-            SELECT 
-                TB.Fecha_Registro,
-                TB.Numero_OT, 
-                TB.Tiempo_Asignado,
-                TB.Peso_Total,
-                TB.Fecha_Fin_Manual,
-                TB.Fecha_Fin_Auto,
-                TB.Modo_Ingreso_Carga,
-                TB.Dureza_1,
-                TB.Dureza_2,
-                TB.Dureza_3,
-                TB.Fecha_Modificacion,
-                TB.Usuario,
-                (
-                    SELECT TOP 1 TH.Temp_Horno_01
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO1],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_02
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO2],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_03
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO3],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_04
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO4],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_05
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO5],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_06
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO6],
-                (
-                    SELECT TOP 1 TH.Temp_Horno_07
-                    FROM TBL_HISTORICO_TEMPERATURAS TH
-                    WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
-                      AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
-                    ORDER BY TH.Fecha_Hora
-                ) AS [TEMPERATURA HORNO7]
-            FROM TBL_DATOS_PROCESO TB
-            CROSS APPLY (
-                SELECT
-                    DATEADD(
-                        MONTH, DAY(TB.Fecha_Registro) - 1,
-                        DATEADD(
-                            DAY, MONTH(TB.Fecha_Registro) - 1,
-                            CAST(CAST(YEAR(TB.Fecha_Registro) AS char(4)) + '0101' AS date)
-                        )
-                    ) AS Fecha_Reinterpretada
-            ) F
-            WHERE
-                (:fecha_desde IS NULL OR F.Fecha_Reinterpretada >= :fecha_desde)
-            AND (:fecha_hasta IS NULL OR F.Fecha_Reinterpretada < DATEADD(DAY, 1, :fecha_hasta))
-            AND (
-                    :numero_ot IS NULL
-                    OR :numero_ot = '*'
-                    OR TB.Numero_OT = :numero_ot
-                )
-        """
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+        where_sql = self._sql_where(condiciones)
 
-        # 1) TOTAL
-        count_query = text(f"SELECT COUNT(1) AS total FROM ({base_sql}) X")
-        total = self.connection.execute(count_query, {
-            "fecha_desde": fecha_desde,
-            "fecha_hasta": fecha_hasta,
-            "numero_ot": numero_ot
-        }).scalar() or 0
-
-        # 2) DATA PAGINADA (ROW_NUMBER)
-        data_query = text(f"""
-            WITH Q AS (
-                SELECT 
-                    X.*,
-                    ROW_NUMBER() OVER (ORDER BY X.Fecha_Registro DESC) AS rn
-                FROM ({base_sql}) X
-            )
-            SELECT *
-            FROM Q
-            WHERE rn BETWEEN :start_row AND :end_row
-            ORDER BY rn
-        """)
+        # Numerar solo las columnas de proceso; el APPLY va después del filtro de página
+        paginas_sql = f"""
+            P AS (
+                SELECT {_COLUMNAS_PROCESO},
+                    ROW_NUMBER() OVER (ORDER BY TB.Fecha_Registro DESC, TB.Numero_OT DESC) AS rn
+                {_FROM_PROCESO}
+                {where_sql}
+            )"""
+
+        if incluir_total:
+            # C siempre aporta una fila: si la página está vacía llega solo el total
+            data_query = text(f"""
+                WITH {paginas_sql},
+                C AS (
+                    SELECT COUNT(1) AS total_registros
+                    {_FROM_PROCESO}
+                    {where_sql}
+                )
+                SELECT {_COLUMNAS_PROCESO},{_COLUMNAS_TEMPERATURA},
+                    TB.rn,
+                    C.total_registros
+                FROM C
+                LEFT JOIN P TB ON TB.rn BETWEEN :start_row AND :end_row
+                {_APPLY_TEMPERATURAS}
+                ORDER BY TB.rn
+            """)
+        else:
+            data_query = text(f"""
+                WITH {paginas_sql}
+                SELECT {_COLUMNAS_PROCESO},{_COLUMNAS_TEMPERATURA},
+                    TB.rn
+                FROM P TB
+                {_APPLY_TEMPERATURAS}
+                WHERE TB.rn BETWEEN :start_row AND :end_row
+                ORDER BY TB.rn
+            """)
 
         result = self.connection.execute(data_query, {
-            "fecha_desde": fecha_desde,
-            "fecha_hasta": fecha_hasta,
-            "numero_ot": numero_ot,
+            **params,
             "start_row": start_row,
             "end_row": end_row
         })
 
-        return [dict(row._mapping) for row in result], int(total)
+        total = None
+        filas = []
+        for row in result:
+            fila = dict(row._mapping)
+            if incluir_total:
+                total = int(fila.pop('total_registros') or 0)
+                if fila['rn'] is None:
+                    continue
+            filas.append(fila)
+
+        return filas, total
+
+    def obtener_reporte_hornos_cursor(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None,
+        despues_de: Optional[Sequence[Any]] = None,
+        size: int = 10,
+        desempate: Sequence[str] = ()
+    ) -> Tuple[List[Dict[str, Any]], bool, Optional[List[Any]]]:
+        """
+        Página del reporte por clave (Fecha_Registro, Numero_OT, desempate) descendente
+
+        En lugar de numerar todo el conjunto con ROW_NUMBER, busca directamente
+        las filas posteriores a la última entregada. Las temperaturas se
+        resuelven solo para las filas de la página.
+
+        (Fecha_Registro, Numero_OT) no es única, así que se agregan al orden las
+        columnas de `desempate` (clave única de TBL_DATOS_PROCESO, NOT NULL).
+        Los NULL van al final del orden descendente, como en SQL Server, y la
+        comparación los contempla explícitamente.
+
+        Args:
+            despues_de: Clave de la última fila de la página anterior
+                (Fecha_Registro, Numero_OT, *desempate); None = primera página
+            size: Filas por página (1-100)
+            desempate: Columnas que completan una clave única
+
+        Returns:
+            Tuple: (filas, hay_mas, clave de la última fila entregada)
+        """
+        size = max(1, min(100, int(size)))
+
+        columnas_clave = ["TB.Fecha_Registro", "TB.Numero_OT"] + [
+            "TB." + SQLValidator.quote_identifier(columna) for columna in desempate
+        ]
+        alias_clave = [f"cursor_k{i}" for i in range(len(columnas_clave))]
+
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+
+        if despues_de is not None:
+            condicion, params_cursor = self._condicion_posterior(columnas_clave, list(despues_de))
+            condiciones.append(condicion)
+            params.update(params_cursor)
+
+        # Se pide una fila de más para saber si existe página siguiente
+        params["limite"] = size + 1
+
+        orden_interno = ", ".join(f"{columna} DESC" for columna in columnas_clave)
+        orden_externo = ", ".join(f"TB.{alias} DESC" for alias in alias_clave)
+        clave_interna = ", ".join(
+            f"{columna} AS {alias}" for columna, alias in zip(columnas_clave, alias_clave)
+        )
+        clave_externa = ", ".join(f"TB.{alias}" for alias in alias_clave)
+
+        query = text(f"""
+            SELECT {_COLUMNAS_PROCESO},{_COLUMNAS_TEMPERATURA},
+                {clave_externa}
+            FROM (
+                SELECT TOP (:limite) {_COLUMNAS_PROCESO},
+                    {clave_interna}
+                {_FROM_PROCESO}
+                {self._sql_where(condiciones)}
+                ORDER BY {orden_interno}
+            ) TB
+            {_APPLY_TEMPERATURAS}
+            ORDER BY {orden_externo}
+        """)
+
+        filas = []
+        claves = []
+        for row in self.connection.execute(query, params):
+            fila = dict(row._mapping)
+            claves.append([fila.pop(alias) for alias in alias_clave])
+            filas.append(fila)
+
+        hay_mas = len(filas) > size
+        ultima_clave = claves[size - 1] if hay_mas else None
+        return filas[:size], hay_mas, ultima_clave
+
+    def _condicion_posterior(self, columnas: List[str], valores: List[Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Filas posteriores a `valores` en el orden descendente de `columnas`
+
+        En orden descendente SQL Server deja los NULL al final: después de un
+        valor v vienen los menores y los NULL; después de un NULL, nada.
+        (a, b) se expande a (a después) OR (a igual AND b después).
+        """
+        params: Dict[str, Any] = {}
+        iguales: List[str] = []
+        ramas: List[str] = []
+
+        for i, (columna, valor) in enumerate(zip(columnas, valores)):
+            if valor is None:
+                iguales.append(f"{columna} IS NULL")
+                continue
+
+            nombre = f"cursor_{i}"
+            params[nombre] = self._fecha_como_texto(valor) if isinstance(valor, datetime) else valor
+            ramas.append("(" + " AND ".join(
+                iguales + [f"({columna} < :{nombre} OR {columna} IS NULL)"]
+            ) + ")")
+            iguales.append(f"{columna} = :{nombre}")
+
+        if not ramas:
+            return "1 = 0", params
+        return "(\n                    " + "\n                    OR ".join(ramas) + "\n                )", params
+
+    def obtener_reporte_hornos_por_ots(
+        self,
+        numeros_ot: List[str],
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Reporte de varias OT en una sola consulta
+
+        Las OT se cargan en la tabla temporal #ots (un único INSERT multi-fila)
+        y se unen con TBL_DATOS_PROCESO; no se usa OPENJSON ni TVP para seguir
+        siendo compatible con versiones antiguas de SQL Server. La tabla usa
+        COLLATE DATABASE_DEFAULT para no chocar con la intercalación de tempdb.
+
+        Args:
+            numeros_ot: OT sin repetir (máximo ~1000 por el límite de parámetros)
+
+        Returns:
+            List[Dict]: Filas ordenadas por Numero_OT y Fecha_Registro descendente
+        """
+        if not numeros_ot:
+            return []
+
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, None)
+
+        valores_sql = ", ".join(f"(:ot_{i})" for i in range(len(numeros_ot)))
+        params_ots = {f"ot_{i}": ot for i, ot in enumerate(numeros_ot)}
+
+        # La tabla temporal vive en la sesión: se borra siempre, porque la
+        # conexión vuelve al pool y la reutiliza otro request
+        self.connection.execute(text("""
+            IF OBJECT_ID('tempdb..#ots') IS NOT NULL DROP TABLE #ots;
+            CREATE TABLE #ots (
+                Numero_OT NVARCHAR(100) COLLATE DATABASE_DEFAULT NOT NULL PRIMARY KEY
+            );
+        """))
+        try:
+            self.connection.execute(
+                text(f"INSERT INTO #ots (Numero_OT) VALUES {valores_sql}"),
+                params_ots
+            )
+
+            query = text(f"""
+                SELECT {_COLUMNAS_PROCESO},{_COLUMNAS_TEMPERATURA}
+                FROM #ots O
+                INNER JOIN TBL_DATOS_PROCESO TB ON TB.Numero_OT = O.Numero_OT
+                {_APPLY_TEMPERATURAS}
+                {self._sql_where(condiciones)}
+                ORDER BY TB.Numero_OT, TB.Fecha_Registro DESC
+            """)
+
+            return [dict(row._mapping) for row in self.connection.execute(query, params)]
+        finally:
+            self.connection.execute(text("DROP TABLE #ots"))
+
+    def iterar_datos_proceso(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None,
+        batch_size: int = 5000
+    ) -> Iterator[List[Any]]:
+        """
+        Filas crudas de TBL_DATOS_PROCESO (sin temperaturas) en lotes, por
+        Fecha_Registro ascendente. Columnas: COLUMNAS_PROCESO.
+        """
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+
+        query = text(f"""
+            SELECT {_COLUMNAS_PROCESO}
+            {_FROM_PROCESO}
+            {self._sql_where(condiciones)}
+            ORDER BY TB.Fecha_Registro
+        """)
+
+        result = self.connection.execute(
+            query.execution_options(stream_results=True, yield_per=batch_size),
+            params
+        )
+
+        for lote in result.partitions():
+            yield lote
+
+    def describir_datos_proceso(self) -> List[Tuple]:
+        """
+        cursor.description de las filas de iterar_datos_proceso
+
+        SELECT TOP 0: solo metadatos (tipos SQL con precisión y escala), sin filas.
+        """
+        result = self.connection.execute(text(f"""
+            SELECT TOP 0 {_COLUMNAS_PROCESO}
+            {_FROM_PROCESO}
+        """))
+        descripcion = list(result.cursor.description)
+        result.close()
+        return descripcion
+
+    def contar_reporte_hornos(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None
+    ) -> int:
+        """Cantidad de filas del reporte (sin resolver temperaturas)"""
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+
+        query = text(f"""
+            SELECT COUNT(1) AS total
+            {_FROM_PROCESO}
+            {self._sql_where(condiciones)}
+        """)
+
+        return int(self.connection.execute(query, params).scalar() or 0)
+
+    def obtener_resumen_hornos(
+        self,
+        agrupaciones: List[str],
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        numero_ot: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales de producción agrupados en SQL, en una sola consulta
+
+        Cada dimensión pedida es un GROUPING SET propio y se agrega el conjunto
+        vacío () para el total general. La columna grupo_<dim> vale 0 en las
+        filas agrupadas por esa dimensión y 1 en las demás.
+
+        Args:
+            agrupaciones: Claves de DIMENSIONES_RESUMEN (dia, semana, ot, modo)
+
+        Returns:
+            List[Dict]: Una fila por grupo de cada dimensión más la fila del total
+        """
+        condiciones, params = self._construir_filtros(fecha_desde, fecha_hasta, numero_ot)
+
+        dimensiones = [(nombre, DIMENSIONES_RESUMEN[nombre]) for nombre in agrupaciones]
+        columnas_sql = ",".join(
+            f"\n                {expr} AS {nombre},"
+            f"\n                GROUPING({expr}) AS grupo_{nombre}"
+            for nombre, expr in dimensiones
+        )
+        conjuntos_sql = ", ".join([f"({expr})" for _, expr in dimensiones] + ["()"])
+        orden_sql = ", ".join(expr for _, expr in dimensiones)
+
+        query = text(f"""
+            SELECT {columnas_sql},
+                COUNT(1) AS registros,
+                SUM(TB.Peso_Total) AS peso_total,
+                AVG(CAST(TB.Dureza_1 AS FLOAT)) AS dureza_1_promedio,
+                AVG(CAST(TB.Dureza_2 AS FLOAT)) AS dureza_2_promedio,
+                AVG(CAST(TB.Dureza_3 AS FLOAT)) AS dureza_3_promedio,
+                MIN(TB.Fecha_Registro) AS primer_registro,
+                MAX(TB.Fecha_Registro) AS ultimo_registro
+            {_FROM_PROCESO}
+            {_APPLY_FECHA_REINTERPRETADA}
+            {self._sql_where(condiciones)}
+            GROUP BY GROUPING SETS ({conjuntos_sql})
+            ORDER BY {orden_sql}
+        """)
+
+        return [dict(row._mapping) for row in self.connection.execute(query, params)]
+
+    def obtener_marca_datos(self) -> Dict[str, Any]:
+        """
+        Marca de agua de los datos del reporte
+
+        Cambia cuando se inserta o modifica un registro de proceso o llega una
+        nueva lectura de temperatura. Son tres MAX sobre columnas de fecha, por
+        lo que la consulta es barata si están indexadas.
+        """
+        query = text("""
+            SELECT
+                (SELECT MAX(Fecha_Registro) FROM TBL_DATOS_PROCESO) AS ultimo_registro,
+                (SELECT MAX(Fecha_Modificacion) FROM TBL_DATOS_PROCESO) AS ultima_modificacion,
+                (SELECT MAX(Fecha_Hora) FROM TBL_HISTORICO_TEMPERATURAS) AS ultima_temperatura
+        """)
+
+        return dict(self.connection.execute(query).one()._mapping)
+
+
+class HistoricoTemperaturasRepository:
+    """Lecturas crudas de TBL_HISTORICO_TEMPERATURAS"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def describir_lecturas(self, hornos: Optional[List[int]] = None) -> List[Tuple]:
+        """
+        cursor.description de las filas de iterar_lecturas (mismas columnas)
+
+        SELECT TOP 0: solo metadatos, sin filas.
+        """
+        columnas = [COLUMNAS_HORNO[n - 1] for n in (hornos or range(1, 8))]
+        result = self.connection.execute(text(f"""
+            SELECT TOP 0 TH.Fecha_Hora, {", ".join(f"TH.{c}" for c in columnas)}
+            FROM TBL_HISTORICO_TEMPERATURAS TH
+        """))
+        descripcion = list(result.cursor.description)
+        result.close()
+        return descripcion
+
+    def iterar_lecturas(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        hornos: Optional[List[int]] = None,
+        batch_size: int = 5000,
+        clave: Sequence[str] = ()
+    ) -> Iterator[List[Any]]:
+        """
+        Lecturas en [desde, hasta) por Fecha_Hora ascendente, en lotes
+
+        Args:
+            desde, hasta: Rango semiabierto (None = sin límite)
+            hornos: Números de horno 1-7 a incluir (None = todos)
+            batch_size: Filas por lote leídas del cursor
+            clave: Columnas extra agregadas al final de cada fila (p. ej. la clave única)
+
+        Yields:
+            Lotes de filas (Fecha_Hora, Temp_Horno_0N..., clave...)
+        """
+        columnas = [COLUMNAS_HORNO[n - 1] for n in (hornos or range(1, 8))]
+        columnas += [SQLValidator.quote_identifier(c) for c in clave]
+
+        condiciones = []
+        params: Dict[str, Any] = {}
+        if desde is not None:
+            condiciones.append("TH.Fecha_Hora >= :desde")
+            params["desde"] = desde
+        if hasta is not None:
+            condiciones.append("TH.Fecha_Hora < :hasta")
+            params["hasta"] = hasta
+
+        where_sql = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+
+        query = text(f"""
+            SELECT TH.Fecha_Hora, {", ".join(f"TH.{c}" for c in columnas)}
+            FROM TBL_HISTORICO_TEMPERATURAS TH
+            {where_sql}
+            ORDER BY TH.Fecha_Hora
+        """)
+
+        result = self.connection.execute(
+            query.execution_options(stream_results=True, yield_per=batch_size),
+            params
+        )
+
+        for lote in result.partitions():
+            yield lote
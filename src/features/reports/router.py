@@ -1,16 +1,41 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
 # from flask_jwt_extended import jwt_required
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from config.settings import settings
 from core.database.connection import db
-from .repository import ReporteHornosRepository
-from .service import ReporteHornosService
-import io
-from datetime import datetime
+from core.exceptions.custom_exceptions import AppException, ValidationException
+from api.middlewares.http_cache import etag_from_watermark
+from shared.utils.stream_exporter import StreamExporter
+from shared.utils.serializer import JSONSerializer
+from shared.responses.response_builder import ResponseBuilder
+from .repository import (
+    ReporteHornosRepository,
+    HistoricoTemperaturasRepository,
+    COLUMNAS_REPORTE
+)
+from .temperature_snapshot import snapshot_temperaturas
+from .service import (
+    ReporteHornosService,
+    SerieTemperaturasService,
+    AnaliticaTemperaturasService,
+    estadisticas_cache,
+    marca_datos_actual
+)
+from .excel_export import escribir_excel_reporte_hornos, MIMETYPE_XLSX
+from .export_jobs import exportaciones
+from .columnar_export import escribir_particiones, comprimir_directorio, mes_de, FORMATOS
+from .date_ranges import fecha_reinterpretada
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
 
 reportes_bp = Blueprint('reportes', __name__, url_prefix='/api/reportes')
 
 @reportes_bp.route('/hornos', methods=['GET', 'POST'])
 # @jwt_required()
+@etag_from_watermark(marca_datos_actual)
 def obtener_reporte_hornos():
     """
     GET /api/reportes/hornos?fecha_desde=2025-01-01&fecha_hasta=2026-01-31&numero_ot=OT-12345&page=1&size=10
@@ -23,11 +48,27 @@ def obtener_reporte_hornos():
         "page": 1,
         "size": 10
     }
+
+    Paginado por cursor: enviar "cursor" (vacío en la primera página) y "size";
+    la respuesta trae "next_cursor" para pedir la siguiente página.
+    GET /api/reportes/hornos?cursor=&size=50
+
+    Varias OT en una sola consulta (máximo 500), agrupadas por OT:
+    GET /api/reportes/hornos?numeros_ot=OT-1,OT-2&numeros_ot=OT-3
+    POST {"numeros_ot": ["OT-1", "OT-2", "OT-3"], "fecha_desde": ...}
+    Devuelve todas las filas de esas OT: combinarlo con page, size, cursor o
+    numero_ot responde 400.
+
+    shape=columnar: "data" pasa a {"columns": [...], "rows": [[...], ...]}
+    (nombres de columna una sola vez); shape=rows (default) lista de objetos.
     """
     try:
         # Defaults paginación
         page = None
         size = None
+        cursor = None
+        numeros_ot = None
+        shape = None
 
         # Determinar si es GET o POST y obtener parámetros
         if request.method == 'GET':
@@ -38,6 +79,9 @@ def obtener_reporte_hornos():
             # ✅ paginado desde query
             page = request.args.get('page', None)
             size = request.args.get('size', None)
+            cursor = request.args.get('cursor', None)
+            numeros_ot = _leer_lista_ots(request.args.getlist('numeros_ot'))
+            shape = request.args.get('shape')
 
         else:  # POST
             if request.is_json:
@@ -49,6 +93,9 @@ def obtener_reporte_hornos():
                 # ✅ paginado desde body
                 page = data.get('page')
                 size = data.get('size')
+                cursor = data.get('cursor')
+                numeros_ot = _leer_lista_ots(data.get('numeros_ot'))
+                shape = data.get('shape')
             else:
                 # Fallback a query params si no hay JSON
                 fecha_desde = request.args.get('fecha_desde')
@@ -58,28 +105,48 @@ def obtener_reporte_hornos():
                 # ✅ paginado desde query (fallback)
                 page = request.args.get('page', None)
                 size = request.args.get('size', None)
+                cursor = request.args.get('cursor', None)
+                numeros_ot = _leer_lista_ots(request.args.getlist('numeros_ot'))
+                shape = request.args.get('shape')
+
+        shape = ResponseBuilder.validate_shape(shape)
+        if numeros_ot:
+            _rechazar_con_lista_ots(
+                page=page, size=size, cursor=cursor,
+                numero_ot=numero_ot if numero_ot not in ('', '*') else None
+            )
 
         # Obtener conexión
         with db.get_connection() as conn:
             repository = ReporteHornosRepository(conn)
             service = ReporteHornosService(repository)
 
+            # Lista de OT => una consulta para todas, agrupada por OT
+            if numeros_ot:
+                resultado = service.generar_reporte_ots(
+                    numeros_ot,
+                    fecha_desde=fecha_desde,
+                    fecha_hasta=fecha_hasta
+                )
+                return JSONSerializer.response(_aplicar_forma(resultado, shape))
+
             # ✅ Generar reporte (si page/size vienen => paginado; si no => modo antiguo)
             resultado = service.generar_reporte(
                 fecha_desde=fecha_desde,
                 fecha_hasta=fecha_hasta,
                 numero_ot=numero_ot,
                 page=page,
-                size=size
+                size=size,
+                cursor=cursor
             )
 
-            return jsonify(resultado), 200
+            return JSONSerializer.response(_aplicar_forma(resultado, shape))
 
-    except ValueError as e:
+    except AppException as e:
         return jsonify({
             "success": False,
-            "error": f"Error en formato de fecha: {str(e)}"
-        }), 400
+            "error": e.message
+        }), e.status_code
     except Exception as e:
         return jsonify({
             "success": False,
@@ -87,17 +154,117 @@ def obtener_reporte_hornos():
         }), 500
 
 
+@reportes_bp.route('/hornos/resumen', methods=['GET'])
+@etag_from_watermark(marca_datos_actual)
+def obtener_resumen_hornos():
+    """
+    GET /api/reportes/hornos/resumen?agrupar=dia,ot&fecha_desde=2026-01-01&fecha_hasta=2026-12-31&numero_ot=*
+
+    Totales calculados en SQL Server (GROUPING SETS) en lugar de descargar el
+    reporte completo: registros, SUM(Peso_Total) y promedio de Dureza_1..3.
+    agrupar: dia, semana (inicia el lunes), ot, modo; día y semana usan la
+    fecha corregida.
+    """
+    try:
+        with db.get_connection() as conn:
+            service = ReporteHornosService(ReporteHornosRepository(conn))
+            resultado = service.generar_resumen(
+                fecha_desde=request.args.get('fecha_desde'),
+                fecha_hasta=request.args.get('fecha_hasta'),
+                numero_ot=request.args.get('numero_ot'),
+                agrupar=request.args.get('agrupar')
+            )
+        return JSONSerializer.response(resultado)
+
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reportes_bp.route('/temperaturas', methods=['GET'])
+def obtener_serie_temperaturas():
+    """
+    GET /api/reportes/temperaturas?hornos=1,2,3&desde=2026-01-01&hasta=2026-01-07&puntos=500&metodo=minmax
+
+    Serie de TBL_HISTORICO_TEMPERATURAS reducida en el servidor a ~`puntos`
+    puntos por horno, sin importar el largo del rango.
+    - minmax: por cubeta de tiempo devuelve mínimo y máximo (t, min, max)
+    - lttb: Largest-Triangle-Three-Buckets, un punto (t, v) por cubeta
+
+    Si la copia local de temperaturas está activa y sincronizada, se lee de
+    ella (los datos pueden tener hasta TEMPERATURAS_SNAPSHOT_INTERVALO de atraso).
+    """
+    parametros = dict(
+        desde=request.args.get('desde'),
+        hasta=request.args.get('hasta'),
+        hornos=request.args.get('hornos'),
+        puntos=request.args.get('puntos'),
+        metodo=request.args.get('metodo')
+    )
+
+    try:
+        with _fuente_temperaturas() as (fuente, nombre):
+            resultado = SerieTemperaturasService(fuente).obtener_serie(**parametros)
+        resultado["fuente"] = nombre
+        return JSONSerializer.response(resultado)
+
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reportes_bp.route('/temperaturas/anomalias', methods=['GET'])
+def obtener_anomalias_temperaturas():
+    """
+    GET /api/reportes/temperaturas/anomalias?hornos=1,2&desde=2026-01-01&hasta=2026-01-07&ventana=60&umbral=3
+
+    Marca las lecturas cuyo z-score respecto de los `ventana` minutos previos
+    supera `umbral` (termocuplas fallando, saltos bruscos) y devuelve solo los
+    intervalos marcados. Rango máximo: 31 días.
+    """
+    parametros = dict(
+        desde=request.args.get('desde'),
+        hasta=request.args.get('hasta'),
+        hornos=request.args.get('hornos'),
+        ventana=request.args.get('ventana'),
+        umbral=request.args.get('umbral'),
+        min_lecturas=request.args.get('min_lecturas')
+    )
+
+    try:
+        with _fuente_temperaturas() as (fuente, nombre):
+            resultado = AnaliticaTemperaturasService(fuente).detectar_anomalias(**parametros)
+        return JSONSerializer.response({**resultado, "fuente": nombre})
+
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reportes_bp.route('/cache', methods=['GET'])
+def obtener_estadisticas_cache():
+    """
+    GET /api/reportes/cache
+    Aciertos/fallos de los cachés del reporte y la última marca de agua leída
+    """
+    return jsonify({"success": True, **estadisticas_cache()}), 200
+
+
 @reportes_bp.route('/hornos/excel', methods=['POST'])
 def exportar_reporte_hornos_excel():
     """
     POST /api/reportes/hornos/excel
     Genera Excel profesional con diseño limpio y bien distribuido
+
+    Las filas se leen del cursor por lotes y se escriben en una hoja write-only
+    sobre un archivo temporal; luego el archivo se envía por partes. La memoria
+    usada no depende de la cantidad de registros.
     """
+    ruta_temporal = None
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-
         print("✅ Generando Excel...")
 
         # Obtener parámetros del body
@@ -106,246 +273,49 @@ def exportar_reporte_hornos_excel():
         fecha_hasta = data.get('fecha_hasta')
         numero_ot = data.get('numero_ot')
 
-        # Obtener datos (✅ aquí NO se pagina; exporta todo con los filtros)
+        fd, ruta_temporal = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+
+        # ✅ aquí NO se pagina; exporta todo con los filtros
         with db.get_connection() as conn:
             repository = ReporteHornosRepository(conn)
             service = ReporteHornosService(repository)
 
-            resultado = service.generar_reporte(
-                fecha_desde=fecha_desde,
-                fecha_hasta=fecha_hasta,
-                numero_ot=numero_ot
+            total = escribir_excel_reporte_hornos(
+                service.iterar_reporte(
+                    fecha_desde=fecha_desde,
+                    fecha_hasta=fecha_hasta,
+                    numero_ot=numero_ot
+                ),
+                ruta_temporal
             )
 
-        if not resultado.get('success') or not resultado.get('data'):
+        if total == 0:
+            os.remove(ruta_temporal)
             return jsonify({
                 "success": False,
                 "error": "No hay datos para exportar"
             }), 404
 
-        # Crear workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Reporte Hornos"
-
-        # ==========================================
-        # ESTILOS PROFESIONALES
-        # ==========================================
-
-        header_font = Font(bold=True, color="FFFFFF", size=11, name="Calibri")
-        header_fill = PatternFill(start_color="2C5F8D", end_color="2C5F8D", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        thin_border = Border(
-            left=Side(style='thin', color='D3D3D3'),
-            right=Side(style='thin', color='D3D3D3'),
-            top=Side(style='thin', color='D3D3D3'),
-            bottom=Side(style='thin', color='D3D3D3')
-        )
-
-        data_alignment = Alignment(horizontal="left", vertical="center")
-        data_font = Font(size=10, name="Calibri")
-        number_alignment = Alignment(horizontal="right", vertical="center")
-
-        # ==========================================
-        # TÍTULO DEL REPORTE
-        # ==========================================
-        ws.merge_cells('A1:S1')
-        title_cell = ws['A1']
-        title_cell.value = f"REPORTE DE HORNOS - MODEPSA"
-        title_cell.font = Font(bold=True, size=14, color="2C5F8D", name="Calibri")
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        ws.merge_cells('A2:S2')
-        subtitle_cell = ws['A2']
-        fecha_reporte = datetime.now().strftime('%d/%m/%Y %H:%M')
-        subtitle_cell.value = f"Generado el: {fecha_reporte}"
-        subtitle_cell.font = Font(size=10, color="666666", name="Calibri")
-        subtitle_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        ws.row_dimensions[3].height = 5
-
-        # ==========================================
-        # HEADERS DE COLUMNAS
-        # ==========================================
-        headers = [
-            ("Fecha Registro", 20),
-            ("Número OT", 15),
-            ("Tiempo Asignado.", 12),
-            ("Peso Total", 12),
-            ("Fecha Fin Manual", 18),
-            ("Fecha Fin Auto", 18),
-            ("Modo Ingreso", 14),
-            ("Dureza 1", 10),
-            ("Dureza 2", 10),
-            ("Dureza 3", 10),
-            ("Fecha Modif.", 18),
-            ("Usuario", 12),
-            ("Temp H1", 10),
-            ("Temp H2", 10),
-            ("Temp H3", 10),
-            ("Temp H4", 10),
-            ("Temp H5", 10),
-            ("Temp H6", 10),
-            ("Temp H7", 10)
-        ]
-
-        header_row = 4
-
-        for col_num, (header_text, width) in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col_num)
-            cell.value = header_text
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = thin_border
-
-            column_letter = get_column_letter(col_num)
-            ws.column_dimensions[column_letter].width = width
-
-        ws.row_dimensions[header_row].height = 30
-
-        # ==========================================
-        # ESCRIBIR DATOS
-        # ==========================================
-        for row_num, registro in enumerate(resultado['data'], header_row + 1):
-            if row_num % 2 == 0:
-                row_fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
-            else:
-                row_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
-
-            cell = ws.cell(row=row_num, column=1)
-            cell.value = str(registro.get('Fecha_Registro')) if registro.get('Fecha_Registro') else "-"
-            cell.font = data_font
-            cell.alignment = data_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=2)
-            cell.value = registro.get('Numero_OT') or "-"
-            cell.font = Font(bold=True, size=10, color="2C5F8D", name="Calibri")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=3)
-            peso_unit = registro.get('Peso_Unitario')
-            cell.value = float(peso_unit) if peso_unit else None
-            cell.number_format = '#,##0.00'
-            cell.font = data_font
-            cell.alignment = number_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=4)
-            peso_total = registro.get('Peso_Total')
-            cell.value = float(peso_total) if peso_total else None
-            cell.number_format = '#,##0.00'
-            cell.font = Font(bold=True, size=10, color="28A745", name="Calibri")
-            cell.alignment = number_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=5)
-            cell.value = str(registro.get('Fecha_Fin_Manual')) if registro.get('Fecha_Fin_Manual') else "-"
-            cell.font = Font(size=9, name="Calibri")
-            cell.alignment = data_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=6)
-            cell.value = str(registro.get('Fecha_Fin_Auto')) if registro.get('Fecha_Fin_Auto') else "-"
-            cell.font = Font(size=9, name="Calibri")
-            cell.alignment = data_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=7)
-            modo = registro.get('Modo_Ingreso_Carga')
-            cell.value = modo or "-"
-            if modo == "Automatico":
-                cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-                cell.font = Font(bold=True, size=10, color="155724", name="Calibri")
-            else:
-                cell.fill = row_fill
-                cell.font = data_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-
-            for col_offset, dureza_key in enumerate(['Dureza_1', 'Dureza_2', 'Dureza_3']):
-                cell = ws.cell(row=row_num, column=8 + col_offset)
-                dureza = registro.get(dureza_key)
-                cell.value = float(dureza) if dureza else None
-                cell.number_format = '#,##0.0'
-                cell.font = data_font
-                cell.alignment = number_alignment
-                cell.border = thin_border
-                cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=11)
-            cell.value = str(registro.get('Fecha_Modificacion')) if registro.get('Fecha_Modificacion') else "-"
-            cell.font = Font(size=9, name="Calibri")
-            cell.alignment = data_alignment
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            cell = ws.cell(row=row_num, column=12)
-            cell.value = registro.get('Usuario') or "-"
-            cell.font = data_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-            cell.fill = row_fill
-
-            temp_keys = [
-                'TEMPERATURA HORNO1', 'TEMPERATURA HORNO2', 'TEMPERATURA HORNO3',
-                'TEMPERATURA HORNO4', 'TEMPERATURA HORNO5', 'TEMPERATURA HORNO6',
-                'TEMPERATURA HORNO7'
-            ]
-
-            for col_offset, temp_key in enumerate(temp_keys):
-                cell = ws.cell(row=row_num, column=13 + col_offset)
-                temp = registro.get(temp_key)
-
-                if temp:
-                    cell.value = float(temp)
-                    cell.number_format = '#,##0.0'
-                    cell.font = Font(bold=True, size=10, color="E67E22", name="Calibri")
-                    cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                else:
-                    cell.value = "-"
-                    cell.font = Font(size=9, color="999999", name="Calibri")
-                    cell.fill = row_fill
-
-                cell.alignment = number_alignment
-                cell.border = thin_border
-
-            ws.row_dimensions[row_num].height = 20
-
-        last_row = len(resultado['data']) + header_row + 2
-
-        ws.merge_cells(f'A{last_row}:S{last_row}')
-        footer_cell = ws[f'A{last_row}']
-        footer_cell.value = f"Total de registros: {len(resultado['data'])}"
-        footer_cell.font = Font(bold=True, size=10, color="666666", name="Calibri")
-        footer_cell.alignment = Alignment(horizontal="right", vertical="center")
-
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'Reporte_Hornos_{timestamp}.xlsx'
 
-        print(f"✅ Excel generado: {filename}")
+        print(f"✅ Excel generado: {filename} ({total} registros)")
 
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
+        return Response(
+            _leer_y_eliminar(ruta_temporal),
+            mimetype=MIMETYPE_XLSX,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            direct_passthrough=True
         )
 
+    except AppException as e:
+        if ruta_temporal and os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        return jsonify({"success": False, "error": e.message}), e.status_code
     except Exception as e:
+        if ruta_temporal and os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
         print(f"❌ Error al exportar Excel: {str(e)}")
         import traceback
         traceback.print_exc()
@@ -353,3 +323,271 @@ def exportar_reporte_hornos_excel():
             "success": False,
             "error": str(e)
         }), 500
+
+
+@reportes_bp.route('/hornos/excel/jobs', methods=['POST'])
+def crear_exportacion_excel():
+    """
+    POST /api/reportes/hornos/excel/jobs
+    Body JSON: {"fecha_desde": "2026-01-01", "fecha_hasta": "2026-01-31", "numero_ot": "*"}
+
+    Encola la exportación y responde de inmediato con su job_id. Si ya existe
+    un archivo para los mismos filtros y los datos no cambiaron, el trabajo
+    aparece directamente como "completado".
+    """
+    try:
+        data = request.get_json() if request.is_json else {}
+        estado = exportaciones.enviar(
+            fecha_desde=data.get('fecha_desde'),
+            fecha_hasta=data.get('fecha_hasta'),
+            numero_ot=data.get('numero_ot')
+        )
+        return jsonify({"success": True, **estado}), 202
+
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@reportes_bp.route('/hornos/excel/jobs/<job_id>', methods=['GET'])
+def estado_exportacion_excel(job_id: str):
+    """
+    GET /api/reportes/hornos/excel/jobs/{job_id}
+    Estado: en_cola | en_proceso | completado | error, con progreso en %
+    """
+    try:
+        return jsonify({"success": True, **exportaciones.estado(job_id)}), 200
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+
+
+@reportes_bp.route('/hornos/excel/jobs/<job_id>/descarga', methods=['GET'])
+def descargar_exportacion_excel(job_id: str):
+    """
+    GET /api/reportes/hornos/excel/jobs/{job_id}/descarga
+    Descarga el archivo de una exportación completada
+    """
+    try:
+        ruta = exportaciones.ruta_resultado(job_id)
+        return send_file(
+            ruta,
+            mimetype=MIMETYPE_XLSX,
+            as_attachment=True,
+            download_name=f'Reporte_Hornos_{job_id[:8]}.xlsx'
+        )
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+
+
+@reportes_bp.route('/hornos/export', methods=['GET'])
+def exportar_reporte_hornos_stream():
+    """
+    GET /api/reportes/hornos/export?format=csv&gzip=true&fecha_desde=2026-01-01&fecha_hasta=2026-01-31&numero_ot=*
+
+    Exporta las filas crudas del reporte en CSV o NDJSON (un JSON por línea).
+    Las filas se envían a medida que se leen del cursor, sin armar el
+    resultado en memoria. Con gzip=true el archivo va comprimido (.gz).
+    """
+    formato = request.args.get('format', 'csv').lower()
+    comprimir = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+
+    if formato not in StreamExporter.FORMATS:
+        return jsonify({
+            "success": False,
+            "error": f"Formato no soportado: {formato}. Use csv o ndjson"
+        }), 400
+
+    fecha_desde = request.args.get('fecha_desde')
+    fecha_hasta = request.args.get('fecha_hasta')
+    numero_ot = request.args.get('numero_ot')
+
+    # Validar filtros antes de empezar a enviar la respuesta
+    try:
+        ReporteHornosService.normalizar_filtros(fecha_desde, fecha_hasta, numero_ot)
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+
+    def lotes():
+        # Conexión propia: se lee mientras se envía la respuesta
+        with db.get_connection(scoped=False) as conn:
+            service = ReporteHornosService(ReporteHornosRepository(conn))
+            for lote in service.iterar_reporte(fecha_desde, fecha_hasta, numero_ot):
+                yield [[fila[columna] for columna in COLUMNAS_REPORTE] for fila in lote]
+
+    mimetype, extension = StreamExporter.FORMATS[formato]
+    if formato == 'csv':
+        chunks = StreamExporter.csv_chunks(COLUMNAS_REPORTE, lotes())
+    else:
+        chunks = StreamExporter.ndjson_chunks(COLUMNAS_REPORTE, lotes())
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'Reporte_Hornos_{timestamp}.{extension}'
+
+    if comprimir:
+        chunks = StreamExporter.gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        direct_passthrough=True
+    )
+
+
+@reportes_bp.route('/columnar/<dataset>', methods=['GET'])
+def exportar_columnar(dataset: str):
+    """
+    GET /api/reportes/columnar/proceso?formato=parquet&fecha_desde=2026-01-01&fecha_hasta=2026-03-31
+    GET /api/reportes/columnar/temperaturas?formato=arrow&fecha_desde=2026-01-01&fecha_hasta=2026-03-31
+
+    Exporta TBL_DATOS_PROCESO ("proceso") o TBL_HISTORICO_TEMPERATURAS
+    ("temperaturas") en archivos Parquet o Arrow IPC tipados, uno por mes,
+    empaquetados en un .zip con particiones mes=AAAA-MM.
+
+    - proceso: filtra y particiona por la fecha corregida, igual que el reporte
+    - temperaturas: filtra y particiona por Fecha_Hora
+    """
+    directorio = None
+    ruta_zip = None
+    try:
+        formato = request.args.get('formato', 'parquet').lower()
+        if formato not in FORMATOS:
+            return jsonify({
+                "success": False,
+                "error": f"Formato no soportado: {formato}. Use parquet o arrow"
+            }), 400
+        if dataset not in ('proceso', 'temperaturas'):
+            return jsonify({
+                "success": False,
+                "error": f"Dataset no soportado: {dataset}. Use proceso o temperaturas"
+            }), 404
+
+        fecha_desde, fecha_hasta, numero_ot = ReporteHornosService.normalizar_filtros(
+            request.args.get('fecha_desde'),
+            request.args.get('fecha_hasta'),
+            request.args.get('numero_ot')
+        )
+
+        directorio = tempfile.mkdtemp(prefix=f'columnar_{dataset}_')
+
+        with db.get_connection() as conn:
+            if dataset == 'proceso':
+                repository = ReporteHornosRepository(conn)
+                descripcion = repository.describir_datos_proceso()
+                lotes = repository.iterar_datos_proceso(
+                    fecha_desde, fecha_hasta, numero_ot
+                )
+
+                def mes_de_fila(fila):
+                    fecha = fila[0]
+                    if fecha is None:
+                        return mes_de(None)
+                    return mes_de(fecha_reinterpretada(fecha.year, fecha.month, fecha.day))
+            else:
+                repository = HistoricoTemperaturasRepository(conn)
+                descripcion = repository.describir_lecturas()
+                lotes = repository.iterar_lecturas(
+                    desde=datetime.combine(fecha_desde, time.min) if fecha_desde else None,
+                    hasta=datetime.combine(fecha_hasta + timedelta(days=1), time.min) if fecha_hasta else None
+                )
+
+                def mes_de_fila(fila):
+                    return mes_de(fila[0])
+
+            total = escribir_particiones(descripcion, lotes, directorio, formato, mes_de_fila)
+
+        if total == 0:
+            return jsonify({
+                "success": False,
+                "error": "No hay datos para exportar"
+            }), 404
+
+        fd, ruta_zip = tempfile.mkstemp(suffix='.zip')
+        os.close(fd)
+        comprimir_directorio(directorio, ruta_zip)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f'{dataset}_{formato}_{timestamp}.zip'
+        respuesta = Response(
+            _leer_y_eliminar(ruta_zip),
+            mimetype='application/zip',
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            direct_passthrough=True
+        )
+        ruta_zip = None
+        return respuesta
+
+    except AppException as e:
+        return jsonify({"success": False, "error": e.message}), e.status_code
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    finally:
+        if directorio:
+            shutil.rmtree(directorio, ignore_errors=True)
+        if ruta_zip and os.path.exists(ruta_zip):
+            os.remove(ruta_zip)
+
+
+def _aplicar_forma(resultado: dict, shape: str) -> dict:
+    """Forma columnar de "data" (y de cada grupo de OT); el resultado cacheado no se toca"""
+    if shape != 'columnar':
+        return resultado
+
+    def columnar(filas):
+        columnas = list(filas[0].keys()) if filas else list(COLUMNAS_REPORTE)
+        return ResponseBuilder.shape_records(filas, shape, columnas)
+
+    if "ots" in resultado:
+        return {
+            **resultado,
+            "shape": shape,
+            "ots": [{**grupo, "data": columnar(grupo["data"])} for grupo in resultado["ots"]]
+        }
+    return {**resultado, "shape": shape, "data": columnar(resultado["data"])}
+
+
+def _rechazar_con_lista_ots(**parametros) -> None:
+    """numeros_ot devuelve todas las filas de esas OT: no se combina con paginado ni numero_ot"""
+    enviados = [nombre for nombre, valor in parametros.items() if valor is not None]
+    if enviados:
+        raise ValidationException(
+            f"numeros_ot no se puede combinar con: {', '.join(enviados)}"
+        )
+
+
+def _leer_lista_ots(valor) -> list:
+    """OT recibidas como lista JSON, texto separado por comas o parámetro repetido"""
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        valor = [valor]
+    ots = []
+    for elemento in valor:
+        ots.extend(parte for parte in str(elemento).split(',') if parte.strip())
+    return ots
+
+
+def _leer_y_eliminar(ruta: str, chunk_size: int = 64 * 1024):
+    """Envía un archivo temporal por partes y lo borra al terminar"""
+    try:
+        with open(ruta, 'rb') as archivo:
+            while True:
+                chunk = archivo.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(ruta)
+
+
+@contextmanager
+def _fuente_temperaturas():
+    """Copia local de temperaturas si está sincronizada; si no, SQL Server"""
+    if settings.TEMPERATURAS_SNAPSHOT and snapshot_temperaturas.disponible():
+        yield snapshot_temperaturas, "snapshot"
+    else:
+        with db.get_connection() as conn:
+            yield HistoricoTemperaturasRepository(conn), "sql"
@@ -1,9 +1,117 @@
-from typing import Optional, Dict, Any
-from datetime import date
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from datetime import date, datetime, timedelta
 import math
-from .repository import ReporteHornosRepository
+import threading
+import time
+from config.settings import settings
+from core.database.connection import db
+from core.exceptions.custom_exceptions import AppException, ValidationException
+from shared.utils.cursor import CursorCodec
+from shared.utils.ttl_cache import TTLCache
+from features.tables.repository import TablesRepository
+from .repository import (
+    ReporteHornosRepository, HistoricoTemperaturasRepository, COLUMNAS_HORNO, DIMENSIONES_RESUMEN
+)
+
+_TABLA_PROCESO = 'TBL_DATOS_PROCESO'
+
+
+def _parse_fecha(valor: Optional[str], nombre: str) -> Optional[date]:
+    """Fecha AAAA-MM-DD de un filtro; un formato inválido es un 400"""
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise ValidationException(f"Error en formato de fecha: '{nombre}' debe ser AAAA-MM-DD")
+
+
+def _parse_numero(valor: Any, nombre: str, defecto, tipo=int):
+    """Entero (o float) de un parámetro; vacío => defecto, inválido => 400"""
+    if valor is None or valor == '':
+        return defecto
+    if isinstance(valor, bool):
+        raise ValidationException(f"'{nombre}' debe ser numérico")
+    try:
+        numero = tipo(valor)
+    except (TypeError, ValueError):
+        raise ValidationException(f"'{nombre}' debe ser numérico")
+    if isinstance(numero, float) and not math.isfinite(numero):
+        raise ValidationException(f"'{nombre}' debe ser numérico")
+    return numero
+
+
+class _MarcaDatos:
+    """Marca de agua de los datos del reporte, sondeada como máximo cada `intervalo` segundos"""
+
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self._valor: Optional[Tuple] = None
+        self._leida = 0.0
+        self._lock = threading.Lock()
+
+    def obtener(self, repository: ReporteHornosRepository) -> Tuple:
+        with self._lock:
+            if self._valor is not None and time.monotonic() - self._leida < self.intervalo:
+                return self._valor
+
+        valor = tuple(repository.obtener_marca_datos().values())
+
+        with self._lock:
+            self._valor = valor
+            self._leida = time.monotonic()
+        return valor
+
+    def actual(self) -> Optional[Tuple]:
+        with self._lock:
+            return self._valor
+
+    def vigente(self) -> Optional[Tuple]:
+        """Valor sondeado si todavía no venció el intervalo (None si hay que sondear)"""
+        with self._lock:
+            if self._valor is not None and time.monotonic() - self._leida < self.intervalo:
+                return self._valor
+            return None
+
+
+# Las claves de ambos cachés incluyen la marca de agua: cuando llegan datos
+# nuevos las entradas anteriores dejan de coincidir y salen por LRU/TTL.
+_marca_datos = _MarcaDatos(intervalo=settings.REPORTES_MARCA_INTERVALO)
+
+# Totales por filtro normalizado: al navegar páginas del mismo filtro no se recuenta
+_cache_totales = TTLCache(maxsize=256, ttl=settings.REPORTES_TOTAL_TTL)
+
+# Respuestas completas de generar_reporte (filtros + página)
+_cache_reportes = TTLCache(maxsize=settings.REPORTES_CACHE_MAX, ttl=settings.REPORTES_CACHE_TTL)
+
+# Anomalías de ventanas ya cerradas: esas lecturas no cambian, el TTL puede ser largo
+_cache_anomalias = TTLCache(maxsize=64, ttl=settings.REPORTES_ANALITICA_TTL)
+
+
+def marca_datos_actual() -> Tuple:
+    """Marca de agua vigente; abre una conexión solo si hay que volver a sondear"""
+    marca = _marca_datos.vigente()
+    if marca is None:
+        with db.get_connection() as conn:
+            marca = _marca_datos.obtener(ReporteHornosRepository(conn))
+    return marca
+
+
+def estadisticas_cache() -> Dict[str, Any]:
+    """Contadores de los cachés del reporte, para ajustar tamaños y TTL"""
+    marca = _marca_datos.actual()
+    return {
+        "reportes": _cache_reportes.stats(),
+        "totales": _cache_totales.stats(),
+        "anomalias": _cache_anomalias.stats(),
+        "marca_datos": [str(valor) for valor in marca] if marca else None
+    }
+
 
 class ReporteHornosService:
+    # Límite de OT por consulta en lote (cada OT es un parámetro del INSERT)
+    MAX_OTS = 500
+
     def __init__(self, repository: ReporteHornosRepository):
         self.repository = repository
 
@@ -13,31 +121,72 @@ class ReporteHornosService:
         fecha_hasta: Optional[str] = None,
         numero_ot: Optional[str] = None,
         page: Optional[int] = None,
-        size: Optional[int] = None
+        size: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        # Convertir strings a dates si es necesario
-        fecha_desde_obj = date.fromisoformat(fecha_desde) if fecha_desde else None
-        fecha_hasta_obj = date.fromisoformat(fecha_hasta) if fecha_hasta else None
+        fecha_desde_obj, fecha_hasta_obj, numero_ot = self.normalizar_filtros(
+            fecha_desde, fecha_hasta, numero_ot
+        )
 
-        # Normalizar numero_ot
-        if numero_ot is not None:
-            numero_ot = numero_ot.strip()
-            if numero_ot == "":
-                numero_ot = None
+        if cursor is not None and not isinstance(cursor, str):
+            raise ValidationException("El cursor debe ser un texto (next_cursor de la respuesta anterior)")
+
+        if cursor is not None or page is not None or size is not None:
+            page = _parse_numero(page, 'page', 1)
+            size = _parse_numero(size, 'size', 10)
+
+        marca = _marca_datos.obtener(self.repository)
+        clave = (marca, fecha_desde_obj, fecha_hasta_obj, numero_ot or '*', page, size, cursor)
+
+        resultado = _cache_reportes.get(clave)
+        if resultado is not None:
+            return resultado
+
+        resultado = self._consultar_reporte(
+            fecha_desde_obj, fecha_hasta_obj, numero_ot, page, size, cursor, marca
+        )
+
+        # Reportes completos muy grandes no se guardan para no inflar la memoria
+        if len(resultado["data"]) <= settings.REPORTES_CACHE_MAX_FILAS:
+            _cache_reportes.set(clave, resultado)
+
+        return resultado
+
+    def _consultar_reporte(
+        self,
+        fecha_desde_obj: Optional[date],
+        fecha_hasta_obj: Optional[date],
+        numero_ot: Optional[str],
+        page: Optional[int],
+        size: Optional[int],
+        cursor: Optional[str],
+        marca: Tuple
+    ) -> Dict[str, Any]:
+        # Si viene cursor => paginado por clave (cursor vacío = primera página)
+        if cursor is not None:
+            return self._generar_reporte_cursor(
+                fecha_desde_obj, fecha_hasta_obj, numero_ot, cursor, size
+            )
 
         # Si viene page/size => paginado
-        if page is not None or size is not None:
-            page = int(page or 1)
-            size = int(size or 10)
+        if page is not None:
+            clave_total = (marca, fecha_desde_obj, fecha_hasta_obj, numero_ot or '*')
+            total = _cache_totales.get(clave_total)
+            total_cached = total is not None
 
-            data, total = self.repository.obtener_reporte_hornos_paginado(
+            data, total_consultado = self.repository.obtener_reporte_hornos_paginado(
                 fecha_desde=fecha_desde_obj,
                 fecha_hasta=fecha_hasta_obj,
                 numero_ot=numero_ot,
                 page=page,
-                size=size
+                size=size,
+                incluir_total=not total_cached
             )
 
+            if not total_cached:
+                total = total_consultado
+                _cache_totales.set(clave_total, total)
+
             pages = max(1, math.ceil(total / max(1, size)))
 
             return {
@@ -46,7 +195,8 @@ class ReporteHornosService:
                 "page": page,
                 "size": size,
                 "total": total,
-                "pages": pages
+                "pages": pages,
+                "total_cached": total_cached
             }
 
         # Si NO viene page/size => modo antiguo (para Excel u otros)
@@ -61,3 +211,447 @@ class ReporteHornosService:
             "total": len(datos),
             "data": datos
         }
+
+    def generar_reporte_ots(
+        self,
+        numeros_ot: List[str],
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Reporte de una lista de OT, agrupado por OT
+
+        Args:
+            numeros_ot: OT a consultar (se ignoran vacías, '*' y repetidas)
+
+        Returns:
+            Dict: Un grupo por OT encontrada, en el orden pedido, y la lista
+            de OT sin resultados
+        """
+        fecha_desde_obj, fecha_hasta_obj, _ = self.normalizar_filtros(fecha_desde, fecha_hasta, None)
+
+        # Clave de comparación: SQL Server ignora mayúsculas y espacios finales
+        solicitadas: Dict[str, str] = {}
+        for ot in numeros_ot:
+            ot = str(ot).strip()
+            if ot and ot != '*':
+                solicitadas.setdefault(ot.upper(), ot)
+
+        if not solicitadas:
+            raise ValidationException("Debe indicar al menos un número de OT")
+        if len(solicitadas) > self.MAX_OTS:
+            raise ValidationException(f"Se permiten como máximo {self.MAX_OTS} OT por consulta")
+
+        marca = _marca_datos.obtener(self.repository)
+        clave = ('ots', marca, fecha_desde_obj, fecha_hasta_obj, tuple(solicitadas))
+
+        resultado = _cache_reportes.get(clave)
+        if resultado is not None:
+            return resultado
+
+        filas = self.repository.obtener_reporte_hornos_por_ots(
+            list(solicitadas.values()),
+            fecha_desde=fecha_desde_obj,
+            fecha_hasta=fecha_hasta_obj
+        )
+
+        por_ot: Dict[str, List[Dict[str, Any]]] = {}
+        for fila in filas:
+            por_ot.setdefault(str(fila['Numero_OT']).strip().upper(), []).append(fila)
+
+        grupos = []
+        sin_resultados = []
+        for normalizada, ot in solicitadas.items():
+            datos = por_ot.get(normalizada)
+            if datos:
+                grupos.append({"numero_ot": ot, "total": len(datos), "data": datos})
+            else:
+                sin_resultados.append(ot)
+
+        resultado = {
+            "success": True,
+            "total": len(filas),
+            "ots": grupos,
+            "sin_resultados": sin_resultados
+        }
+
+        if len(filas) <= settings.REPORTES_CACHE_MAX_FILAS:
+            _cache_reportes.set(clave, resultado)
+
+        return resultado
+
+    def generar_resumen(
+        self,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        numero_ot: Optional[str] = None,
+        agrupar: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Totales de producción por día, semana, OT y/o modo de carga
+
+        Args:
+            agrupar: Dimensiones separadas por coma (dia, semana, ot, modo); default "dia"
+
+        Returns:
+            Dict: Total general y una lista de grupos por cada dimensión
+        """
+        fecha_desde_obj, fecha_hasta_obj, numero_ot = self.normalizar_filtros(
+            fecha_desde, fecha_hasta, numero_ot
+        )
+
+        agrupaciones = []
+        for nombre in (agrupar or 'dia').lower().split(','):
+            nombre = nombre.strip()
+            if not nombre or nombre in agrupaciones:
+                continue
+            if nombre not in DIMENSIONES_RESUMEN:
+                raise ValidationException(
+                    f"Agrupación no soportada: {nombre}. Use {', '.join(DIMENSIONES_RESUMEN)}"
+                )
+            agrupaciones.append(nombre)
+        if not agrupaciones:
+            raise ValidationException("Debe indicar al menos una agrupación")
+
+        marca = _marca_datos.obtener(self.repository)
+        clave = ('resumen', marca, fecha_desde_obj, fecha_hasta_obj, numero_ot or '*', tuple(agrupaciones))
+
+        resultado = _cache_reportes.get(clave)
+        if resultado is not None:
+            return resultado
+
+        filas = self.repository.obtener_resumen_hornos(
+            agrupaciones,
+            fecha_desde=fecha_desde_obj,
+            fecha_hasta=fecha_hasta_obj,
+            numero_ot=numero_ot
+        )
+
+        # Separar las filas por GROUPING SET: la dimensión con grupo_<dim> = 0
+        grupos: Dict[str, List[Dict[str, Any]]] = {nombre: [] for nombre in agrupaciones}
+        total: Dict[str, Any] = {"registros": 0}
+        for fila in filas:
+            banderas = {nombre: fila.pop(f"grupo_{nombre}") for nombre in agrupaciones}
+            propia = next((nombre for nombre, bandera in banderas.items() if bandera == 0), None)
+            for nombre in agrupaciones:
+                if nombre != propia:
+                    fila.pop(nombre)
+            if propia is None:
+                total = fila
+            else:
+                grupos[propia].append(fila)
+
+        resultado = {
+            "success": True,
+            "agrupar": agrupaciones,
+            "total": total,
+            "grupos": grupos
+        }
+        _cache_reportes.set(clave, resultado)
+        return resultado
+
+    @staticmethod
+    def normalizar_filtros(
+        fecha_desde: Optional[str],
+        fecha_hasta: Optional[str],
+        numero_ot: Optional[str]
+    ):
+        """Filtros comunes de los reportes; un valor inválido lanza ValidationException"""
+        fecha_desde_obj = _parse_fecha(fecha_desde, 'fecha_desde')
+        fecha_hasta_obj = _parse_fecha(fecha_hasta, 'fecha_hasta')
+
+        # Normalizar numero_ot
+        if numero_ot is not None:
+            numero_ot = str(numero_ot).strip()
+            if numero_ot == "":
+                numero_ot = None
+
+        return fecha_desde_obj, fecha_hasta_obj, numero_ot
+
+    def iterar_reporte(
+        self,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        numero_ot: Optional[str] = None,
+        batch_size: int = 2000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Reporte completo (sin paginar) en lotes, para exportaciones"""
+        fecha_desde_obj, fecha_hasta_obj, numero_ot = self.normalizar_filtros(
+            fecha_desde, fecha_hasta, numero_ot
+        )
+
+        return self.repository.iterar_reporte_hornos(
+            fecha_desde=fecha_desde_obj,
+            fecha_hasta=fecha_hasta_obj,
+            numero_ot=numero_ot,
+            batch_size=batch_size
+        )
+
+    def _generar_reporte_cursor(
+        self,
+        fecha_desde: Optional[date],
+        fecha_hasta: Optional[date],
+        numero_ot: Optional[str],
+        cursor: str,
+        size: int
+    ) -> Dict[str, Any]:
+        desempate = _columnas_desempate()
+
+        despues_de = None
+        if cursor.strip():
+            valores = CursorCodec.decode(cursor.strip())
+            if len(valores) != 2 + len(desempate) or not isinstance(valores[0], (datetime, type(None))):
+                raise ValidationException("Cursor inválido para el reporte de hornos")
+            despues_de = valores
+
+        data, hay_mas, ultima_clave = self.repository.obtener_reporte_hornos_cursor(
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            numero_ot=numero_ot,
+            despues_de=despues_de,
+            size=size,
+            desempate=desempate
+        )
+
+        next_cursor = CursorCodec.encode(ultima_clave) if ultima_clave is not None else None
+
+        return {
+            "success": True,
+            "data": data,
+            "size": size,
+            "next_cursor": next_cursor,
+            "has_more": hay_mas
+        }
+
+
+def _columnas_desempate() -> List[str]:
+    """
+    Columnas de la clave única de TBL_DATOS_PROCESO que completan el orden
+    (Fecha_Registro, Numero_OT) del cursor, según el catálogo
+    """
+    clave = TablesRepository().get_pagination_key(_TABLA_PROCESO)
+    if clave is None:
+        raise AppException(
+            f"{_TABLA_PROCESO} no tiene clave primaria ni índice único; use page/size", 501
+        )
+    return [
+        columna["name"] for columna in clave
+        if columna["name"] not in ('Fecha_Registro', 'Numero_OT')
+    ]
+
+
+class SerieTemperaturasService:
+    """Series de temperatura reducidas para gráficos"""
+
+    METODOS = ('minmax', 'lttb')
+    MAX_PUNTOS = 5000
+
+    # LTTB se aplica sobre promedios de cubetas más finas que la salida
+    _FACTOR_LTTB = 8
+
+    def __init__(self, repository: HistoricoTemperaturasRepository):
+        self.repository = repository
+
+    def obtener_serie(
+        self,
+        desde: Optional[str],
+        hasta: Optional[str],
+        hornos: Optional[str] = None,
+        puntos: Optional[int] = None,
+        metodo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Serie reducida de las temperaturas de uno o más hornos
+
+        Args:
+            desde, hasta: Fecha (AAAA-MM-DD, día completo) o fecha-hora ISO
+            hornos: Números de horno separados por coma ("1,3,7"); por defecto todos
+            puntos: Cantidad aproximada de puntos por serie (default 500)
+            metodo: "minmax" (envolvente por cubeta) o "lttb"
+
+        Returns:
+            Dict: Serie reducida y cantidad de lecturas procesadas
+        """
+        inicio = self.parse_instante(desde, fin=False)
+        fin = self.parse_instante(hasta, fin=True)
+        if inicio is None or fin is None:
+            raise ValidationException("Se requieren 'desde' y 'hasta'")
+        if fin <= inicio:
+            raise ValidationException("'hasta' debe ser posterior a 'desde'")
+
+        numeros = self.parse_hornos(hornos)
+        puntos = max(3, min(self.MAX_PUNTOS, _parse_numero(puntos, 'puntos', 500)))
+        metodo = (metodo or 'minmax').lower()
+        if metodo not in self.METODOS:
+            raise ValidationException(f"Método no soportado: {metodo}. Use minmax o lttb")
+
+        try:
+            from . import downsampling
+        except ImportError:
+            raise AppException("La serie de temperaturas requiere numpy instalado", 501)
+
+        # minmax devuelve dos valores por cubeta: la mitad de cubetas que de puntos
+        cubetas = puntos // 2 if metodo == 'minmax' else puntos * self._FACTOR_LTTB
+        acumulador = downsampling.AcumuladorCubetas(
+            downsampling.a_ms(inicio), downsampling.a_ms(fin), cubetas, len(numeros)
+        )
+
+        for lote in self.repository.iterar_lecturas(desde=inicio, hasta=fin, hornos=numeros):
+            acumulador.agregar(*downsampling.lote_a_arrays(lote))
+
+        nombres = [COLUMNAS_HORNO[n - 1] for n in numeros]
+        if metodo == 'minmax':
+            serie = downsampling.serie_min_max(acumulador, nombres)
+        else:
+            serie = downsampling.serie_lttb(acumulador, nombres, puntos)
+
+        return {
+            "success": True,
+            "desde": inicio.isoformat(),
+            "hasta": fin.isoformat(),
+            "metodo": metodo,
+            "puntos": puntos,
+            "lecturas": acumulador.lecturas,
+            **serie
+        }
+
+    @staticmethod
+    def parse_instante(valor: Optional[str], fin: bool) -> Optional[datetime]:
+        """Fecha u hora ISO; una fecha sola como 'hasta' incluye el día completo"""
+        if not valor:
+            return None
+        if len(valor) == 10:
+            dia = _parse_fecha(valor, 'hasta' if fin else 'desde')
+            return datetime.combine(dia + timedelta(days=1) if fin else dia, datetime.min.time())
+        try:
+            return datetime.fromisoformat(valor)
+        except (TypeError, ValueError):
+            raise ValidationException(
+                f"Error en formato de fecha: '{'hasta' if fin else 'desde'}' debe ser fecha u hora ISO"
+            )
+
+    @staticmethod
+    def parse_hornos(hornos: Optional[str]) -> List[int]:
+        if not hornos:
+            return list(range(1, len(COLUMNAS_HORNO) + 1))
+        try:
+            numeros = sorted({int(h) for h in str(hornos).split(',') if h.strip()})
+        except ValueError:
+            raise ValidationException("'hornos' debe ser una lista de números separados por coma")
+        if not numeros or any(n < 1 or n > len(COLUMNAS_HORNO) for n in numeros):
+            raise ValidationException(f"Los hornos válidos son 1 a {len(COLUMNAS_HORNO)}")
+        return numeros
+
+
+class AnaliticaTemperaturasService:
+    """Detección de anomalías (z-score móvil) en las temperaturas de los hornos"""
+
+    MAX_DIAS = 31
+
+    # Una ventana se considera cerrada (cacheable) si terminó hace más de esto,
+    # para dar margen a lecturas que el PLC graba con atraso
+    _MARGEN_CIERRE = timedelta(minutes=5)
+
+    def __init__(self, repository: HistoricoTemperaturasRepository):
+        self.repository = repository
+
+    def detectar_anomalias(
+        self,
+        desde: Optional[str],
+        hasta: Optional[str],
+        hornos: Optional[str] = None,
+        ventana: Optional[int] = None,
+        umbral: Optional[float] = None,
+        min_lecturas: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Intervalos de lecturas anómalas por horno
+
+        Args:
+            desde, hasta: Fecha (AAAA-MM-DD, día completo) o fecha-hora ISO
+            hornos: Números de horno separados por coma; por defecto todos
+            ventana: Minutos de historia previa para la media/desviación (default 60)
+            umbral: |z| a partir del cual una lectura es anómala (default 3)
+            min_lecturas: Lecturas mínimas en la ventana (default 10; el z-score
+                necesita al menos 2)
+
+        Returns:
+            Dict: Solo los intervalos marcados, agrupados por horno
+        """
+        inicio = SerieTemperaturasService.parse_instante(desde, fin=False)
+        fin = SerieTemperaturasService.parse_instante(hasta, fin=True)
+        if inicio is None or fin is None:
+            raise ValidationException("Se requieren 'desde' y 'hasta'")
+        if fin <= inicio:
+            raise ValidationException("'hasta' debe ser posterior a 'desde'")
+        if fin - inicio > timedelta(days=self.MAX_DIAS):
+            raise ValidationException(f"El rango máximo es de {self.MAX_DIAS} días")
+
+        numeros = SerieTemperaturasService.parse_hornos(hornos)
+        ventana = _parse_numero(ventana, 'ventana', 60)
+        umbral = _parse_numero(umbral, 'umbral', 3.0, float)
+        min_lecturas = _parse_numero(min_lecturas, 'min_lecturas', 10)
+        if ventana < 1:
+            raise ValidationException("'ventana' debe ser de al menos 1 minuto")
+        if umbral <= 0:
+            raise ValidationException("'umbral' debe ser mayor que 0")
+        if min_lecturas < 1:
+            raise ValidationException("'min_lecturas' debe ser al menos 1")
+
+        cerrada = fin <= datetime.now() - self._MARGEN_CIERRE
+        clave = (inicio, fin, tuple(numeros), ventana, umbral, min_lecturas)
+        if cerrada:
+            resultado = _cache_anomalias.get(clave)
+            if resultado is not None:
+                return resultado
+
+        try:
+            import numpy as np
+            from . import analytics, downsampling
+        except ImportError:
+            raise AppException("El análisis de temperaturas requiere numpy instalado", 501)
+
+        # Se lee una ventana extra antes de 'desde' para que las primeras lecturas
+        # tengan historia; esas lecturas no se marcan
+        tiempos_lotes, valores_lotes = [], []
+        for lote in self.repository.iterar_lecturas(
+            desde=inicio - timedelta(minutes=ventana), hasta=fin, hornos=numeros
+        ):
+            tiempos_lote, valores_lote = downsampling.lote_a_arrays(lote)
+            tiempos_lotes.append(tiempos_lote)
+            valores_lotes.append(valores_lote)
+
+        if tiempos_lotes:
+            tiempos = np.concatenate(tiempos_lotes)
+            valores = np.concatenate(valores_lotes)
+        else:
+            tiempos = np.empty(0, dtype=np.int64)
+            valores = np.empty((0, len(numeros)))
+
+        desde_ms = downsampling.a_ms(inicio)
+        anomalias = {}
+        for i, numero in enumerate(numeros):
+            columna = valores[:, i]
+            _, _, z = analytics.estadisticas_moviles(
+                tiempos, columna, ventana * 60_000, min_lecturas
+            )
+            intervalos = analytics.intervalos_anomalos(tiempos, columna, z, umbral, desde_ms)
+            for intervalo in intervalos:
+                intervalo["inicio"] = downsampling.desde_ms(intervalo.pop("inicio_ms"))
+                intervalo["fin"] = downsampling.desde_ms(intervalo.pop("fin_ms"))
+            if intervalos:
+                anomalias[COLUMNAS_HORNO[numero - 1]] = intervalos
+
+        resultado = {
+            "success": True,
+            "desde": inicio.isoformat(),
+            "hasta": fin.isoformat(),
+            "ventana_minutos": ventana,
+            "umbral": umbral,
+            "lecturas": int(np.count_nonzero(tiempos >= desde_ms)),
+            "anomalias": anomalias
+        }
+
+        if cerrada:
+            _cache_anomalias.set(clave, resultado)
+        return resultado
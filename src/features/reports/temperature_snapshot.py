@@ -0,0 +1,293 @@
+"""
+Copia local (SQLite) de TBL_HISTORICO_TEMPERATURAS
+
+El PLC escribe continuamente en la tabla de producción; las lecturas históricas
+de temperaturas se pueden atender desde esta copia para no cargar esa base.
+La copia solo crece: un hilo en segundo plano trae las filas nuevas usando
+Fecha_Hora como marca de agua.
+
+- Cada fila local se identifica por la clave única de la tabla de origen (clave
+  primaria o índice clustered único, según el catálogo), no por Fecha_Hora: dos
+  lecturas con el mismo instante se copian las dos. Si el origen no tiene clave
+  única la copia no se arma y las consultas siguen yendo a SQL Server.
+- Cada sincronización vuelve a leer desde la última fecha copiada menos
+  TEMPERATURAS_SNAPSHOT_RELECTURA, para traer lecturas confirmadas tarde con una
+  Fecha_Hora anterior. INSERT OR IGNORE sobre la clave hace que releer sea
+  idempotente. Una lectura que se confirma más tarde que esa ventana no se copia.
+- Si la clave del origen cambia, la copia se descarta y se arma de nuevo.
+
+La tabla local está ordenada por (fecha_hora, clave) (WITHOUT ROWID), por lo que
+un rango se resuelve con una búsqueda binaria en el índice primario.
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List, Optional, Sequence
+from config.settings import settings
+from core.database.connection import db
+from core.exceptions.custom_exceptions import AppException
+from features.tables.repository import TablesRepository
+from .repository import HistoricoTemperaturasRepository, COLUMNAS_HORNO
+
+_EPOCH = datetime(1970, 1, 1)
+
+_TABLA_ORIGEN = 'TBL_HISTORICO_TEMPERATURAS'
+
+_ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        clave TEXT PRIMARY KEY,
+        valor TEXT
+    );
+"""
+
+
+def _esquema_lecturas(clave: Sequence[str]) -> str:
+    """Tabla local con una columna clave_N por cada columna de la clave de origen"""
+    columnas_clave = [f"clave_{i}" for i in range(len(clave))]
+    return f"""
+        CREATE TABLE lecturas (
+            fecha_hora INTEGER NOT NULL,
+            {", ".join(f"{c} REAL" for c in COLUMNAS_HORNO)},
+            {"".join(f"{c}, " for c in columnas_clave)}
+            PRIMARY KEY ({", ".join(["fecha_hora"] + columnas_clave)})
+        ) WITHOUT ROWID
+    """
+
+
+def clave_origen() -> List[str]:
+    """
+    Columnas de la clave única de TBL_HISTORICO_TEMPERATURAS, sin Fecha_Hora
+    (que ya encabeza la clave local). Lista vacía: Fecha_Hora es la clave.
+    """
+    clave = TablesRepository().get_pagination_key(_TABLA_ORIGEN)
+    if clave is None:
+        raise AppException(
+            f"{_TABLA_ORIGEN} no tiene clave primaria ni índice único; "
+            "la copia local de temperaturas queda desactivada"
+        )
+    return [columna["name"] for columna in clave if columna["name"] != 'Fecha_Hora']
+
+
+def _a_entero(valor: datetime) -> int:
+    """Fecha_Hora como microsegundos desde epoch (clave exacta y compacta)"""
+    delta = valor - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _a_fecha(valor: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=valor)
+
+
+def _valor_clave(valor: Any) -> Any:
+    """Valor de la clave de origen en un tipo que SQLite guarda y compara exacto"""
+    if isinstance(valor, datetime):
+        return _a_entero(valor)
+    if valor is None or isinstance(valor, (int, str, bytes)):
+        return valor
+    return str(valor)
+
+
+class SnapshotTemperaturas:
+    """Copia incremental de las lecturas de temperatura en un archivo SQLite"""
+
+    def __init__(
+        self,
+        ruta: str,
+        intervalo: float = 30.0,
+        relectura: float = 600.0,
+        batch_size: int = 5000
+    ):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.relectura = timedelta(seconds=relectura)
+        self.batch_size = batch_size
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+        self._lock_sync = threading.Lock()
+        self.ultima_sincronizacion: Optional[datetime] = None
+        self.ultimo_error: Optional[str] = None
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Conexión de escritura (solo sincronización): modo WAL y esquema"""
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        conn = sqlite3.connect(self.ruta, timeout=30)
+        # WAL: las lecturas no se bloquean mientras el hilo de sincronización escribe
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_ESQUEMA)
+        return conn
+
+    def _conectar_lectura(self) -> sqlite3.Connection:
+        """Conexión de solo lectura, sin DDL ni PRAGMA: no compite con la sincronización"""
+        return sqlite3.connect(f"{Path(self.ruta).resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+
+    # ==========================================
+    # SINCRONIZACIÓN
+    # ==========================================
+
+    def sincronizar(self, repository: HistoricoTemperaturasRepository, clave: Sequence[str]) -> int:
+        """
+        Copia las lecturas nuevas desde SQL Server
+
+        Args:
+            repository: Repositorio conectado a la base de producción
+            clave: Columnas de la clave única de origen sin Fecha_Hora (ver clave_origen)
+
+        Returns:
+            int: Filas nuevas insertadas
+        """
+        clave = list(clave)
+        with self._lock_sync:
+            conn = self._conectar()
+            try:
+                self._preparar_tabla(conn, clave)
+
+                maximo = conn.execute("SELECT MAX(fecha_hora) FROM lecturas").fetchone()[0]
+                desde = _a_fecha(maximo) - self.relectura if maximo is not None else None
+
+                columnas = ", ".join(
+                    ["fecha_hora"] + COLUMNAS_HORNO + [f"clave_{i}" for i in range(len(clave))]
+                )
+                marcadores = ", ".join("?" * (1 + len(COLUMNAS_HORNO) + len(clave)))
+                insertar = f"INSERT OR IGNORE INTO lecturas ({columnas}) VALUES ({marcadores})"
+
+                n_hornos = len(COLUMNAS_HORNO)
+                insertadas = 0
+                for lote in repository.iterar_lecturas(
+                    desde=desde, batch_size=self.batch_size, clave=clave
+                ):
+                    filas = [
+                        (_a_entero(fila[0]),)
+                        + tuple(float(v) if v is not None else None for v in fila[1:1 + n_hornos])
+                        + tuple(_valor_clave(v) for v in fila[1 + n_hornos:])
+                        for fila in lote if fila[0] is not None
+                    ]
+                    antes = conn.total_changes
+                    conn.executemany(insertar, filas)
+                    # Confirmar por lote: si se corta a mitad, la marca avanza hasta aquí
+                    conn.commit()
+                    insertadas += conn.total_changes - antes
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (clave, valor) VALUES ('completa', '1')"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        self.ultima_sincronizacion = datetime.now()
+        self.ultimo_error = None
+        return insertadas
+
+    @staticmethod
+    def _preparar_tabla(conn: sqlite3.Connection, clave: List[str]) -> None:
+        """Crea la tabla local para `clave`; si la copia usa otra clave, la descarta"""
+        fila = conn.execute("SELECT valor FROM meta WHERE clave = 'clave'").fetchone()
+        clave_texto = ",".join(clave)
+        if fila is not None and fila[0] == clave_texto:
+            return
+        conn.execute("DROP TABLE IF EXISTS lecturas")
+        conn.execute("DELETE FROM meta")
+        conn.execute(_esquema_lecturas(clave))
+        conn.execute("INSERT INTO meta (clave, valor) VALUES ('clave', ?)", (clave_texto,))
+        conn.commit()
+
+    def iniciar(self) -> None:
+        """Arranca el hilo de sincronización periódica (una sola vez)"""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ciclo, name="snapshot-temperaturas", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+
+    def _ciclo(self) -> None:
+        while not self._detener.is_set():
+            try:
+                clave = clave_origen()
+                with db.get_connection(scoped=False) as conn:
+                    insertadas = self.sincronizar(HistoricoTemperaturasRepository(conn), clave)
+                if insertadas:
+                    print(f"Snapshot de temperaturas: {insertadas} lecturas nuevas")
+            except Exception as e:
+                self.ultimo_error = str(e)
+                print(f"Error sincronizando snapshot de temperaturas: {e}")
+            self._detener.wait(self.intervalo)
+
+    # ==========================================
+    # LECTURA
+    # ==========================================
+
+    def disponible(self) -> bool:
+        """True si la copia inicial terminó y se puede leer en lugar de SQL Server"""
+        if not os.path.exists(self.ruta):
+            return False
+        try:
+            conn = self._conectar_lectura()
+            try:
+                # Sin 'clave' es una copia de un formato anterior: se arma de nuevo
+                filas = conn.execute(
+                    "SELECT COUNT(*) FROM meta WHERE clave IN ('completa', 'clave')"
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+        return filas[0] == 2
+
+    def iterar_lecturas(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        hornos: Optional[List[int]] = None,
+        batch_size: int = 5000
+    ) -> Iterator[List[Any]]:
+        """
+        Misma interfaz que HistoricoTemperaturasRepository.iterar_lecturas
+
+        Yields:
+            Lotes de filas (Fecha_Hora, Temp_Horno_0N...) por Fecha_Hora ascendente
+        """
+        columnas = [COLUMNAS_HORNO[n - 1] for n in (hornos or range(1, 8))]
+
+        condiciones = []
+        params: List[Any] = []
+        if desde is not None:
+            condiciones.append("fecha_hora >= ?")
+            params.append(_a_entero(desde))
+        if hasta is not None:
+            condiciones.append("fecha_hora < ?")
+            params.append(_a_entero(hasta))
+
+        where_sql = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+
+        conn = self._conectar_lectura()
+        try:
+            cursor = conn.execute(
+                f"SELECT fecha_hora, {', '.join(columnas)} FROM lecturas {where_sql} "
+                f"ORDER BY fecha_hora",
+                params
+            )
+            while True:
+                lote = cursor.fetchmany(batch_size)
+                if not lote:
+                    break
+                yield [(_a_fecha(fila[0]),) + fila[1:] for fila in lote]
+        finally:
+            conn.close()
+
+
+# Instancia global
+snapshot_temperaturas = SnapshotTemperaturas(
+    ruta=settings.TEMPERATURAS_SNAPSHOT_RUTA,
+    intervalo=settings.TEMPERATURAS_SNAPSHOT_INTERVALO,
+    relectura=settings.TEMPERATURAS_SNAPSHOT_RELECTURA
+)
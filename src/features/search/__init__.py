@@ -0,0 +1,3 @@
+from .router import search_bp
+
+__all__ = ['search_bp']
@@ -0,0 +1,91 @@
+#ACCESO A DATOS
+"""
+Repositorio: Números de OT para el autocompletado
+"""
+from typing import List, Optional, Tuple
+from datetime import date
+from sqlalchemy import text
+from core.database.connection import db
+from core.exceptions.custom_exceptions import DatabaseException
+from features.reports.date_ranges import fecha_reinterpretada, rangos_fecha_registro
+
+class SearchRepository:
+    """Lee los Numero_OT distintos de TBL_DATOS_PROCESO"""
+
+    def get_ots(self, since: Optional[date] = None) -> Tuple[List[str], Optional[date]]:
+        """
+        Obtener los números de OT distintos
+
+        Fecha_Registro se graba con día y mes intercambiados y no crece con el
+        tiempo; la marca de agua es la fecha corregida, que sí crece. El filtro
+        se traduce a rangos de Fecha_Registro (ver date_ranges).
+
+        Args:
+            since: Solo OT con fecha corregida >= since (None = todas)
+
+        Returns:
+            Tuple: (OT distintas, máxima fecha corregida leída)
+        """
+        try:
+            # Lo usa el hilo de refresco del índice: conexión propia
+            with db.get_connection(scoped=False) as conn:
+                params = {}
+                where_sql = "WHERE Numero_OT IS NOT NULL"
+                if since is not None:
+                    tramos = []
+                    for i, (inicio, fin) in enumerate(rangos_fecha_registro(since, None)):
+                        partes = []
+                        if inicio is not None:
+                            partes.append(f"Fecha_Registro >= :desde_{i}")
+                            params[f"desde_{i}"] = inicio
+                        if fin is not None:
+                            partes.append(f"Fecha_Registro < :hasta_{i}")
+                            params[f"hasta_{i}"] = fin
+                        tramos.append("(" + " AND ".join(partes) + ")")
+                    where_sql += " AND (" + " OR ".join(tramos) + ")" if tramos else " AND 1 = 0"
+
+                # Por OT y día crudo: la fecha corregida se calcula aquí (date_ranges)
+                query = text(f"""
+                    SELECT Numero_OT, CAST(Fecha_Registro AS DATE) AS dia
+                    FROM TBL_DATOS_PROCESO
+                    {where_sql}
+                    GROUP BY Numero_OT, CAST(Fecha_Registro AS DATE)
+                """)
+                rows = conn.execute(query, params).fetchall()
+
+            ots = list(dict.fromkeys(str(row[0]) for row in rows))
+            fechas = [
+                fecha_reinterpretada(row[1].year, row[1].month, row[1].day)
+                for row in rows if row[1] is not None
+            ]
+            return ots, (max(fechas) if fechas else since)
+
+        except Exception as e:
+            raise DatabaseException(f"Error al obtener números de OT: {str(e)}")
+
+    def search_ots(self, term: str, limit: int, contains: bool) -> List[str]:
+        """
+        Buscar OT directamente en SQL Server (mientras el índice no está listo)
+
+        Args:
+            term: Texto buscado
+            limit: Máximo de resultados
+            contains: True = en cualquier posición, False = prefijo
+        """
+        # Escapar comodines de LIKE para buscar el texto literal
+        escaped = term.replace('[', '[[]').replace('%', '[%]').replace('_', '[_]')
+        pattern = f"%{escaped}%" if contains else f"{escaped}%"
+
+        try:
+            with db.get_connection() as conn:
+                query = text("""
+                    SELECT DISTINCT TOP (:limit) Numero_OT
+                    FROM TBL_DATOS_PROCESO
+                    WHERE Numero_OT LIKE :pattern
+                    ORDER BY Numero_OT
+                """)
+                result = conn.execute(query, {"limit": limit, "pattern": pattern})
+                return [str(row[0]) for row in result]
+
+        except Exception as e:
+            raise DatabaseException(f"Error al buscar números de OT: {str(e)}")
@@ -0,0 +1,52 @@
+#RUTAS DE BÚSQUEDA
+"""
+Router: Autocompletado de números de OT
+"""
+from flask import Blueprint, request
+from features.search.service import search_service
+from shared.responses.response_builder import ResponseBuilder
+from core.exceptions.custom_exceptions import AppException
+
+# Crear blueprint
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+@search_bp.route('/ots', methods=['GET'])
+def search_ots():
+    """
+    Sugerencias de números de OT
+
+    GET /api/search/ots?q=OT-12&limit=10&modo=prefijo
+
+    Query params:
+        q: Texto escrito (requerido)
+        limit: Máximo de sugerencias (1-50, default 10)
+        modo: 'prefijo' (default) o 'contiene'
+
+    Response:
+        {
+            "status": "success",
+            "data": {
+                "query": "OT-12",
+                "mode": "prefijo",
+                "total": 3,
+                "results": ["OT-1201", "OT-1202", "OT-1210"],
+                "source": "indice"
+            }
+        }
+    """
+    try:
+        result = search_service.search_ots(
+            term=request.args.get('q'),
+            limit=request.args.get('limit', type=int),
+            mode=request.args.get('modo')
+        )
+        return ResponseBuilder.success(
+            data=result,
+            message="Sugerencias obtenidas exitosamente"
+        )
+
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
@@ -0,0 +1,206 @@
+#LOGICA DE NEGOCIO
+"""
+Servicio: Autocompletado de números de OT con un índice en memoria
+"""
+import bisect
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from config.settings import settings
+from features.search.repository import SearchRepository
+from core.exceptions.custom_exceptions import ValidationException
+
+class OTIndex:
+    """
+    Índice de números de OT para búsquedas por prefijo y por subcadena
+
+    - Prefijo: lista ordenada de claves + bisect => O(log n + k)
+    - Subcadena: lista ordenada de todos los sufijos de cada clave; una subcadena
+      es prefijo de algún sufijo, así que se resuelve con el mismo bisect
+
+    Las claves van en mayúsculas y sin espacios laterales, igual que compara
+    SQL Server con la intercalación por defecto.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._values: Dict[str, str] = {}
+        self._suffixes: List[str] = []
+        self._suffix_owner: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.strip().upper()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def rebuild(self, ots: Iterable[str]) -> None:
+        """Reemplazar el índice completo (se construye aparte y se intercambia)"""
+        values = {}
+        for ot in ots:
+            key = self.normalize(ot)
+            if key:
+                values.setdefault(key, ot.strip())
+
+        pairs = sorted((key[i:], key) for key in values for i in range(len(key)))
+
+        with self._lock:
+            self._values = values
+            self._keys = sorted(values)
+            self._suffixes = [suffix for suffix, _ in pairs]
+            self._suffix_owner = [key for _, key in pairs]
+
+    def add(self, ots: Iterable[str]) -> int:
+        """
+        Agregar OT nuevas manteniendo el orden
+
+        Returns:
+            int: Cantidad de OT que no estaban en el índice
+        """
+        added = 0
+        with self._lock:
+            for ot in ots:
+                key = self.normalize(ot)
+                if not key or key in self._values:
+                    continue
+                self._values[key] = ot.strip()
+                bisect.insort(self._keys, key)
+                for i in range(len(key)):
+                    position = bisect.bisect_left(self._suffixes, key[i:])
+                    self._suffixes.insert(position, key[i:])
+                    self._suffix_owner.insert(position, key)
+                added += 1
+        return added
+
+    def search(self, term: str, limit: int, contains: bool = False) -> List[str]:
+        """
+        Buscar OT que empiezan con (o contienen) el texto
+
+        Returns:
+            List[str]: Hasta `limit` OT en orden alfabético
+        """
+        term = self.normalize(term)
+        if not term:
+            return []
+
+        with self._lock:
+            if not contains:
+                start = bisect.bisect_left(self._keys, term)
+                keys = []
+                for key in self._keys[start:start + limit]:
+                    if not key.startswith(term):
+                        break
+                    keys.append(key)
+                return [self._values[key] for key in keys]
+
+            found = set()
+            start = bisect.bisect_left(self._suffixes, term)
+            for position in range(start, len(self._suffixes)):
+                if not self._suffixes[position].startswith(term):
+                    break
+                found.add(self._suffix_owner[position])
+
+            return [self._values[key] for key in sorted(found)[:limit]]
+
+
+class SearchService:
+    """Mantiene el índice de OT actualizado y atiende el autocompletado"""
+
+    MODES = ('prefijo', 'contiene')
+    MAX_LIMIT = 50
+
+    def __init__(self, refresh_interval: float = 30.0, rebuild_interval: float = 3600.0):
+        self.repository = SearchRepository()
+        self.index = OTIndex()
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._watermark: Optional[date] = None
+        self._last_rebuild = 0.0
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Construir el índice en segundo plano y mantenerlo actualizado"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="search-ots", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error actualizando el índice de OT: {e}")
+            time.sleep(self.refresh_interval)
+
+    def refresh(self) -> None:
+        """
+        Reconstruir el índice o agregar las OT nuevas desde la marca de agua
+
+        La marca de agua es la fecha corregida (no Fecha_Registro, que se graba
+        con día y mes intercambiados). Se vuelve a leer el día de la marca, y
+        add() ignora las OT que ya están. La reconstrucción periódica quita las
+        OT que ya no existen.
+        """
+        if not self._ready.is_set() or time.monotonic() - self._last_rebuild >= self.rebuild_interval:
+            ots, watermark = self.repository.get_ots()
+            self.index.rebuild(ots)
+            self._last_rebuild = time.monotonic()
+            self._watermark = watermark
+            self._ready.set()
+            print(f"Índice de OT construido: {len(self.index)} OT")
+            return
+
+        ots, watermark = self.repository.get_ots(since=self._watermark)
+        self.index.add(ots)
+        self._watermark = watermark
+
+    def search_ots(self, term: Optional[str], limit: Optional[int] = None, mode: Optional[str] = None) -> Dict:
+        """
+        Sugerencias de números de OT
+
+        Args:
+            term: Texto escrito por el usuario
+            limit: Máximo de sugerencias (1-50, default 10)
+            mode: 'prefijo' (default) o 'contiene'
+
+        Returns:
+            Dict: Sugerencias y si se respondieron desde el índice
+        """
+        term = (term or '').strip()
+        if not term:
+            raise ValidationException("El parámetro 'q' es requerido")
+
+        mode = (mode or 'prefijo').lower()
+        if mode not in self.MODES:
+            raise ValidationException(f"Modo no soportado: {mode}. Use prefijo o contiene")
+
+        limit = max(1, min(self.MAX_LIMIT, int(limit or 10)))
+        contains = mode == 'contiene'
+
+        # Mientras se construye el índice se responde desde SQL Server
+        if self._ready.is_set():
+            results = self.index.search(term, limit, contains)
+            source = "indice"
+        else:
+            results = self.repository.search_ots(term, limit, contains)
+            source = "sql"
+
+        return {
+            "query": term,
+            "mode": mode,
+            "total": len(results),
+            "results": results,
+            "source": source
+        }
+
+
+# Instancia global
+search_service = SearchService(
+    refresh_interval=settings.SEARCH_REFRESH_INTERVALO,
+    rebuild_interval=settings.SEARCH_RECONSTRUCCION_INTERVALO
+)
@@ -0,0 +1,3 @@
+from .router import stream_bp
+
+__all__ = ['stream_bp']
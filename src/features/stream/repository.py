@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from typing import Optional, List, Any
+from datetime import datetime
+from features.reports.repository import COLUMNAS_HORNO
+
+_COLUMNAS_LECTURA = ", ".join(["TH.Fecha_Hora"] + [f"TH.{c}" for c in COLUMNAS_HORNO])
+
+
+class StreamRepository:
+    """Lecturas recientes de TBL_HISTORICO_TEMPERATURAS para el stream en vivo"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def ultima_lectura(self) -> List[Any]:
+        """Lectura más reciente (lista vacía si la tabla no tiene datos)"""
+        query = text(f"""
+            SELECT TOP 1 {_COLUMNAS_LECTURA}
+            FROM TBL_HISTORICO_TEMPERATURAS TH
+            ORDER BY TH.Fecha_Hora DESC
+        """)
+
+        return list(self.connection.execute(query))
+
+    def lecturas_posteriores(self, despues_de: datetime, limite: int = 500) -> List[Any]:
+        """
+        Lecturas con Fecha_Hora posterior a `despues_de`, ascendentes
+
+        La fecha se envía como texto ISO para que SQL Server la convierta al
+        tipo de la columna y la comparación sea exacta (con un parámetro
+        datetime2 una lectura datetime terminada en .003 volvería a salir).
+        """
+        timespec = 'milliseconds' if despues_de.microsecond % 1000 == 0 else 'microseconds'
+
+        query = text(f"""
+            SELECT TOP (:limite) {_COLUMNAS_LECTURA}
+            FROM TBL_HISTORICO_TEMPERATURAS TH
+            WHERE TH.Fecha_Hora > :despues_de
+            ORDER BY TH.Fecha_Hora
+        """)
+
+        return list(self.connection.execute(query, {
+            "despues_de": despues_de.isoformat(timespec=timespec),
+            "limite": limite
+        }))
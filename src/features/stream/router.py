@@ -0,0 +1,51 @@
+#RUTAS DE STREAMING
+"""
+Router: Eventos en vivo (Server-Sent Events)
+"""
+import queue
+from flask import Blueprint, Response, stream_with_context
+from config.settings import settings
+from .service import poller_temperaturas
+
+# Crear blueprint
+stream_bp = Blueprint('stream', __name__, url_prefix='/api/stream')
+
+
+@stream_bp.route('/temperaturas', methods=['GET'])
+def stream_temperaturas():
+    """
+    Lecturas nuevas de temperatura en vivo
+
+    GET /api/stream/temperaturas
+
+    Response (text/event-stream):
+        id: 2026-01-01T10:00:05
+        event: lecturas
+        data: [{"Fecha_Hora": "...", "Temp_Horno_01": 812.5, ...}]
+
+    Al conectarse se recibe la última lectura conocida; luego un evento por
+    cada sondeo con lecturas nuevas y un comentario ': ping' cada
+    STREAM_HEARTBEAT segundos para mantener viva la conexión.
+    """
+    cola = poller_temperaturas.suscribir()
+
+    def eventos():
+        try:
+            yield f"retry: {int(settings.STREAM_INTERVALO * 1000)}\n\n"
+            while True:
+                try:
+                    yield cola.get(timeout=settings.STREAM_HEARTBEAT)
+                except queue.Empty:
+                    yield ": ping\n\n"
+        finally:
+            # El cliente cerró la conexión (GeneratorExit) o terminó el worker
+            poller_temperaturas.desuscribir(cola)
+
+    return Response(
+        stream_with_context(eventos()),
+        mimetype='text/event-stream',
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,121 @@
+"""
+Difusión de lecturas de temperatura en vivo (Server-Sent Events)
+
+Un único hilo consulta las lecturas nuevas una vez por intervalo y entrega el
+mismo evento ya serializado a la cola de cada suscriptor: la carga sobre la base
+es constante sin importar cuántas pantallas estén conectadas.
+"""
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, List, Optional, Set
+from config.settings import settings
+from core.database.connection import db
+from features.reports.repository import COLUMNAS_HORNO
+from shared.utils.data_converter import DataConverter
+from .repository import StreamRepository
+
+
+class PollerTemperaturas:
+    """Sondeo compartido de TBL_HISTORICO_TEMPERATURAS y reparto a suscriptores"""
+
+    def __init__(self, intervalo: float = 2.0, max_pendientes: int = 100):
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self._suscriptores: Set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._ultima_fecha: Optional[datetime] = None
+        # Último evento enviado: un suscriptor nuevo lo recibe de inmediato
+        self._ultimo_evento: Optional[str] = None
+
+    def suscribir(self) -> queue.Queue:
+        """Registra un suscriptor y arranca el sondeo si estaba detenido"""
+        cola: queue.Queue = queue.Queue(maxsize=self.max_pendientes)
+
+        with self._lock:
+            if self._ultimo_evento is not None:
+                cola.put_nowait(self._ultimo_evento)
+            self._suscriptores.add(cola)
+
+            if self._hilo is None:
+                self._hilo = threading.Thread(
+                    target=self._ciclo, name="stream-temperaturas", daemon=True
+                )
+                self._hilo.start()
+
+        return cola
+
+    def desuscribir(self, cola: queue.Queue) -> None:
+        with self._lock:
+            self._suscriptores.discard(cola)
+
+    def suscriptores(self) -> int:
+        with self._lock:
+            return len(self._suscriptores)
+
+    def _ciclo(self) -> None:
+        while True:
+            # El hilo termina cuando no queda nadie conectado; se decide bajo el
+            # lock para que suscribir() vea _hilo = None y arranque otro
+            with self._lock:
+                if not self._suscriptores:
+                    self._hilo = None
+                    # Al volver a arrancar se parte de la última lectura, sin rezago
+                    self._ultima_fecha = None
+                    return
+
+            try:
+                self._sondear()
+            except Exception as e:
+                print(f"Error en el stream de temperaturas: {e}")
+            time.sleep(self.intervalo)
+
+    def _sondear(self) -> None:
+        with db.get_connection(scoped=False) as conn:
+            repository = StreamRepository(conn)
+            if self._ultima_fecha is None:
+                filas = repository.ultima_lectura()
+            else:
+                filas = repository.lecturas_posteriores(self._ultima_fecha)
+
+        if not filas:
+            return
+
+        self._ultima_fecha = filas[-1][0]
+        evento = self._formatear_evento(filas)
+
+        with self._lock:
+            self._ultimo_evento = evento
+            for cola in self._suscriptores:
+                try:
+                    cola.put_nowait(evento)
+                except queue.Full:
+                    # Cliente lento: se descarta su evento más antiguo
+                    try:
+                        cola.get_nowait()
+                    except queue.Empty:
+                        pass
+                    cola.put_nowait(evento)
+
+    @staticmethod
+    def _formatear_evento(filas: List[Any]) -> str:
+        """Evento SSE 'lecturas' con id = Fecha_Hora de la última lectura"""
+        lecturas = [
+            {
+                "Fecha_Hora": DataConverter.convert_value(fila[0]),
+                **{
+                    columna: DataConverter.convert_value(valor)
+                    for columna, valor in zip(COLUMNAS_HORNO, fila[1:])
+                }
+            }
+            for fila in filas
+        ]
+        datos = json.dumps(lecturas, separators=(',', ':'))
+        return f"id: {lecturas[-1]['Fecha_Hora']}\nevent: lecturas\ndata: {datos}\n\n"
+
+
+# Instancia global
+poller_temperaturas = PollerTemperaturas(intervalo=settings.STREAM_INTERVALO)
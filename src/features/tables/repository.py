@@ -2,10 +2,14 @@
 """
 Repositorio: Capa de acceso a datos para tablas
 """
-from typing import List, Dict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy import text
 from core.database.connection import db
 from core.exceptions.custom_exceptions import DatabaseException
+from shared.utils.serializer import JSONSerializer
+from shared.utils.validators import SQLValidator
+from features.tables.schema_cache import schema_cache
 
 class TablesRepository:
     """Maneja las operaciones de base de datos para tablas"""
@@ -17,19 +21,19 @@ class TablesRepository:
         Returns:
             List[str]: Nombres de las tablas
         """
-        try:
-            with db.get_connection() as conn:
-                query = text("""
-                    SELECT TABLE_NAME 
-                    FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_TYPE = 'BASE TABLE'
-                    ORDER BY TABLE_NAME
-                """)
-                result = conn.execute(query)
-                return [row[0] for row in result]
+        return list(schema_cache.get().tables)
+    
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Verificar si una tabla existe (búsqueda en memoria)
         
-        except Exception as e:
-            raise DatabaseException(f"Error al obtener tablas: {str(e)}")
+        Args:
+            table_name: Nombre de la tabla
+            
+        Returns:
+            bool: True si existe
+        """
+        return table_name in schema_cache.get().table_set
     
     def get_table_structure(self, table_name: str) -> List[Dict]:
         """
@@ -41,86 +45,271 @@ class TablesRepository:
         Returns:
             List[Dict]: Información de cada columna
         """
+        return [dict(column) for column in schema_cache.get().columns.get(table_name, [])]
+    
+    def get_table_keys(self, table_name: str) -> Dict:
+        """
+        Obtener clave primaria e índice clustered de una tabla
+        
+        Args:
+            table_name: Nombre de la tabla
+            
+        Returns:
+            Dict: {"primary_key": {...} | None, "clustered": {...} | None}
+        """
+        return schema_cache.get().keys.get(table_name, {"primary_key": None, "clustered": None})
+    
+    def count_records(self, table_name: str, exact: bool = False) -> tuple:
+        """
+        Contar registros de una tabla
+        
+        Por defecto se lee de las estadísticas de particiones (sys.dm_db_partition_stats),
+        que no recorre la tabla. El valor puede diferir levemente del real mientras
+        hay transacciones en curso. Si no hay estadísticas disponibles (p. ej. sin
+        permiso VIEW DATABASE STATE) se hace COUNT(*).
+        
+        Args:
+            table_name: Nombre de la tabla
+            exact: True para forzar COUNT(*)
+            
+        Returns:
+            tuple: (total de registros, True si es un conteo exacto)
+        """
+        try:
+            with db.get_connection() as conn:
+                if not exact:
+                    try:
+                        # index_id 0 = heap, 1 = índice clustered: una fila por registro
+                        estimate = conn.execute(text("""
+                            SELECT SUM(row_count)
+                            FROM sys.dm_db_partition_stats
+                            WHERE object_id = OBJECT_ID(QUOTENAME(:table_name))
+                              AND index_id IN (0, 1)
+                        """), {"table_name": table_name}).scalar()
+                    except Exception:
+                        estimate = None
+                    
+                    if estimate is not None:
+                        return int(estimate), False
+                
+                query = text(f"SELECT COUNT(*) FROM [{table_name}]")
+                return conn.execute(query).scalar(), True
+        
+        except Exception as e:
+            raise DatabaseException(f"Error al contar registros: {str(e)}")
+    
+    def get_tables_overview(self) -> List[Dict]:
+        """
+        Registros y tamaño de todas las tablas en una sola consulta al catálogo
+        
+        Returns:
+            List[Dict]: Una entrada por tabla, de mayor a menor espacio reservado
+        """
         try:
             with db.get_connection() as conn:
                 query = text("""
-                    SELECT 
-                        COLUMN_NAME,
-                        DATA_TYPE,
-                        CHARACTER_MAXIMUM_LENGTH,
-                        IS_NULLABLE,
-                        COLUMN_DEFAULT
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_NAME = :table_name
-                    ORDER BY ORDINAL_POSITION
+                    SELECT
+                        s.name AS schema_name,
+                        t.name AS table_name,
+                        SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.row_count ELSE 0 END) AS row_count,
+                        SUM(ps.reserved_page_count) * 8 AS reserved_kb,
+                        SUM(ps.used_page_count) * 8 AS used_kb,
+                        SUM(CASE WHEN ps.index_id IN (0, 1)
+                                 THEN ps.in_row_data_page_count
+                                    + ps.lob_used_page_count
+                                    + ps.row_overflow_used_page_count
+                                 ELSE 0 END) * 8 AS data_kb
+                    FROM sys.tables t
+                    INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+                    LEFT JOIN sys.dm_db_partition_stats ps ON ps.object_id = t.object_id
+                    WHERE t.is_ms_shipped = 0
+                    GROUP BY s.name, t.name
+                    ORDER BY reserved_kb DESC, t.name
                 """)
-                result = conn.execute(query, {"table_name": table_name})
                 
-                columns = []
-                for row in result:
-                    columns.append({
-                        "name": row[0],
-                        "type": row[1],
-                        "max_length": row[2],
-                        "nullable": row[3] == "YES",
-                        "default": row[4]
+                overview = []
+                for row in conn.execute(query):
+                    used_kb = int(row.used_kb or 0)
+                    data_kb = int(row.data_kb or 0)
+                    overview.append({
+                        "schema": row.schema_name,
+                        "table_name": row.table_name,
+                        "row_count": int(row.row_count or 0),
+                        "reserved_kb": int(row.reserved_kb or 0),
+                        "used_kb": used_kb,
+                        "data_kb": data_kb,
+                        "index_kb": max(used_kb - data_kb, 0)
                     })
-                
-                return columns
+                return overview
         
         except Exception as e:
-            raise DatabaseException(f"Error al obtener estructura: {str(e)}")
+            raise DatabaseException(f"Error al obtener resumen de tablas: {str(e)}")
     
-    def count_records(self, table_name: str) -> int:
+    def get_pagination_key(self, table_name: str) -> Optional[List[Dict]]:
         """
-        Contar registros de una tabla
+        Columnas que identifican cada fila de forma única y ordenada
+        
+        Se usa la clave primaria o, si no hay, el índice clustered cuando es
+        único. Las columnas deben ser NOT NULL para que la comparación por
+        clave no pierda filas.
         
         Args:
             table_name: Nombre de la tabla
             
         Returns:
-            int: Total de registros
+            List[Dict] | None: [{"name", "descending"}, ...] o None si no hay clave usable
         """
-        try:
-            with db.get_connection() as conn:
-                query = text(f"SELECT COUNT(*) FROM [{table_name}]")
-                return conn.execute(query).scalar()
+        keys = self.get_table_keys(table_name)
+        nullable = {
+            column["name"] for column in self.get_table_structure(table_name)
+            if column["nullable"]
+        }
         
-        except Exception as e:
-            raise DatabaseException(f"Error al contar registros: {str(e)}")
+        candidates = [keys["primary_key"]]
+        if keys["clustered"] and keys["clustered"]["unique"]:
+            candidates.append(keys["clustered"])
+        
+        for candidate in candidates:
+            if candidate and not any(column["name"] in nullable for column in candidate["columns"]):
+                return candidate["columns"]
+        return None
     
     def get_table_data(
         self, 
         table_name: str, 
         limit: int = 100, 
-        offset: int = 0
+        offset: int = 0,
+        key: Optional[List[Dict]] = None,
+        after: Optional[List[Any]] = None
     ) -> tuple:
         """
         Obtener datos de una tabla con paginación
         
+        Con `key` las filas se ordenan por la clave. Si además se pasa `after`
+        (valores de clave de la última fila entregada) se busca directamente la
+        posición en el índice con WHERE clave > :valor, así que cualquier página
+        cuesta lo mismo que la primera. Sin `after` se usa OFFSET.
+        
         Args:
             table_name: Nombre de la tabla
             limit: Número de registros a retornar
-            offset: Desde qué registro empezar
+            offset: Desde qué registro empezar (solo sin `after`)
+            key: Columnas de la clave (get_pagination_key)
+            after: Valores de clave de la última fila de la página anterior
             
         Returns:
-            tuple: (columnas, datos)
+            tuple: (columnas, datos, conversores por columna para JSON, hay_mas)
         """
+        if key:
+            order_sql = ", ".join(
+                f"{SQLValidator.quote_identifier(column['name'])} {'DESC' if column['descending'] else 'ASC'}"
+                for column in key
+            )
+        else:
+            order_sql = "(SELECT NULL)"
+        
+        # Se pide una fila de más para saber si existe página siguiente
+        params: Dict[str, Any] = {"limit": limit + 1}
+        
+        if key and after is not None:
+            seek_sql, seek_params = self._seek_condition(key, after)
+            params.update(seek_params)
+            query = text(f"""
+                SELECT TOP (:limit) * FROM [{table_name}]
+                WHERE {seek_sql}
+                ORDER BY {order_sql}
+            """)
+        else:
+            params["offset"] = offset
+            query = text(f"""
+                SELECT * FROM [{table_name}]
+                ORDER BY {order_sql}
+                OFFSET :offset ROWS
+                FETCH NEXT :limit ROWS ONLY
+            """)
+        
         try:
             with db.get_connection() as conn:
-                query = text(f"""
-                    SELECT * FROM [{table_name}]
-                    ORDER BY (SELECT NULL)
-                    OFFSET :offset ROWS
-                    FETCH NEXT :limit ROWS ONLY
-                """)
-                result = conn.execute(query, {"offset": offset, "limit": limit})
+                result = conn.execute(query, params)
                 
                 columns = list(result.keys())
+                converters = JSONSerializer.converters_for(result.cursor.description)
                 rows = result.fetchall()
                 
-                return columns, rows
+                return columns, rows[:limit], converters, len(rows) > limit
         
         except Exception as e:
             raise DatabaseException(f"Error al obtener datos: {str(e)}")
+    
+    def stream_table(
+        self,
+        table_name: str,
+        key: Optional[List[Dict]] = None,
+        batch_size: int = 2000
+    ) -> Iterator[Any]:
+        """
+        Leer una tabla completa con un cursor del servidor, por lotes
+        
+        El primer elemento producido es (columnas, cursor.description) (la
+        consulta ya se ejecutó al pedirlo); luego, lotes de a lo sumo
+        batch_size filas. Usa una conexión propia porque el generador se sigue
+        leyendo después de que la vista retornó.
+        
+        Args:
+            table_name: Nombre de la tabla (ya validado)
+            key: Columnas por las que ordenar (None = orden físico)
+            batch_size: Filas por lote
+        """
+        order_sql = ""
+        if key:
+            order_sql = "ORDER BY " + ", ".join(
+                f"{SQLValidator.quote_identifier(column['name'])} {'DESC' if column['descending'] else 'ASC'}"
+                for column in key
+            )
+        
+        query = text(f"SELECT * FROM [{table_name}] {order_sql}")
+        
+        with db.get_connection(scoped=False) as conn:
+            try:
+                result = conn.execute(
+                    query.execution_options(stream_results=True, yield_per=batch_size)
+                )
+            except Exception as e:
+                raise DatabaseException(f"Error al exportar la tabla: {str(e)}")
+            
+            yield list(result.keys()), result.cursor.description
+            for batch in result.partitions():
+                yield batch
+    
+    @staticmethod
+    def _seek_condition(key: List[Dict], after: List[Any]) -> tuple:
+        """
+        Condición "fila posterior a `after`" según el orden de la clave
+        
+        (a, b) > (:k0, :k1) se expande a (a > :k0) OR (a = :k0 AND b > :k1);
+        las columnas descendentes usan "<".
         
+        Returns:
+            tuple: (sql, parámetros)
+        """
+        params = {f"k{i}": _bind_value(value) for i, value in enumerate(after)}
+        
+        branches = []
+        for i, column in enumerate(key):
+            terms = [f"{SQLValidator.quote_identifier(previous['name'])} = :k{j}" for j, previous in enumerate(key[:i])]
+            operator = '<' if column['descending'] else '>'
+            terms.append(f"{SQLValidator.quote_identifier(column['name'])} {operator} :k{i}")
+            branches.append("(" + " AND ".join(terms) + ")")
+        
+        return "(" + " OR ".join(branches) + ")", params
+
+
+def _bind_value(value: Any) -> Any:
+    """
+    Las fechas se envían como texto ISO 8601 para que SQL Server las convierta
+    al tipo de la columna (datetime o datetime2) y la igualdad sea exacta
+    """
+    if isinstance(value, datetime):
+        timespec = 'milliseconds' if value.microsecond % 1000 == 0 else 'microseconds'
+        return value.isoformat(timespec=timespec)
+    return value
@@ -2,9 +2,11 @@
 """
 Router: Rutas HTTP para tablas
 """
-from flask import Blueprint, request
+from datetime import datetime
+from flask import Blueprint, Response, request, stream_with_context
 from features.tables.service import TablesService
 from shared.responses.response_builder import ResponseBuilder
+from shared.utils.stream_exporter import StreamExporter
 from core.exceptions.custom_exceptions import AppException
 
 # Crear blueprint
@@ -42,12 +44,52 @@ def list_tables():
     except Exception as e:
         return ResponseBuilder.error(f"Error inesperado: {str(e)}")
 
+@tables_bp.route('/overview', methods=['GET'])
+def get_overview():
+    """
+    Resumen de la base: registros y tamaño de todas las tablas
+    
+    GET /api/tables/overview
+    
+    Response:
+        {
+            "status": "success",
+            "data": {
+                "total_tables": 10,
+                "total_rows": 1500000,
+                "total_reserved_kb": 204800,
+                "tables": [
+                    {"schema": "dbo", "table_name": "...", "row_count": 1200000,
+                     "reserved_kb": 180000, "used_kb": 175000,
+                     "data_kb": 160000, "index_kb": 15000},
+                    ...
+                ]
+            }
+        }
+    """
+    try:
+        result = service.get_overview()
+        return ResponseBuilder.success(
+            data=result,
+            message="Resumen de tablas obtenido"
+        )
+    
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+
 @tables_bp.route('/<table_name>', methods=['GET'])
 def get_table_info(table_name: str):
     """
     Obtener información de una tabla
     
-    GET /api/tables/{table_name}
+    GET /api/tables/{table_name}?exact=true
+    
+    Query params:
+        - exact: true para contar con COUNT(*); por defecto el total sale de
+          las estadísticas de particiones (count_exact = false)
     
     Response:
         {
@@ -55,13 +97,15 @@ def get_table_info(table_name: str):
             "data": {
                 "table_name": "Usuarios",
                 "total_records": 150,
+                "count_exact": false,
                 "total_columns": 5,
                 "columns": [...]
             }
         }
     """
     try:
-        result = service.get_table_info(table_name)
+        exact = _read_exact()
+        result = service.get_table_info(table_name, exact)
         return ResponseBuilder.success(
             data=result,
             message=f"Información de '{table_name}' obtenida"
@@ -78,11 +122,18 @@ def get_table_data(table_name: str):
     """
     Obtener datos de una tabla
     
-    GET /api/tables/{table_name}/data?limit=50&offset=0
+    GET /api/tables/{table_name}/data?limit=50&offset=0&shape=columnar&exact=true
+    GET /api/tables/{table_name}/data?limit=50&cursor=
     
     Query params:
-        - limit: Registros por página (default: 100)
+        - limit: Registros por página (default: 100, máximo 1000)
         - offset: Desde qué registro (default: 0)
+        - cursor: Paginado por clave: vacío en la primera página y luego el
+          "next_cursor" de la respuesta anterior (ignora offset). Requiere
+          clave primaria o índice clustered único.
+        - shape: rows (default, lista de objetos) o columnar
+          (data = {"columns": [...], "rows": [[...], ...]})
+        - exact: true para contar con COUNT(*) (default: estadísticas)
     
     Response:
         {
@@ -90,17 +141,25 @@ def get_table_data(table_name: str):
             "data": {
                 "table_name": "Usuarios",
                 "total_records": 1500,
+                "count_exact": false,
                 "showing": 50,
+                "pagination": "keyset",
+                "order_by": ["Id"],
+                "next_cursor": "WzUwXQ",
+                "has_more": true,
                 "data": [...]
             }
         }
     """
     try:
         # Obtener parámetros
-        limit = request.args.get('limit', 100, type=int)
-        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit')
+        offset = request.args.get('offset')
+        shape = ResponseBuilder.validate_shape(request.args.get('shape'))
+        exact = _read_exact()
+        cursor = request.args.get('cursor', None)
         
-        result = service.get_table_data(table_name, limit, offset)
+        result = service.get_table_data(table_name, limit, offset, shape, exact, cursor)
         
         return ResponseBuilder.success(
             data=result,
@@ -111,4 +170,56 @@ def get_table_data(table_name: str):
         return ResponseBuilder.error(e.message, e.status_code)
     
     except Exception as e:
-        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
\ No newline at end of file
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+
+@tables_bp.route('/<table_name>/export', methods=['GET'])
+def export_table(table_name: str):
+    """
+    Exportar una tabla completa en streaming
+    
+    GET /api/tables/{table_name}/export?format=csv&gzip=true
+    
+    Query params:
+        - format: csv (default) o ndjson
+        - gzip: true para comprimir la descarga
+    
+    Las filas se leen del servidor por lotes y se envían a medida que llegan;
+    la memoria usada no depende del tamaño de la tabla.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    compress = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+    
+    if export_format not in StreamExporter.FORMATS:
+        return ResponseBuilder.error(f"Formato no soportado: {export_format}. Use csv o ndjson", 400)
+    
+    try:
+        columns, converters, batches = service.export_table(table_name, export_format)
+    
+    except AppException as e:
+        return ResponseBuilder.error(e.message, e.status_code)
+    
+    except Exception as e:
+        return ResponseBuilder.error(f"Error inesperado: {str(e)}")
+    
+    mimetype, extension = StreamExporter.FORMATS[export_format]
+    if export_format == 'csv':
+        chunks = StreamExporter.csv_chunks(columns, batches, converters)
+    else:
+        chunks = StreamExporter.ndjson_chunks(columns, batches, converters)
+    
+    filename = f"{table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    if compress:
+        chunks = StreamExporter.gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        direct_passthrough=True
+    )
+
+def _read_exact() -> bool:
+    """?exact=true => conteo con COUNT(*)"""
+    return request.args.get('exact', 'false').lower() in ('1', 'true', 'yes')
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Caché de metadatos del esquema (tablas, columnas y claves)
+
+Todo el catálogo se carga de una vez y se reutiliza hasta que cambia. Para
+detectarlo se sondea, como máximo cada `probe_interval` segundos, la cantidad
+y la última modify_date de tablas y restricciones de clave en sys.objects:
+crear/borrar una tabla o una clave cambia la cantidad, y un ALTER TABLE
+actualiza la modify_date de la tabla.
+"""
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy import text
+from config.settings import settings
+from core.database.connection import db
+from core.exceptions.custom_exceptions import DatabaseException
+
+class SchemaSnapshot:
+    """Metadatos leídos en un mismo momento (no se modifican después)"""
+
+    def __init__(
+        self,
+        version: Tuple,
+        tables: List[str],
+        columns: Dict[str, List[Dict]],
+        keys: Dict[str, Dict[str, Any]]
+    ):
+        self.version = version
+        self.tables = tables
+        self.table_set: FrozenSet[str] = frozenset(tables)
+        self.columns = columns
+        self.keys = keys
+
+
+class SchemaCache:
+    """Metadatos del esquema en memoria, recargados solo si el catálogo cambió"""
+
+    def __init__(self, probe_interval: float = 5.0):
+        self.probe_interval = probe_interval
+        self._snapshot: Optional[SchemaSnapshot] = None
+        self._probed_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self) -> SchemaSnapshot:
+        """
+        Metadatos vigentes
+
+        Returns:
+            SchemaSnapshot: Tablas, columnas y claves
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._probed_at < self.probe_interval:
+            return snapshot
+
+        with self._lock:
+            # Otro hilo pudo haber sondeado mientras se esperaba el lock
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._probed_at < self.probe_interval:
+                return snapshot
+
+            try:
+                with db.get_connection() as conn:
+                    version = self._probe(conn)
+                    if snapshot is None or snapshot.version != version:
+                        snapshot = self._load(conn, version)
+                        self._snapshot = snapshot
+                        self.loads += 1
+            except Exception as e:
+                raise DatabaseException(f"Error al leer metadatos del esquema: {str(e)}")
+
+            self._probed_at = time.monotonic()
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Forzar un sondeo en el próximo acceso"""
+        self._probed_at = 0.0
+
+    @staticmethod
+    def _probe(conn) -> Tuple:
+        query = text("""
+            SELECT COUNT(*), MAX(modify_date)
+            FROM sys.objects
+            WHERE type IN ('U', 'PK', 'UQ')
+        """)
+        return tuple(conn.execute(query).one())
+
+    @staticmethod
+    def _load(conn, version: Tuple) -> SchemaSnapshot:
+        tables = [row[0] for row in conn.execute(text("""
+            SELECT TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+            ORDER BY TABLE_NAME
+        """))]
+
+        columns: Dict[str, List[Dict]] = {}
+        for row in conn.execute(text("""
+            SELECT
+                TABLE_NAME,
+                COLUMN_NAME,
+                DATA_TYPE,
+                CHARACTER_MAXIMUM_LENGTH,
+                IS_NULLABLE,
+                COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """)):
+            columns.setdefault(row[0], []).append({
+                "name": row[1],
+                "type": row[2],
+                "max_length": row[3],
+                "nullable": row[4] == "YES",
+                "default": row[5]
+            })
+
+        # Clave primaria e índice clustered de cada tabla, columnas en orden de clave
+        keys: Dict[str, Dict[str, Any]] = {}
+        for row in conn.execute(text("""
+            SELECT
+                t.name AS table_name,
+                i.name AS index_name,
+                i.is_primary_key,
+                i.is_unique,
+                i.type AS index_type,
+                c.name AS column_name,
+                ic.is_descending_key
+            FROM sys.tables t
+            INNER JOIN sys.indexes i ON i.object_id = t.object_id
+            INNER JOIN sys.index_columns ic
+                ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+            INNER JOIN sys.columns c
+                ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+            WHERE (i.is_primary_key = 1 OR i.type = 1)
+              AND ic.key_ordinal > 0
+            ORDER BY t.name, i.index_id, ic.key_ordinal
+        """)):
+            table_keys = keys.setdefault(row.table_name, {"primary_key": None, "clustered": None})
+            column = {"name": row.column_name, "descending": bool(row.is_descending_key)}
+
+            if row.is_primary_key:
+                if table_keys["primary_key"] is None:
+                    table_keys["primary_key"] = {"name": row.index_name, "columns": []}
+                if table_keys["primary_key"]["name"] == row.index_name:
+                    table_keys["primary_key"]["columns"].append(column)
+
+            if row.index_type == 1:
+                if table_keys["clustered"] is None:
+                    table_keys["clustered"] = {
+                        "name": row.index_name,
+                        "unique": bool(row.is_unique),
+                        "columns": []
+                    }
+                if table_keys["clustered"]["name"] == row.index_name:
+                    table_keys["clustered"]["columns"].append(column)
+
+        return SchemaSnapshot(version, tables, columns, keys)
+
+
+# Instancia global
+schema_cache = SchemaCache(probe_interval=settings.SCHEMA_CACHE_PROBE_INTERVALO)
@@ -2,15 +2,30 @@
 """
 Servicio: Lógica de negocio para tablas
 """
-from typing import Dict
+from typing import Any, Dict, Optional
 from features.tables.repository import TablesRepository
 from shared.utils.validators import SQLValidator
-from shared.utils.data_converter import DataConverter
-from core.exceptions.custom_exceptions import NotFoundException
+from shared.utils.serializer import JSONSerializer
+from shared.utils.cursor import CursorCodec
+from core.exceptions.custom_exceptions import NotFoundException, ValidationException
+
+def _parse_int(value: Any, name: str, default: int) -> int:
+    """Entero de un parámetro de query; vacío => default, inválido => 400"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        raise ValidationException(f"'{name}' debe ser un número entero")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationException(f"'{name}' debe ser un número entero")
 
 class TablesService:
     """Servicio que maneja la lógica de negocio de tablas"""
     
+    # Máximo de registros por página de /data
+    MAX_LIMIT = 1000
+    
     def __init__(self):
         self.repository = TablesRepository()
     
@@ -28,12 +43,29 @@ class TablesService:
             "tables": tables
         }
     
-    def get_table_info(self, table_name: str) -> Dict:
+    def get_overview(self) -> Dict:
+        """
+        Resumen de la base: registros y tamaño de cada tabla
+        
+        Returns:
+            Dict: Tablas con sus tamaños y totales generales
+        """
+        tables = self.repository.get_tables_overview()
+        
+        return {
+            "total_tables": len(tables),
+            "total_rows": sum(table["row_count"] for table in tables),
+            "total_reserved_kb": sum(table["reserved_kb"] for table in tables),
+            "tables": tables
+        }
+    
+    def get_table_info(self, table_name: str, exact: bool = False) -> Dict:
         """
         Obtener información completa de una tabla
         
         Args:
             table_name: Nombre de la tabla
+            exact: True para contar con COUNT(*) en vez de estadísticas
             
         Returns:
             Dict: Información detallada
@@ -42,59 +74,140 @@ class TablesService:
         table_name = SQLValidator.validate_table_name(table_name)
         
         # Verificar que existe
-        all_tables = self.repository.get_all_tables()
-        if table_name not in all_tables:
+        if not self.repository.table_exists(table_name):
             raise NotFoundException(f"tabla '{table_name}'")
         
         # Obtener información
         structure = self.repository.get_table_structure(table_name)
-        total_records = self.repository.count_records(table_name)
+        keys = self.repository.get_table_keys(table_name)
+        total_records, count_exact = self.repository.count_records(table_name, exact)
         
         return {
             "table_name": table_name,
             "total_records": total_records,
+            "count_exact": count_exact,
             "total_columns": len(structure),
-            "columns": structure
+            "columns": structure,
+            "primary_key": keys["primary_key"],
+            "clustered_index": keys["clustered"]
         }
     
+    def export_table(self, table_name: str, export_format: str, batch_size: int = 2000) -> tuple:
+        """
+        Preparar la exportación completa de una tabla en streaming
+        
+        La consulta se ejecuta antes de retornar, así los errores se informan
+        como respuesta JSON y no a mitad de la descarga. Las filas salen en el
+        orden del índice clustered cuando existe (sin ordenamiento adicional).
+        
+        Args:
+            table_name: Nombre de la tabla
+            export_format: 'csv' o 'ndjson' (define los conversores)
+            batch_size: Filas leídas del cursor por lote
+            
+        Returns:
+            tuple: (columnas, conversores por columna, iterador de lotes)
+        """
+        table_name = SQLValidator.validate_table_name(table_name)
+        
+        if not self.repository.table_exists(table_name):
+            raise NotFoundException(f"tabla '{table_name}'")
+        
+        clustered = self.repository.get_table_keys(table_name)["clustered"]
+        key = clustered["columns"] if clustered else None
+        
+        stream = self.repository.stream_table(table_name, key, batch_size)
+        columns, description = next(stream)
+        converters = JSONSerializer.converters_for(description, text_output=export_format == 'csv')
+        
+        return columns, converters, stream
+    
     def get_table_data(
         self, 
         table_name: str, 
-        limit: int = 100, 
-        offset: int = 0
+        limit: Any = 100, 
+        offset: Any = 0,
+        shape: str = 'rows',
+        exact: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         Obtener datos de una tabla
         
+        Si la tabla tiene clave primaria (o índice clustered único) las filas
+        salen ordenadas por ella y la respuesta trae "next_cursor". Con `cursor`
+        la página se busca por clave (keyset) en vez de saltar `offset` filas.
+        
         Args:
             table_name: Nombre de la tabla
-            limit: Registros por página
-            offset: Desde qué registro
+            limit: Registros por página (1 a MAX_LIMIT)
+            offset: Desde qué registro (modo offset, >= 0)
+            shape: 'rows' (lista de objetos) o 'columnar' (columnas + filas como listas)
+            exact: True para contar con COUNT(*) en vez de estadísticas
+            cursor: None = modo offset, "" = primera página por clave,
+                    valor de next_cursor = página siguiente
             
         Returns:
             Dict: Datos de la tabla
         """
         # Validar
         table_name = SQLValidator.validate_table_name(table_name)
+        limit = _parse_int(limit, 'limit', 100)
+        offset = _parse_int(offset, 'offset', 0)
+        if not 1 <= limit <= self.MAX_LIMIT:
+            raise ValidationException(f"'limit' debe estar entre 1 y {self.MAX_LIMIT}")
+        if offset < 0:
+            raise ValidationException("'offset' no puede ser negativo")
         
         # Verificar existencia
-        all_tables = self.repository.get_all_tables()
-        if table_name not in all_tables:
+        if not self.repository.table_exists(table_name):
             raise NotFoundException(f"tabla '{table_name}'")
         
+        key = self.repository.get_pagination_key(table_name)
+        
+        after = None
+        if cursor is not None:
+            if key is None:
+                raise ValidationException(
+                    f"La tabla '{table_name}' no tiene clave primaria ni índice clustered único; use offset"
+                )
+            if cursor.strip():
+                after = CursorCodec.decode(cursor.strip())
+                if len(after) != len(key):
+                    raise ValidationException("Cursor inválido para esta tabla")
+        
         # Obtener datos
-        columns, rows = self.repository.get_table_data(table_name, limit, offset)
-        total = self.repository.count_records(table_name)
+        columns, rows, converters, has_more = self.repository.get_table_data(
+            table_name, limit, offset, key, after
+        )
+        total, count_exact = self.repository.count_records(table_name, exact)
+        
+        next_cursor = None
+        if key and has_more and rows:
+            positions = [columns.index(column["name"]) for column in key]
+            next_cursor = CursorCodec.encode([rows[-1][i] for i in positions])
         
-        # Convertir a diccionarios
-        data = DataConverter.rows_to_dict_list(rows, columns)
+        # Conversores elegidos una vez por columna
+        if shape == 'columnar':
+            data = {
+                "columns": columns,
+                "rows": JSONSerializer.rows_to_lists(rows, converters)
+            }
+        else:
+            data = JSONSerializer.rows_to_dicts(rows, columns, converters)
         
         return {
             "table_name": table_name,
             "total_records": total,
-            "showing": len(data),
-            "offset": offset,
+            "count_exact": count_exact,
+            "showing": len(rows),
+            "pagination": "keyset" if cursor is not None else "offset",
+            "offset": offset if cursor is None else None,
             "limit": limit,
+            "order_by": [column["name"] for column in key] if key else None,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+            "shape": shape,
             "columns": columns,
             "data": data
         }
\ No newline at end of file
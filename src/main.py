@@ -1,6 +1,7 @@
 """
 Punto de entrada de la aplicación
 """
+import os
 import sys
 from pathlib import Path
 import socket
@@ -20,11 +21,16 @@ except ValueError as e:
     print("Por favor, configura tu archivo .env correctamente")
     exit(1)
 
-# Crear aplicación
-app = create_app()
+# Crear aplicación al importar el módulo (servidor WSGI: main:app). Los procesos
+# del pool de exportaciones (spawn) vuelven a importar este archivo como
+# __mp_main__: ahí no se crea la app ni se arrancan sus hilos.
+if __name__ not in ('__main__', '__mp_main__'):
+    app = create_app()
 
 if __name__ == '__main__':
-    app = create_app()
+    # Con debug=True el recargador ejecuta este archivo en un proceso vigilante
+    # y en otro que atiende requests (WERKZEUG_RUN_MAIN); los hilos, solo en este
+    app = create_app(iniciar_tareas=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     
     hostname = socket.gethostname()
     local_ip = socket.gethostbyname(hostname)
@@ -1,12 +1,16 @@
 """
 Constructor de respuestas HTTP estandarizadas
 """
-from typing import Any, Optional
-from flask import jsonify
+from typing import Any, List, Optional
+from shared.utils.serializer import JSONSerializer
+from core.exceptions.custom_exceptions import ValidationException
 
 class ResponseBuilder:
     """Construye respuestas JSON con formato consistente"""
     
+    # Formas de entregar listas de registros (?shape=)
+    SHAPES = ('rows', 'columnar')
+    
     @staticmethod
     def success(
         data: Any = None,
@@ -35,7 +39,7 @@ class ResponseBuilder:
         if meta:
             response["meta"] = meta
         
-        return jsonify(response), 200
+        return JSONSerializer.response(response), 200
     
     @staticmethod
     def error(
@@ -62,4 +66,49 @@ class ResponseBuilder:
         if errors:
             response["errors"] = errors
         
-        return jsonify(response), status_code
\ No newline at end of file
+        return JSONSerializer.response(response), status_code
+    
+    @staticmethod
+    def validate_shape(shape: Optional[str]) -> str:
+        """
+        Validar el parámetro shape
+        
+        Returns:
+            str: 'rows' (default) o 'columnar'
+        """
+        if shape is None or shape == '':
+            return 'rows'
+        if not isinstance(shape, str):
+            raise ValidationException("El parámetro shape debe ser texto: rows o columnar")
+        shape = shape.lower()
+        if shape not in ResponseBuilder.SHAPES:
+            raise ValidationException(f"Forma no soportada: {shape}. Use rows o columnar")
+        return shape
+    
+    @staticmethod
+    def shape_records(
+        records: List[dict],
+        shape: str = 'rows',
+        columns: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Dar forma a una lista de registros
+        
+        Args:
+            records: Lista de diccionarios
+            shape: 'rows' => la misma lista; 'columnar' => columnas una sola vez
+            columns: Orden de columnas (por defecto, las claves del primer registro)
+            
+        Returns:
+            La lista original, o {"columns": [...], "rows": [[...], ...]}
+        """
+        if shape != 'columnar':
+            return records
+        
+        if columns is None:
+            columns = list(records[0].keys()) if records else []
+        
+        return {
+            "columns": columns,
+            "rows": [[record.get(column) for column in columns] for record in records]
+        }
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Codificación de cursores opacos para paginación por clave (keyset)
+"""
+import base64
+import json
+from typing import Any, List
+from datetime import datetime, date, time
+from decimal import Decimal
+from uuid import UUID
+from core.exceptions.custom_exceptions import ValidationException
+
+class CursorCodec:
+    """Convierte los valores de la clave de la última fila en un token opaco y viceversa"""
+
+    @staticmethod
+    def encode(values: List[Any]) -> str:
+        """
+        Codificar valores de clave en un cursor
+
+        Args:
+            values: Valores de la clave de la última fila entregada
+
+        Returns:
+            str: Token base64 seguro para URL
+        """
+        payload = json.dumps(
+            [CursorCodec._tag(value) for value in values],
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode(token: str) -> List[Any]:
+        """
+        Decodificar un cursor recibido del cliente
+
+        Args:
+            token: Cursor generado por encode()
+
+        Returns:
+            List[Any]: Valores de la clave con sus tipos originales
+
+        Raises:
+            ValidationException: Si el cursor está corrupto
+        """
+        try:
+            padding = '=' * (-len(token) % 4)
+            payload = base64.urlsafe_b64decode(token + padding).decode('utf-8')
+            values = json.loads(payload)
+            if not isinstance(values, list):
+                raise ValueError("formato inesperado")
+            return [CursorCodec._untag(value) for value in values]
+        except (ValueError, TypeError, KeyError, ArithmeticError) as e:
+            raise ValidationException(f"Cursor inválido: {str(e)}")
+
+    @staticmethod
+    def _tag(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {"dt": value.isoformat()}
+        if isinstance(value, date):
+            return {"d": value.isoformat()}
+        if isinstance(value, time):
+            return {"t": value.isoformat()}
+        if isinstance(value, Decimal):
+            return {"dec": str(value)}
+        if isinstance(value, UUID):
+            return {"uuid": str(value)}
+        if isinstance(value, (bytes, bytearray)):
+            return {"bin": base64.b64encode(bytes(value)).decode('ascii')}
+        return value
+
+    @staticmethod
+    def _untag(value: Any) -> Any:
+        if isinstance(value, dict):
+            if "dt" in value:
+                return datetime.fromisoformat(value["dt"])
+            if "d" in value:
+                return date.fromisoformat(value["d"])
+            if "t" in value:
+                return time.fromisoformat(value["t"])
+            if "dec" in value:
+                return Decimal(value["dec"])
+            if "uuid" in value:
+                return UUID(value["uuid"])
+            if "bin" in value:
+                return base64.b64decode(value["bin"])
+            raise ValueError("tipo desconocido")
+        return value
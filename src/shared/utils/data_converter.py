@@ -4,6 +4,7 @@ Convertidor de datos de SQL a tipos serializables en JSON
 from typing import Any, List
 from datetime import datetime, date
 from decimal import Decimal
+from uuid import UUID
 
 class DataConverter:
     """Convierte tipos de datos de SQL a tipos compatibles con JSON"""
@@ -37,8 +38,8 @@ class DataConverter:
             except:
                 return f"<binary data: {len(value)} bytes>"
         
-        # UUID
-        if hasattr(value, 'hex'):
+        # UUID (hasattr(value, 'hex') también era verdadero para float)
+        if isinstance(value, UUID):
             return str(value)
         
         return value
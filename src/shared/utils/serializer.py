@@ -0,0 +1,145 @@
+"""
+Serialización JSON rápida (orjson si está instalado, si no json estándar)
+"""
+import json
+from datetime import datetime, date, time
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence
+from uuid import UUID
+from flask import Response
+from shared.utils.data_converter import DataConverter
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+def _decode_bytes(value: bytes) -> str:
+    try:
+        return value.decode('utf-8')
+    except UnicodeDecodeError:
+        return f"<binary data: {len(value)} bytes>"
+
+
+def _default(value: Any) -> Any:
+    """Tipos que el serializador no conoce de forma nativa"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, bytes):
+        return _decode_bytes(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class JSONSerializer:
+    """Serializador único para las respuestas JSON de la API"""
+
+    BACKEND = 'orjson' if orjson is not None else 'json'
+
+    # Con orjson fechas y UUID son nativos; solo hace falta convertir Decimal y bytes
+    _NATIVE = (datetime, date, time, UUID) if orjson is not None else ()
+
+    @staticmethod
+    def dumps(payload: Any) -> bytes:
+        """
+        Serializar a bytes JSON (UTF-8)
+
+        Fechas => ISO 8601, Decimal => float, UUID => str
+        """
+        if orjson is not None:
+            return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            payload, default=_default, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+
+    @staticmethod
+    def response(payload: Any, status_code: int = 200) -> Response:
+        """Respuesta Flask application/json con el payload serializado"""
+        return Response(
+            JSONSerializer.dumps(payload),
+            status=status_code,
+            mimetype='application/json'
+        )
+
+    @staticmethod
+    def converters_for(
+        description: Optional[Sequence[Sequence[Any]]],
+        text_output: bool = False
+    ) -> List[Converter]:
+        """
+        Elegir un conversor por columna a partir de cursor.description
+
+        pyodbc informa en type_code la clase Python de cada columna, así que el
+        tipo se decide una vez por consulta y no por celda. None = sin conversión.
+
+        Args:
+            description: cursor.description (nombre, type_code, ...)
+            text_output: True para salida de texto (CSV): fechas y UUID se
+                convierten siempre a ISO 8601 / str
+        """
+        native = () if text_output else JSONSerializer._NATIVE
+        converters: List[Converter] = []
+        for column in description or []:
+            type_code = column[1]
+            if not isinstance(type_code, type):
+                converters.append(DataConverter.convert_value)
+            elif issubclass(type_code, Decimal):
+                converters.append(_to_float)
+            elif issubclass(type_code, (bytes, bytearray)):
+                converters.append(_to_text)
+            elif issubclass(type_code, (datetime, date, time, UUID)) \
+                    and not issubclass(type_code, native):
+                converters.append(_default)
+            else:
+                converters.append(None)
+        return converters
+
+    @staticmethod
+    def rows_to_dicts(rows, columns: List[str], converters: List[Converter]) -> List[dict]:
+        """
+        Convertir filas a diccionarios aplicando solo los conversores necesarios
+
+        Args:
+            rows: Filas del resultado
+            columns: Nombres de columnas
+            converters: Resultado de converters_for (mismo orden que columns)
+        """
+        if not any(converters):
+            return [dict(zip(columns, row)) for row in rows]
+
+        pairs = list(zip(columns, converters))
+        return [
+            {
+                column: (value if convert is None or value is None else convert(value))
+                for (column, convert), value in zip(pairs, row)
+            }
+            for row in rows
+        ]
+
+
+    @staticmethod
+    def rows_to_lists(rows, converters: List[Converter]) -> List[list]:
+        """Como rows_to_dicts pero cada fila es una lista (forma columnar)"""
+        if not any(converters):
+            return [list(row) for row in rows]
+
+        return [
+            [
+                value if convert is None or value is None else convert(value)
+                for convert, value in zip(converters, row)
+            ]
+            for row in rows
+        ]
+
+def _to_float(value: Decimal) -> float:
+    return float(value)
+
+
+def _to_text(value: bytes) -> str:
+    return _decode_bytes(bytes(value))
@@ -0,0 +1,118 @@
+"""
+Generadores de exportación en streaming (CSV / NDJSON / gzip)
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, List, Optional, Sequence
+from shared.utils.data_converter import DataConverter
+from shared.utils.serializer import Converter, JSONSerializer
+
+class StreamExporter:
+    """Convierte lotes de filas en fragmentos de bytes listos para una respuesta streaming"""
+
+    FORMATS = {
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+    }
+
+    @staticmethod
+    def csv_chunks(
+        columns: List[str],
+        batches: Iterable[Iterable[Sequence]],
+        converters: Optional[List[Converter]] = None
+    ) -> Iterator[bytes]:
+        """
+        Generar CSV por lotes
+
+        Args:
+            columns: Nombres de columnas (fila de encabezado)
+            batches: Lotes de filas; cada fila es una secuencia en el orden de columns
+            converters: Conversor por columna (JSONSerializer.converters_for con
+                text_output=True); sin ellos se convierte celda por celda
+
+        Yields:
+            bytes: Encabezado y luego un fragmento por lote
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+
+        writer.writerow(columns)
+        yield StreamExporter._drain(buffer)
+
+        convert = DataConverter.convert_value
+        for batch in batches:
+            if converters is not None:
+                writer.writerows(JSONSerializer.rows_to_lists(batch, converters))
+            else:
+                writer.writerows([convert(value) for value in row] for row in batch)
+            chunk = StreamExporter._drain(buffer)
+            if chunk:
+                yield chunk
+
+    @staticmethod
+    def ndjson_chunks(
+        columns: List[str],
+        batches: Iterable[Iterable[Sequence]],
+        converters: Optional[List[Converter]] = None
+    ) -> Iterator[bytes]:
+        """
+        Generar NDJSON (un objeto JSON por línea) por lotes
+
+        Args:
+            columns: Nombres de columnas (claves de cada objeto)
+            batches: Lotes de filas; cada fila es una secuencia en el orden de columns
+            converters: Conversor por columna (JSONSerializer.converters_for);
+                con ellos cada línea se serializa con JSONSerializer
+
+        Yields:
+            bytes: Un fragmento por lote
+        """
+        if converters is not None:
+            for batch in batches:
+                records = JSONSerializer.rows_to_dicts(batch, columns, converters)
+                if records:
+                    yield b'\n'.join(JSONSerializer.dumps(record) for record in records) + b'\n'
+            return
+
+        convert = DataConverter.convert_value
+        for batch in batches:
+            lines = [
+                json.dumps(
+                    {column: convert(value) for column, value in zip(columns, row)},
+                    ensure_ascii=False
+                )
+                for row in batch
+            ]
+            if lines:
+                yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+    @staticmethod
+    def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+        """
+        Comprimir con gzip un flujo de fragmentos sin acumularlo
+
+        Cada fragmento de entrada se vacía con Z_SYNC_FLUSH para que el cliente
+        reciba datos a medida que se generan.
+
+        Args:
+            chunks: Fragmentos sin comprimir
+            level: Nivel de compresión (1-9)
+
+        Yields:
+            bytes: Fragmentos gzip
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data.encode('utf-8')
@@ -0,0 +1,94 @@
+"""
+Caché en memoria con expiración (TTL) y desalojo LRU
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+class TTLCache:
+    """Caché seguro entre hilos: cada entrada vence a los `ttl` segundos y, al
+    superar `maxsize`, se descarta la menos usada recientemente"""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Obtener un valor vigente
+
+        Args:
+            key: Clave (debe ser hashable)
+            default: Valor a retornar si no existe o venció
+
+        Returns:
+            Valor almacenado o default
+        """
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Guardar un valor
+
+        Args:
+            key: Clave (debe ser hashable)
+            value: Valor a guardar
+            ttl: Segundos de vigencia (por defecto el del caché)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Vaciar el caché"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Contadores de uso del caché
+
+        Returns:
+            dict: Entradas, capacidad, aciertos, fallos, desalojos y tasa de acierto
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else None
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
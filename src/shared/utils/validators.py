@@ -37,4 +37,44 @@ class SQLValidator:
                 "El nombre de tabla solo puede contener letras, números y guiones bajos"
             )
         
-        return table_name
\ No newline at end of file
+        return table_name
+    
+    @staticmethod
+    def quote_identifier(identifier: str) -> str:
+        """
+        Nombre de columna entre corchetes (] se duplica, como QUOTENAME)
+        
+        Args:
+            identifier: Nombre tal como figura en el catálogo
+            
+        Returns:
+            str: Identificador listo para interpolar en el SQL
+        """
+        return "[" + identifier.replace("]", "]]") + "]"
+    
+    @staticmethod
+    def validate_read_only_query(sql: str) -> str:
+        """
+        Valida que una consulta guardada sea de solo lectura
+        
+        Args:
+            sql: Texto SQL de la consulta
+            
+        Returns:
+            str: Consulta validada
+            
+        Raises:
+            ValidationException: Si no es un SELECT único o usa palabras peligrosas
+        """
+        normalized = (sql or '').strip().rstrip(';').strip()
+        if not re.match(r'^(SELECT|WITH)\b', normalized, re.IGNORECASE):
+            raise ValidationException("La consulta debe comenzar con SELECT o WITH")
+        
+        if ';' in normalized:
+            raise ValidationException("La consulta debe ser una sola sentencia")
+        
+        for keyword in SQLValidator.DANGEROUS_KEYWORDS:
+            if re.search(rf'\b{keyword}\b', normalized, re.IGNORECASE):
+                raise ValidationException(f"La consulta contiene una palabra no permitida: {keyword}")
+        
+        return normalized
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""
+Configuración de pytest: los módulos se importan desde src/ (igual que main.py)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,83 @@
+-- Consulta de obtener_reporte_hornos antes de user-001 (7 subconsultas TOP 1)
+SELECT 
+    TB.Fecha_Registro,
+    TB.Numero_OT, 
+    TB.Tiempo_Asignado,
+    TB.Peso_Total,
+    TB.Fecha_Fin_Manual,
+    TB.Fecha_Fin_Auto,
+    TB.Modo_Ingreso_Carga,
+    TB.Dureza_1,
+    TB.Dureza_2,
+    TB.Dureza_3,
+    TB.Fecha_Modificacion,
+    TB.Usuario,
+    (
+        SELECT TOP 1 TH.Temp_Horno_01
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO1],
+    (
+        SELECT TOP 1 TH.Temp_Horno_02
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO2],
+    (
+        SELECT TOP 1 TH.Temp_Horno_03
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO3],
+    (
+        SELECT TOP 1 TH.Temp_Horno_04
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO4],
+    (
+        SELECT TOP 1 TH.Temp_Horno_05
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO5],
+    (
+        SELECT TOP 1 TH.Temp_Horno_06
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO6],
+    (
+        SELECT TOP 1 TH.Temp_Horno_07
+        FROM TBL_HISTORICO_TEMPERATURAS TH
+        WHERE TH.Fecha_Hora >= CAST(TB.Fecha_Registro AS DATE)
+          AND TH.Fecha_Hora < DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))
+        ORDER BY TH.Fecha_Hora
+    ) AS [TEMPERATURA HORNO7]
+FROM TBL_DATOS_PROCESO TB
+CROSS APPLY (
+    SELECT
+        DATEADD(
+            MONTH, DAY(TB.Fecha_Registro) - 1,
+            DATEADD(
+                DAY, MONTH(TB.Fecha_Registro) - 1,
+                CAST(CAST(YEAR(TB.Fecha_Registro) AS char(4)) + '0101' AS date)
+            )
+        ) AS Fecha_Reinterpretada
+) F
+WHERE
+    (:fecha_desde IS NULL OR F.Fecha_Reinterpretada >= :fecha_desde)
+AND (:fecha_hasta IS NULL OR F.Fecha_Reinterpretada < DATEADD(DAY, 1, :fecha_hasta))
+AND (
+        :numero_ot IS NULL
+        OR :numero_ot = '*'
+        OR TB.Numero_OT = :numero_ot
+    )
+ORDER BY TB.Fecha_Registro DESC
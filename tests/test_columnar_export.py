@@ -0,0 +1,57 @@
+"""
+Exportación columnar (user-009): el esquema sale de cursor.description
+
+Antes se infería del primer lote: una columna toda NULL quedaba como string y
+un int absorbía luego un Decimal truncándolo.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from core.exceptions.custom_exceptions import AppException
+from features.reports.columnar_export import escribir_particiones
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+# Como la informa pyodbc: (nombre, type_code, display_size, internal_size, precision, scale, null_ok)
+_DESCRIPCION = [
+    ("Fecha_Hora", datetime, None, 23, 23, 3, True),
+    ("Temp_Horno_01", float, None, 53, 53, 0, True),
+    ("Tiempo_Asignado", int, None, 10, 10, 0, True),
+    ("Peso_Total", Decimal, None, 10, 10, 2, True),
+]
+
+
+def _mes(fila):
+    return f"{fila[0].year:04d}-{fila[0].month:02d}"
+
+
+def _leer(directorio):
+    return pq.read_table(str(directorio / "mes=2024-03" / "part-0.parquet"))
+
+
+def test_columna_null_en_el_primer_lote_conserva_su_tipo(tmp_path):
+    lotes = [
+        [(datetime(2024, 3, 1, 8), None, 1, Decimal("10.50"))],
+        [(datetime(2024, 3, 2, 8), 812.5, 2, Decimal("7.25"))],
+    ]
+
+    assert escribir_particiones(_DESCRIPCION, lotes, str(tmp_path), "parquet", _mes) == 2
+
+    tabla = _leer(tmp_path)
+    assert tabla.schema.field("Temp_Horno_01").type == pa.float64()
+    assert tabla.schema.field("Peso_Total").type == pa.decimal128(10, 2)
+    assert tabla.column("Temp_Horno_01").to_pylist() == [None, 812.5]
+    assert tabla.column("Peso_Total").to_pylist() == [Decimal("10.50"), Decimal("7.25")]
+
+
+def test_valor_de_otro_tipo_falla_en_vez_de_truncarse(tmp_path):
+    lotes = [
+        [(datetime(2024, 3, 1, 8), 700.0, 1, Decimal("1.00"))],
+        [(datetime(2024, 3, 2, 8), 701.0, Decimal("1.5"), Decimal("1.00"))],
+    ]
+
+    with pytest.raises(AppException, match="Tiempo_Asignado"):
+        escribir_particiones(_DESCRIPCION, lotes, str(tmp_path), "arrow", _mes)
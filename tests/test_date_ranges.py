@@ -0,0 +1,70 @@
+"""
+rangos_fecha_registro contra una expansión día por día (fuerza bruta)
+
+Para cada día crudo de Fecha_Registro en varios años se calcula la fecha
+corregida y se compara "cumple el filtro" con "cae en algún rango devuelto".
+"""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from features.reports.date_ranges import fecha_reinterpretada, rangos_fecha_registro
+
+# Días crudos a revisar: cubre el desplazamiento de hasta 2 años de la fecha corregida
+_INICIO = date(2021, 1, 1)
+_FIN = date(2027, 12, 31)
+_DIAS_CRUDOS = [_INICIO + timedelta(days=n) for n in range((_FIN - _INICIO).days + 1)]
+
+
+def _en_rangos(valor, rangos):
+    return any(
+        (inicio is None or valor >= inicio) and (fin is None or valor < fin)
+        for inicio, fin in rangos
+    )
+
+
+def _cumple(dia, desde, hasta):
+    corregida = fecha_reinterpretada(dia.year, dia.month, dia.day)
+    return (desde is None or corregida >= desde) and (hasta is None or corregida <= hasta)
+
+
+@pytest.mark.parametrize("desde, hasta", [
+    (date(2024, 1, 1), date(2024, 12, 31)),     # año completo
+    (date(2024, 3, 15), date(2024, 3, 15)),     # un solo día
+    (date(2024, 1, 31), date(2024, 2, 1)),      # cruce de mes
+    (date(2023, 12, 31), date(2024, 1, 1)),     # cruce de año
+    (date(2024, 2, 28), date(2024, 3, 1)),      # febrero bisiesto
+    (date(2023, 6, 10), date(2025, 2, 3)),      # varios años, rangos unidos entre meses
+    (date(2024, 5, 1), None),                   # sin fin
+    (None, date(2024, 5, 1)),                   # sin inicio
+    (date(2024, 7, 1), date(2024, 6, 30)),      # rango vacío
+])
+def test_rangos_igual_a_fuerza_bruta(desde, hasta):
+    rangos = rangos_fecha_registro(desde, hasta)
+
+    for dia in _DIAS_CRUDOS:
+        # Inicio, mitad y último instante del día: un día crudo entra entero o no entra
+        for instante in (time.min, time(12, 0), time(23, 59, 59, 999999)):
+            valor = datetime.combine(dia, instante)
+            assert _en_rangos(valor, rangos) == _cumple(dia, desde, hasta), (valor, desde, hasta)
+
+
+@pytest.mark.parametrize("desde, hasta", [
+    (date(2024, 1, 1), date(2024, 12, 31)),
+    (date(2024, 5, 1), None),
+    (None, date(2024, 5, 1)),
+])
+def test_rangos_ordenados_sin_solapes_ni_contiguos(desde, hasta):
+    rangos = rangos_fecha_registro(desde, hasta)
+
+    for (_, fin_anterior), (inicio, _) in zip(rangos, rangos[1:]):
+        # Dos rangos contiguos se habrían unido en uno
+        assert fin_anterior is not None and inicio is not None and fin_anterior < inicio
+
+
+def test_sin_filtros_es_un_rango_abierto():
+    assert rangos_fecha_registro(None, None) == [(None, None)]
+
+
+def test_rango_vacio_no_devuelve_rangos():
+    assert rangos_fecha_registro(date(2024, 7, 1), date(2024, 6, 30)) == []
@@ -0,0 +1,59 @@
+"""
+Validación de filtros de los reportes: un valor inválido es ValidationException (400)
+"""
+from datetime import date, datetime
+
+import pytest
+
+from core.exceptions.custom_exceptions import ValidationException
+from features.reports.service import (
+    AnaliticaTemperaturasService, ReporteHornosService, SerieTemperaturasService, _parse_numero
+)
+
+
+@pytest.mark.parametrize("fecha_desde", ["2024-13-01", "01/02/2024", 20240101])
+def test_fecha_invalida_es_validation_exception(fecha_desde):
+    with pytest.raises(ValidationException, match="formato de fecha"):
+        ReporteHornosService.normalizar_filtros(fecha_desde, None, None)
+
+
+def test_filtros_validos():
+    assert ReporteHornosService.normalizar_filtros("2024-01-02", "", " OT-1 ") == (
+        date(2024, 1, 2), None, "OT-1"
+    )
+
+
+@pytest.mark.parametrize("valor", ["2024-02-30", "2024-01-01Tzz"])
+def test_instante_invalido_es_validation_exception(valor):
+    with pytest.raises(ValidationException, match="formato de fecha"):
+        SerieTemperaturasService.parse_instante(valor, fin=True)
+
+
+def test_instante_fecha_sola_como_hasta_incluye_el_dia():
+    assert SerieTemperaturasService.parse_instante("2024-01-01", fin=True) == datetime(2024, 1, 2)
+
+
+@pytest.mark.parametrize("valor", ["abc", True, "nan", [1]])
+def test_numero_invalido_es_validation_exception(valor):
+    with pytest.raises(ValidationException, match="'size' debe ser numérico"):
+        _parse_numero(valor, 'size', 10, float)
+
+
+def test_numero_vacio_usa_defecto():
+    assert _parse_numero("", 'size', 10) == 10
+    assert _parse_numero("25", 'size', 10) == 25
+
+
+@pytest.mark.parametrize("parametros, mensaje", [
+    ({"umbral": "0"}, "'umbral' debe ser mayor que 0"),
+    ({"umbral": "-2"}, "'umbral' debe ser mayor que 0"),
+    ({"umbral": "nan"}, "'umbral' debe ser numérico"),
+    ({"ventana": "0"}, "'ventana' debe ser de al menos 1 minuto"),
+    ({"ventana": "abc"}, "'ventana' debe ser numérico"),
+    ({"min_lecturas": "0"}, "'min_lecturas' debe ser al menos 1"),
+])
+def test_parametros_de_anomalias_fuera_de_rango(parametros, mensaje):
+    # La validación ocurre antes de tocar el repositorio
+    servicio = AnaliticaTemperaturasService(repository=None)
+    with pytest.raises(ValidationException, match=mensaje):
+        servicio.detectar_anomalias("2024-01-01", "2024-01-02", **parametros)
@@ -0,0 +1,41 @@
+"""
+etag_from_watermark: el 304 solo confirma la codificación que se negocia ahora
+"""
+import pytest
+from flask import Flask, jsonify
+
+from api.middlewares.http_cache import etag_from_watermark, register_http_cache
+
+
+@pytest.fixture
+def cliente():
+    app = Flask(__name__)
+    register_http_cache(app)
+
+    @app.route('/datos')
+    @etag_from_watermark(lambda: "marca-1")
+    def datos():
+        return jsonify({"filas": ["x" * 50] * 100})
+
+    return app.test_client()
+
+
+def test_etag_gzip_no_da_304_sin_gzip(cliente):
+    primera = cliente.get('/datos', headers={"Accept-Encoding": "gzip"})
+    assert primera.headers["Content-Encoding"] == "gzip"
+    etag = primera.headers["ETag"]
+    assert etag.endswith('-gzip"')
+
+    misma = cliente.get('/datos', headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert misma.status_code == 304
+
+    sin_gzip = cliente.get('/datos', headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert sin_gzip.status_code == 200
+    assert "Content-Encoding" not in sin_gzip.headers
+
+
+def test_etag_sin_comprimir_vale_para_cualquier_codificacion(cliente):
+    etag = cliente.get('/datos', headers={"Accept-Encoding": "identity"}).headers["ETag"]
+
+    respuesta = cliente.get('/datos', headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert respuesta.status_code == 304
@@ -0,0 +1,41 @@
+"""
+Consultas guardadas: parámetros declarados, booleanos y cuerpo JSON
+"""
+import pytest
+from flask import Flask
+
+from core.exceptions.custom_exceptions import ValidationException
+from features.queries.registry import QueryParam, SavedQuery
+from features.queries.router import queries_bp
+
+
+def test_parametros_del_sql_deben_estar_declarados():
+    SavedQuery('ok', "SELECT TOP (:n) a FROM t WHERE b = :b", params=[QueryParam('n', 'int'), QueryParam('b')])
+
+    with pytest.raises(ValueError, match="no coinciden"):
+        SavedQuery('falta', "SELECT a FROM t WHERE b = :b AND c = :c", params=[QueryParam('b')])
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    (True, True), ("true", True), ("Sí", True), ("1", True),
+    (False, False), ("false", False), ("no", False), ("0", False),
+])
+def test_bool_reconocido(valor, esperado):
+    assert QueryParam('activo', 'bool').parse(valor) is esperado
+
+
+@pytest.mark.parametrize("valor", ["tal vez", "2", "verdadero"])
+def test_bool_desconocido_es_validation_exception(valor):
+    with pytest.raises(ValidationException, match="'activo' debe ser de tipo bool"):
+        QueryParam('activo', 'bool').parse(valor)
+
+
+@pytest.mark.parametrize("cuerpo", [[], ["OT-1"], "texto", 5])
+def test_cuerpo_json_que_no_es_objeto_es_400(cuerpo):
+    app = Flask(__name__)
+    app.register_blueprint(queries_bp)
+
+    respuesta = app.test_client().post('/api/queries/registros_ot', json=cuerpo)
+
+    assert respuesta.status_code == 400
+    assert "objeto" in respuesta.get_json()["message"]
@@ -0,0 +1,88 @@
+"""
+Paginado por cursor del reporte de hornos (user-003)
+
+La condición "filas posteriores al cursor" se ejecuta sobre SQLite, que como
+SQL Server deja los NULL al final de un orden descendente. Recorrer todas las
+páginas debe devolver cada fila exactamente una vez, aunque
+(Fecha_Registro, Numero_OT) se repita o Numero_OT sea NULL.
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from features.reports.repository import ReporteHornosRepository
+
+_COLUMNAS = ["TB.Fecha_Registro", "TB.Numero_OT", "TB.[Id]"]
+
+_FILAS = [
+    # Id, Fecha_Registro, Numero_OT
+    (1, "2024-05-01T08:00:00.000", "OT-2"),
+    (2, "2024-05-01T08:00:00.000", "OT-2"),   # par repetido
+    (3, "2024-05-01T08:00:00.000", None),     # OT NULL en la misma fecha
+    (4, "2024-05-01T08:00:00.000", None),
+    (5, "2024-05-01T08:00:00.000", "OT-1"),
+    (6, "2024-05-01T09:30:00.000", "OT-7"),
+    (7, "2024-04-30T23:59:59.997", None),
+    (8, "2024-04-30T23:59:59.997", "OT-3"),
+    (9, "2024-05-02T00:00:00.000", "OT-3"),
+]
+
+
+@pytest.fixture
+def conexion():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE TBL_DATOS_PROCESO (Id INTEGER PRIMARY KEY, Fecha_Registro TEXT, Numero_OT TEXT)")
+    conn.executemany("INSERT INTO TBL_DATOS_PROCESO VALUES (?, ?, ?)", _FILAS)
+    yield conn
+    conn.close()
+
+
+def _pagina(conn, despues_de, size):
+    repo = ReporteHornosRepository(connection=None)
+    where, params = "", {}
+    if despues_de is not None:
+        condicion, params = repo._condicion_posterior(_COLUMNAS, despues_de)
+        where = f"WHERE {condicion}"
+    params["limite"] = size
+    return conn.execute(f"""
+        SELECT TB.Id, TB.Fecha_Registro, TB.Numero_OT
+        FROM TBL_DATOS_PROCESO TB
+        {where}
+        ORDER BY TB.Fecha_Registro DESC, TB.Numero_OT DESC, TB.[Id] DESC
+        LIMIT :limite
+    """, params).fetchall()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_recorrer_paginas_devuelve_cada_fila_una_vez(conexion, size):
+    completo = _pagina(conexion, None, len(_FILAS))
+
+    vistas = []
+    despues_de = None
+    while True:
+        pagina = _pagina(conexion, despues_de, size)
+        vistas.extend(pagina)
+        if len(pagina) < size:
+            break
+        id_, fecha, ot = pagina[-1]
+        despues_de = [datetime.fromisoformat(fecha), ot, id_]
+
+    assert vistas == completo
+    assert sorted(fila[0] for fila in vistas) == [fila[0] for fila in _FILAS]
+
+
+def test_despues_de_null_solo_desempata_la_columna_siguiente():
+    condicion, params = ReporteHornosRepository(connection=None)._condicion_posterior(
+        _COLUMNAS, [None, None, 1]
+    )
+    assert "TB.Fecha_Registro IS NULL AND TB.Numero_OT IS NULL AND (TB.[Id] < :cursor_2" in condicion
+    assert "OR" not in condicion.replace("OR TB.[Id] IS NULL", "")
+    assert params == {"cursor_2": 1}
+
+
+def test_despues_de_todo_null_no_hay_mas():
+    condicion, _ = ReporteHornosRepository(connection=None)._condicion_posterior(
+        _COLUMNAS, [None, None, None]
+    )
+    assert condicion == "1 = 0"
@@ -0,0 +1,217 @@
+"""
+Regresión del OUTER APPLY de temperaturas (user-001)
+
+El reporte de hornos pasó de 7 subconsultas TOP 1 por fila a un único
+OUTER APPLY. Estas pruebas no necesitan SQL Server:
+
+- las consultas del repositorio devuelven las mismas columnas, en el mismo
+  orden, que la consulta original (tests/fixtures/reporte_hornos_baseline.sql)
+- el APPLY y las 7 subconsultas originales, ejecutados sobre una tabla de
+  temperaturas en SQLite en memoria, dan los mismos valores por fila
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from features.reports.repository import (
+    COLUMNAS_REPORTE,
+    HistoricoTemperaturasRepository,
+    ReporteHornosRepository,
+    _APPLY_TEMPERATURAS,
+)
+
+BASELINE_SQL = (Path(__file__).parent / "fixtures" / "reporte_hornos_baseline.sql").read_text(encoding="utf-8")
+
+# Columnas auxiliares del paginado que el repositorio o el servicio quitan antes de responder
+_COLUMNAS_AUXILIARES = {"rn", "total_registros", "cursor_k0", "cursor_k1", "cursor_k2"}
+
+
+class _ResultadoVacio(list):
+    def partitions(self):
+        return iter(())
+
+    def scalar(self):
+        return 0
+
+
+class _ConexionFalsa:
+    """Guarda el SQL de cada execute y devuelve un resultado vacío"""
+
+    def __init__(self):
+        self.consultas = []
+
+    def execute(self, query, params=None):
+        self.consultas.append(str(query))
+        return _ResultadoVacio()
+
+
+def _nivel_cero(sql):
+    """(posición, carácter) fuera de paréntesis y de identificadores [..]"""
+    profundidad = 0
+    en_corchete = False
+    for i, caracter in enumerate(sql):
+        if en_corchete:
+            en_corchete = caracter != ']'
+            continue
+        if caracter == '[':
+            en_corchete = True
+        elif caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif profundidad == 0:
+            yield i, caracter
+
+
+def _palabra_nivel_cero(sql, palabra, desde=0):
+    posiciones = {i for i, _ in _nivel_cero(sql)}
+    for match in re.finditer(rf"\b{palabra}\b", sql[desde:], re.IGNORECASE):
+        if match.start() + desde in posiciones:
+            return match.start() + desde
+    raise AssertionError(f"No se encontró {palabra} en el nivel superior")
+
+
+def _columnas_salida(sql):
+    """Nombres de las columnas del SELECT de nivel superior, en orden"""
+    sql = "\n".join(linea for linea in sql.splitlines() if not linea.strip().startswith("--"))
+    inicio = _palabra_nivel_cero(sql, "SELECT") + len("SELECT")
+    fin = _palabra_nivel_cero(sql, "FROM", inicio)
+    lista = sql[inicio:fin]
+
+    cortes = [i for i, caracter in _nivel_cero(lista) if caracter == ',']
+    items = [lista[a + 1:b] for a, b in zip([-1] + cortes, cortes + [len(lista)])]
+
+    columnas = []
+    for item in items:
+        item = item.strip()
+        alias = re.search(r"\bAS\s+(\[[^\]]+\]|\w+)\s*$", item, re.IGNORECASE)
+        nombre = alias.group(1) if alias else item.split(".")[-1]
+        columnas.append(nombre.strip("[]"))
+    return columnas
+
+
+def _consulta_reporte(conexion):
+    """El SELECT del reporte entre las sentencias ejecutadas"""
+    consultas = [sql for sql in conexion.consultas if "TEMPERATURA HORNO1" in sql]
+    assert len(consultas) == 1
+    return consultas[0]
+
+
+def test_columnas_reporte_igual_a_consulta_original():
+    assert _columnas_salida(BASELINE_SQL) == COLUMNAS_REPORTE
+
+
+@pytest.mark.parametrize("ejecutar", [
+    lambda repo: repo.obtener_reporte_hornos(date(2024, 1, 1), date(2024, 12, 31), "OT-1"),
+    lambda repo: list(repo.iterar_reporte_hornos(date(2024, 1, 1), None, None)),
+    lambda repo: repo.obtener_reporte_hornos_paginado(None, None, None, page=2, size=10),
+    lambda repo: repo.obtener_reporte_hornos_paginado(None, None, None, incluir_total=False),
+    lambda repo: repo.obtener_reporte_hornos_cursor(
+        None, None, None, despues_de=[datetime(2024, 5, 1, 8, 0), "OT-9", 15], desempate=["Id"]
+    ),
+    lambda repo: repo.obtener_reporte_hornos_por_ots(["OT-1", "OT-2"]),
+], ids=["completo", "iterar", "paginado", "paginado_sin_total", "cursor", "por_ots"])
+def test_consultas_devuelven_columnas_originales_en_orden(ejecutar):
+    conexion = _ConexionFalsa()
+    ejecutar(ReporteHornosRepository(conexion))
+
+    columnas = [
+        columna for columna in _columnas_salida(_consulta_reporte(conexion))
+        if columna not in _COLUMNAS_AUXILIARES
+    ]
+    assert columnas == _columnas_salida(BASELINE_SQL)
+
+
+def _a_sqlite(sql):
+    """
+    Traduce las subconsultas de temperatura a SQLite
+
+    Solo cubre lo que usan (TOP 1, CAST AS DATE, DATEADD de un día); si el
+    SQL cambia y queda algo sin traducir la prueba falla en vez de ignorarlo.
+    """
+    sql = sql.replace("SELECT TOP 1", "SELECT") + "\nLIMIT 1"
+    sql = sql.replace(
+        "DATEADD(DAY, 1, CAST(TB.Fecha_Registro AS DATE))", "date(:fecha_registro, '+1 day')"
+    )
+    sql = sql.replace("CAST(TB.Fecha_Registro AS DATE)", "date(:fecha_registro)")
+    assert not re.search(r"\b(TOP|CAST|DATEADD|TB)\b", sql), sql
+    return sql
+
+
+def _subconsultas_originales():
+    """{alias: SQL} de las 7 subconsultas escalares de la consulta original"""
+    encontradas = re.findall(
+        r"\(\s*(SELECT TOP 1 TH\.Temp_Horno_0\d\s.*?ORDER BY TH\.Fecha_Hora)\s*\)\s*AS \[(TEMPERATURA HORNO\d)\]",
+        BASELINE_SQL,
+        re.DOTALL,
+    )
+    assert len(encontradas) == 7
+    return [(alias, sql) for sql, alias in encontradas]
+
+
+def _consulta_apply():
+    match = re.search(r"OUTER APPLY \((.*)\)\s*T\s*$", _APPLY_TEMPERATURAS, re.DOTALL)
+    assert match
+    return match.group(1)
+
+
+@pytest.fixture
+def temperaturas():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE TBL_HISTORICO_TEMPERATURAS (Fecha_Hora TEXT, "
+        + ", ".join(f"Temp_Horno_0{n} REAL" for n in range(1, 8))
+        + ")"
+    )
+    # Insertadas fuera de orden; Fecha_Hora sin repetir
+    lecturas = [
+        ("2024-03-05 08:00:00.000", 801, 802, 803, 804, 805, 806, 807),
+        ("2024-03-05 06:30:00.000", 651, None, 653, 654, None, 656, 657),
+        ("2024-03-05 23:59:59.997", 991, 992, 993, 994, 995, 996, 997),
+        ("2024-03-06 00:00:00.000", 1, 2, 3, 4, 5, 6, 7),
+        ("2024-03-04 23:59:59.997", 41, 42, 43, 44, 45, 46, 47),
+        ("2024-03-06 13:15:00.000", 131, 132, 133, 134, 135, 136, 137),
+    ]
+    conn.executemany(
+        "INSERT INTO TBL_HISTORICO_TEMPERATURAS VALUES (?, ?, ?, ?, ?, ?, ?, ?)", lecturas
+    )
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("fecha_registro", [
+    "2024-03-05 10:00:00",   # varias lecturas ese día: la primera tiene NULLs
+    "2024-03-06 00:00:00",   # lectura justo a medianoche
+    "2024-03-04 00:00:01",   # única lectura al final del día
+    "2024-03-07 12:00:00",   # sin lecturas: todo NULL
+])
+def test_apply_igual_a_subconsultas_originales(temperaturas, fecha_registro):
+    params = {"fecha_registro": fecha_registro}
+
+    originales = _subconsultas_originales()
+    esperado = []
+    for _, sql in originales:
+        fila = temperaturas.execute(_a_sqlite(sql), params).fetchone()
+        esperado.append(fila[0] if fila else None)
+
+    cursor = temperaturas.execute(_a_sqlite(_consulta_apply()), params)
+    assert [columna[0] for columna in cursor.description] == [alias for alias, _ in originales]
+
+    fila = cursor.fetchone()
+    obtenido = list(fila) if fila else [None] * 7
+    assert obtenido == esperado
+
+
+def test_columnas_de_clave_se_escapan_igual_en_lecturas_y_cursor():
+    lecturas = _ConexionFalsa()
+    list(HistoricoTemperaturasRepository(lecturas).iterar_lecturas(clave=["Id]x"]))
+    assert "TH.[Id]]x]" in lecturas.consultas[0]
+
+    cursor = _ConexionFalsa()
+    ReporteHornosRepository(cursor).obtener_reporte_hornos_cursor(
+        None, None, None, despues_de=None, size=10, desempate=["Id]x"]
+    )
+    assert "TB.[Id]]x]" in _consulta_reporte(cursor)
@@ -0,0 +1,33 @@
+"""
+/api/reportes/hornos con numeros_ot: no se ignoran en silencio page/size/cursor/numero_ot
+"""
+import pytest
+from flask import Flask
+
+from features.reports import router as modulo
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    # Falla si la validación deja pasar la consulta
+    def sin_base(*args, **kwargs):
+        raise AssertionError("no debe consultar la base")
+
+    monkeypatch.setattr(modulo.db, "get_connection", sin_base)
+    app = Flask(__name__)
+    app.register_blueprint(modulo.reportes_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("extra, rechazados", [
+    ({"page": 2}, "page"),
+    ({"size": 10}, "size"),
+    ({"cursor": ""}, "cursor"),
+    ({"numero_ot": "OT-9"}, "numero_ot"),
+    ({"page": 1, "size": 10}, "page, size"),
+])
+def test_numeros_ot_con_paginado_es_400(cliente, extra, rechazados):
+    respuesta = cliente.post('/api/reportes/hornos', json={"numeros_ot": ["OT-1", "OT-2"], **extra})
+
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()["error"] == f"numeros_ot no se puede combinar con: {rechazados}"
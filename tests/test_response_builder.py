@@ -0,0 +1,20 @@
+"""
+ResponseBuilder.validate_shape: valores inválidos son ValidationException (400)
+"""
+import pytest
+
+from core.exceptions.custom_exceptions import ValidationException
+from shared.responses.response_builder import ResponseBuilder
+
+
+@pytest.mark.parametrize("shape, esperado", [
+    (None, "rows"), ("", "rows"), ("rows", "rows"), ("COLUMNAR", "columnar"),
+])
+def test_validate_shape(shape, esperado):
+    assert ResponseBuilder.validate_shape(shape) == esperado
+
+
+@pytest.mark.parametrize("shape", ["tabla", 1, ["rows"], {"shape": "rows"}, True])
+def test_validate_shape_invalida(shape):
+    with pytest.raises(ValidationException):
+        ResponseBuilder.validate_shape(shape)
@@ -0,0 +1,62 @@
+"""
+Marca de agua del índice de OT: fecha corregida, no Fecha_Registro cruda
+"""
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+from features.reports.date_ranges import rangos_fecha_registro
+from features.search import repository as modulo
+from features.search.repository import SearchRepository
+
+
+class _Resultado(list):
+    def fetchall(self):
+        return list(self)
+
+
+class _ConexionFalsa:
+    def __init__(self):
+        self.filas = []
+        self.consultas = []
+
+    def execute(self, query, params=None):
+        self.consultas.append((str(query), params))
+        return _Resultado(self.filas)
+
+
+@pytest.fixture
+def conexion(monkeypatch):
+    conn = _ConexionFalsa()
+
+    @contextmanager
+    def get_connection(scoped=True):
+        yield conn
+
+    monkeypatch.setattr(modulo.db, "get_connection", get_connection)
+    return conn
+
+
+def test_marca_de_agua_es_la_fecha_corregida(conexion):
+    # 2024-12-05 crudo es el 2024-05-12; 2024-06-11 crudo es el 2024-11-06
+    conexion.filas = [("OT-1", date(2024, 12, 5)), ("OT-2", date(2024, 6, 11)), ("OT-2", date(2024, 6, 10))]
+
+    ots, marca = SearchRepository().get_ots()
+
+    assert ots == ["OT-1", "OT-2"]
+    assert marca == date(2024, 11, 6)
+
+
+def test_incremental_filtra_por_rangos_de_fecha_registro(conexion):
+    SearchRepository().get_ots(since=date(2024, 11, 6))
+
+    sql, params = conexion.consultas[0]
+    esperado = rangos_fecha_registro(date(2024, 11, 6), None)
+    obtenido = [(params.get(f"desde_{i}"), params.get(f"hasta_{i}")) for i in range(len(esperado))]
+    assert obtenido == esperado
+    assert len(params) == sum(extremo is not None for rango in esperado for extremo in rango)
+
+
+def test_sin_filas_conserva_la_marca(conexion):
+    assert SearchRepository().get_ots(since=date(2024, 11, 6)) == ([], date(2024, 11, 6))
@@ -0,0 +1,21 @@
+"""
+TablesService.get_table_data: limit y offset fuera de rango son ValidationException (400)
+"""
+import pytest
+
+from core.exceptions.custom_exceptions import ValidationException
+from features.tables.service import TablesService
+
+
+@pytest.mark.parametrize("limit, offset, mensaje", [
+    ("-1", None, "'limit' debe estar entre 1 y 1000"),
+    ("0", None, "'limit' debe estar entre 1 y 1000"),
+    ("1001", None, "'limit' debe estar entre 1 y 1000"),
+    ("abc", None, "'limit' debe ser un número entero"),
+    (None, "-5", "'offset' no puede ser negativo"),
+    (None, "1.5", "'offset' debe ser un número entero"),
+])
+def test_limit_y_offset_invalidos(limit, offset, mensaje):
+    # La validación ocurre antes de consultar la base
+    with pytest.raises(ValidationException, match=mensaje):
+        TablesService().get_table_data("Usuarios", limit, offset)
@@ -0,0 +1,103 @@
+"""
+Copia local de temperaturas: clave de origen, relectura y cambio de clave
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+from features.reports.repository import COLUMNAS_HORNO
+from features.reports.temperature_snapshot import SnapshotTemperaturas
+
+T0 = datetime(2024, 3, 5, 8, 0)
+
+
+class _OrigenFalso:
+    """Imita HistoricoTemperaturasRepository.iterar_lecturas sobre una lista de filas"""
+
+    def __init__(self):
+        self.filas = []   # (Fecha_Hora, temperatura, Id)
+
+    def agregar(self, fecha_hora, temperatura, id_):
+        self.filas.append((fecha_hora, temperatura, id_))
+
+    def iterar_lecturas(self, desde=None, hasta=None, hornos=None, batch_size=5000, clave=()):
+        filas = sorted(
+            (f for f in self.filas if desde is None or f[0] >= desde), key=lambda f: f[0]
+        )
+        lote = [
+            (fecha, *([temperatura] * len(COLUMNAS_HORNO)), *([id_] if clave else []))
+            for fecha, temperatura, id_ in filas
+        ]
+        if lote:
+            yield lote
+
+
+def _lecturas(snapshot):
+    return [(fila[0], fila[1]) for lote in snapshot.iterar_lecturas() for fila in lote]
+
+
+def test_lecturas_con_el_mismo_instante_se_copian_todas(tmp_path):
+    snapshot = SnapshotTemperaturas(str(tmp_path / "t.sqlite3"), relectura=60)
+    origen = _OrigenFalso()
+    origen.agregar(T0, 100.0, 1)
+    origen.agregar(T0, 200.0, 2)
+
+    assert snapshot.sincronizar(origen, ["Id"]) == 2
+    assert snapshot.disponible()
+
+    # Otra del mismo instante confirmada después de la primera sincronización
+    origen.agregar(T0, 300.0, 3)
+    assert snapshot.sincronizar(origen, ["Id"]) == 1
+    assert sorted(_lecturas(snapshot)) == [(T0, 100.0), (T0, 200.0), (T0, 300.0)]
+
+
+def test_lectura_confirmada_tarde_dentro_de_la_ventana(tmp_path):
+    snapshot = SnapshotTemperaturas(str(tmp_path / "t.sqlite3"), relectura=60)
+    origen = _OrigenFalso()
+    origen.agregar(T0, 100.0, 1)
+    origen.agregar(T0 + timedelta(seconds=30), 110.0, 3)
+    snapshot.sincronizar(origen, ["Id"])
+
+    # Confirmada tarde con una Fecha_Hora anterior a la última copiada
+    origen.agregar(T0 + timedelta(seconds=10), 105.0, 2)
+    assert snapshot.sincronizar(origen, ["Id"]) == 1
+    assert [t for _, t in _lecturas(snapshot)] == [100.0, 105.0, 110.0]
+
+    # Releer la ventana no duplica
+    assert snapshot.sincronizar(origen, ["Id"]) == 0
+
+
+def test_cambio_de_clave_rearma_la_copia(tmp_path):
+    snapshot = SnapshotTemperaturas(str(tmp_path / "t.sqlite3"))
+    origen = _OrigenFalso()
+    origen.agregar(T0, 100.0, 1)
+    origen.agregar(T0 + timedelta(seconds=1), 101.0, 2)
+    snapshot.sincronizar(origen, ["Id"])
+
+    # Fecha_Hora pasa a ser la clave: la copia se arma de cero con el nuevo esquema
+    assert snapshot.sincronizar(origen, []) == 2
+    assert snapshot.disponible()
+    assert _lecturas(snapshot) == [(T0, 100.0), (T0 + timedelta(seconds=1), 101.0)]
+
+
+def test_lectura_no_espera_a_la_sincronizacion(tmp_path):
+    snapshot = SnapshotTemperaturas(str(tmp_path / "t.sqlite3"))
+    origen = _OrigenFalso()
+    origen.agregar(T0, 100.0, 1)
+    snapshot.sincronizar(origen, ["Id"])
+
+    # Una sincronización en curso tiene tomado el lock de escritura
+    escritor = sqlite3.connect(snapshot.ruta)
+    escritor.execute("BEGIN IMMEDIATE")
+    escritor.execute("DELETE FROM lecturas")
+    try:
+        assert snapshot.disponible()
+        assert _lecturas(snapshot) == [(T0, 100.0)]
+    finally:
+        escritor.rollback()
+        escritor.close()
+
+
+def test_disponible_no_crea_el_archivo(tmp_path):
+    ruta = tmp_path / "no-existe" / "t.sqlite3"
+    assert not SnapshotTemperaturas(str(ruta)).disponible()
+    assert not ruta.parent.exists()